@@ -0,0 +1 @@
+"""Throughput/memory benchmarks for the code generators in this directory (see bench_yaml2code.py)."""
@@ -0,0 +1,219 @@
+#!/usr/bin/env python3
+"""
+yaml2code.py throughput/memory benchmark.
+
+Generates a synthetic corpus (see corpus.py), then times batch generation over it in
+a few scenarios, each in a fresh interpreter so its RSS figure means something:
+
+    cold         empty output dir, parse cache off: everything parsed and emitted
+    parse-cache  empty output dir, parse cache pre-filled: emission without YAML parsing
+    no-op        output, manifest and cache all current: the every-build case
+
+and reports files/sec, emitted lines/sec and max per-process RSS per scenario -- the
+largest of the run itself and any one --jobs worker, not the sum over the process tree
+(getrusage() records no more than that). Results are
+written as stable, sorted JSON so two runs can be diffed, or compared directly:
+
+    python -m benchmarks.bench_yaml2code --out base.json
+    ... change yaml2code.py ...
+    python -m benchmarks.bench_yaml2code --out new.json --compare base.json
+
+--compare exits non-zero if any scenario got slower than --tolerance allows.
+"""
+
+import argparse
+import json
+import platform
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from dataclasses import fields
+from pathlib import Path
+from typing import Any, Dict, List
+
+try:
+    from .corpus import CorpusSpec, make_corpus
+except ImportError:  # run as a script
+    sys.path.insert(0, str(Path(__file__).resolve().parent))
+    from corpus import CorpusSpec, make_corpus
+
+REPO = Path(__file__).resolve().parent.parent
+SCENARIOS = ("cold", "parse-cache", "no-op")
+
+
+def _max_process_rss_kb() -> int:
+    """The highest ru_maxrss of this process and of any single waited-for child (one
+       --jobs worker): max per-process RSS, not the footprint of a parallel run."""
+    try:
+        import resource
+    except ImportError:  # Windows
+        return 0
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    peak = max(peak, resource.getrusage(resource.RUSAGE_CHILDREN).ru_maxrss)
+    return peak // 1024 if sys.platform == "darwin" else peak  # bytes on macOS, KiB elsewhere
+
+
+def _count_lines(output: Path) -> int:
+    return sum(len(p.read_bytes().splitlines()) for p in output.rglob("*") if p.suffix in (".ixx", ".cpp"))
+
+
+def _measure(corpus: Path, output: Path, scenario: str, jobs: int) -> Dict[str, Any]:
+    """Child process: one timed scan_and_generate() run, printed as JSON."""
+    import contextlib
+    import io
+    import shutil
+    sys.path.insert(0, str(REPO))
+    import yaml2code
+
+    argv = ["--quiet", "--scan", str(corpus), "--output", str(output), "--jobs", str(jobs)]
+    if scenario == "cold":
+        argv.append("--no-parse-cache")
+    if scenario in ("cold", "parse-cache"):
+        # Start from nothing but (for parse-cache) the cache a previous run left behind.
+        for p in output.iterdir() if output.exists() else []:
+            if p.name != ".yaml2code.cache":
+                shutil.rmtree(p) if p.is_dir() else p.unlink()
+    args = yaml2code._build_parser().parse_args(argv)
+
+    sink = io.StringIO()
+    start = time.perf_counter()
+    with contextlib.redirect_stdout(sink), contextlib.redirect_stderr(sink):
+        rc = yaml2code._run(args)
+    seconds = time.perf_counter() - start
+    if rc != 0:
+        raise SystemExit(f"yaml2code failed ({rc}):\n{sink.getvalue()}")
+    return {"seconds": seconds, "max_process_rss_kb": _max_process_rss_kb()}
+
+
+def _run_scenario(corpus: Path, output: Path, scenario: str, jobs: int) -> Dict[str, Any]:
+    result = subprocess.run([sys.executable, str(Path(__file__).resolve()), "--measure", scenario,
+                             "--corpus", str(corpus), "--output-dir", str(output), "--jobs", str(jobs)],
+                            capture_output=True, text=True)
+    if result.returncode != 0:
+        raise SystemExit(result.stderr or result.stdout)
+    return json.loads(result.stdout)
+
+
+def run(spec: CorpusSpec, repeat: int, jobs: int, workdir: Path) -> Dict[str, Any]:
+    corpus, output = workdir / "corpus", workdir / "out"
+    files = make_corpus(corpus, spec)
+
+    # Prime output + cache so parse-cache and no-op have something to reuse.
+    _run_scenario(corpus, output, "parse-cache", jobs)
+    lines = _count_lines(output)
+
+    scenarios: Dict[str, Any] = {}
+    for scenario in SCENARIOS:
+        runs = [_run_scenario(corpus, output, scenario, jobs) for _ in range(repeat)]
+        seconds = statistics.median(r["seconds"] for r in runs)
+        emitted = lines if scenario != "no-op" else 0
+        scenarios[scenario] = {
+            "seconds": round(seconds, 4),
+            "files_per_sec": round(len(files) / seconds, 1),
+            "lines": emitted,
+            "lines_per_sec": round(emitted / seconds, 1),
+            "max_process_rss_kb": max(r["max_process_rss_kb"] for r in runs),
+        }
+
+    return {
+        "corpus": spec.as_dict(),
+        "files": len(files),
+        "jobs": jobs,
+        "repeat": repeat,
+        "environment": {
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "yaml_backend": _yaml_backend(),
+            "commit": _git_commit(),
+        },
+        "scenarios": scenarios,
+    }
+
+
+def _yaml_backend() -> str:
+    sys.path.insert(0, str(REPO))
+    import yaml2code
+    return yaml2code.yaml_loader()[1]
+
+
+def _git_commit() -> str:
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], cwd=REPO, capture_output=True,
+                              text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return "unknown"
+
+
+def compare(new: Dict[str, Any], old: Dict[str, Any], tolerance: float) -> List[str]:
+    """Per-scenario report lines; those over tolerance are prefixed 'REGRESSION'."""
+    report = []
+    if new.get("corpus") != old.get("corpus"):
+        report.append("warning: corpus specs differ; timings are not comparable")
+    for scenario, cur in new["scenarios"].items():
+        prev = old.get("scenarios", {}).get(scenario)
+        if not prev:
+            continue
+        change = (cur["seconds"] - prev["seconds"]) / prev["seconds"] * 100 if prev["seconds"] else 0.0
+        tag = "REGRESSION" if change > tolerance else "ok"
+        line = f"{tag:<10} {scenario:<12} {prev['seconds']:8.3f}s -> {cur['seconds']:8.3f}s ({change:+.1f}%)"
+        if "max_process_rss_kb" in prev:  # absent from results that predate the relabelling
+            line += f", max per-process RSS {cur['max_process_rss_kb'] - prev['max_process_rss_kb']:+d} KiB"
+        report.append(line)
+    return report
+
+
+def _on_off(text: str) -> bool:
+    return text.lower() not in ("0", "false", "no", "off")
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Benchmark yaml2code.py over a synthetic YAML corpus")
+    for f in fields(CorpusSpec):
+        kind = _on_off if isinstance(f.default, bool) else type(f.default)
+        parser.add_argument(f"--{f.name.replace('_', '-')}", type=kind, default=f.default,
+                            help=f"corpus: {f.name} (default: {f.default})")
+    parser.add_argument("--repeat", type=int, default=3, help="runs per scenario; the median is reported")
+    parser.add_argument("--jobs", type=int, default=1, help="passed to yaml2code.py --jobs")
+    parser.add_argument("--out", type=Path, help="write results JSON here")
+    parser.add_argument("--compare", type=Path, help="previous results JSON to compare against")
+    parser.add_argument("--tolerance", type=float, default=10.0, help="allowed slowdown in percent (default: 10)")
+    parser.add_argument("--keep", type=Path, help="build the corpus/output here and keep it")
+    parser.add_argument("--measure", choices=SCENARIOS, help=argparse.SUPPRESS)
+    parser.add_argument("--corpus", type=Path, help=argparse.SUPPRESS)
+    parser.add_argument("--output-dir", type=Path, help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.measure:
+        print(json.dumps(_measure(args.corpus, args.output_dir, args.measure, args.jobs)))
+        return 0
+
+    spec = CorpusSpec(**{f.name: getattr(args, f.name) for f in fields(CorpusSpec)})
+
+    if args.keep:
+        args.keep.mkdir(parents=True, exist_ok=True)
+        results = run(spec, args.repeat, args.jobs, args.keep)
+    else:
+        with tempfile.TemporaryDirectory(prefix="yaml2code-bench-") as tmp:
+            results = run(spec, args.repeat, args.jobs, Path(tmp))
+
+    text = json.dumps(results, indent=1, sort_keys=True) + "\n"
+    if args.out:
+        args.out.write_text(text, encoding="utf-8")
+
+    print(f"{results['files']} files, jobs={results['jobs']}, YAML backend: {results['environment']['yaml_backend']}")
+    for scenario, r in results["scenarios"].items():
+        print(f"  {scenario:<12} {r['seconds']:8.3f}s  {r['files_per_sec']:9.1f} files/s  "
+              f"{r['lines_per_sec']:11.1f} lines/s  max per-process RSS {r['max_process_rss_kb']} KiB")
+
+    if args.compare:
+        report = compare(results, json.loads(args.compare.read_text(encoding="utf-8")), args.tolerance)
+        print("\n".join(report))
+        if any(line.startswith("REGRESSION") for line in report):
+            return 1
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
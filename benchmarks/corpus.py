@@ -0,0 +1,126 @@
+"""
+Synthetic YAML corpus for benchmarking yaml2code.py.
+
+make_corpus() writes a tree of form definitions shaped like real ones: every file
+carries groups, pages and wizardpages with sectioned elements (labels, controls with
+validators, event handlers, per-control args and alt_data_source lookups), class_args
+blocks, and -- optionally -- a wizard and a book over the pages it declares. Everything
+is derived from CorpusSpec and a seed, so the same spec always yields byte-identical
+files and benchmark runs stay comparable across commits.
+"""
+
+import random
+from dataclasses import dataclass, asdict
+from pathlib import Path
+from typing import Any, Dict, List
+
+import yaml
+
+
+@dataclass(frozen=True)
+class CorpusSpec:
+    files: int = 40
+    dirs: int = 4                  # files are spread over this many sub-directories
+    groups: int = 2                # per file
+    pages: int = 2                 # per file
+    wizardpages: int = 1           # per file
+    wizard: bool = True            # one wizard per file, over its wizardpages
+    book: bool = True              # one populate() book per file, over its pages
+    sections: int = 3              # per form
+    controls: int = 6              # per section
+    labels: int = 1                # per control
+    validators: float = 0.5        # fraction of text controls with a validator
+    handlers: int = 1              # event handlers per control
+    class_args: bool = True        # class_args block on every group/page
+    alt_data_source: float = 0.25  # fraction of choice controls backed by a table lookup
+    seed: int = 1
+
+    def as_dict(self) -> Dict[str, Any]:
+        return asdict(self)
+
+
+_TEXT_CONTROLS = [("TextCtrl", "std::string"), ("SpinCtrl", "int"), ("CheckBox", "bool")]
+_CHOICE_CONTROLS = [("Choice", "ID::Type"), ("ComboBox", "ID::Type")]
+_VALIDATORS = ["CapsValidator", "TextValidator"]
+_EVENTS = ["EVT_TEXT", "EVT_SET_FOCUS", "EVT_KILL_FOCUS", "EVT_CHOICE"]
+
+
+def _control(spec: CorpusSpec, rnd: random.Random, form: str, sec: int, idx: int) -> List[Dict[str, Any]]:
+    name = f"{form}_s{sec}_c{idx}"
+    items: List[Dict[str, Any]] = []
+    if spec.labels:
+        items.append({"labels": [{"key": f"{name}Label{n}", "value": f"{name} {n}:"} for n in range(spec.labels)]})
+
+    choice = rnd.random() < 0.3
+    cls, contains = rnd.choice(_CHOICE_CONTROLS if choice else _TEXT_CONTROLS)
+    control: Dict[str, Any] = {
+        "variable": f"m_{name}",
+        "name": name,
+        "class": cls,
+        "contains": contains,
+        "table": form,
+        "field": name,
+    }
+    if choice and rnd.random() < spec.alt_data_source:
+        # Lookup-backed choices pick their class from the lookup, so name only the base.
+        control["base_class"] = control.pop("class")
+        control["alt_data_source"] = {"table": f"lookup{idx % 5}", "value_field": "id", "display_field": "name"}
+    if not choice and cls == "TextCtrl" and rnd.random() < spec.validators:
+        control["validator"] = {"class": rnd.choice(_VALIDATORS)}
+    if spec.handlers:
+        control["handlers"] = [{"event": _EVENTS[(idx + n) % len(_EVENTS)], "handler": "event.Skip();"}
+                               for n in range(spec.handlers)]
+    if rnd.random() < 0.2:
+        control["args"] = {"arg_name": f"{name}Args", "insert": ["flag", "bool", True]}
+    items.append({"control": control})
+    return items
+
+
+def _form(spec: CorpusSpec, rnd: random.Random, form: str) -> Dict[str, Any]:
+    elements = []
+    for sec in range(spec.sections):
+        items: List[Dict[str, Any]] = []
+        for idx in range(spec.controls):
+            items.extend(_control(spec, rnd, form, sec, idx))
+        elements.append({"section": f"Section {sec}", "items": items})
+    form_def: Dict[str, Any] = {"recordset": {"table": form}, "elements": elements}
+    if spec.class_args:
+        form_def["class_args"] = {
+            "arg_name": f"{form}Args",
+            "args_in": ["readOnly", "bool", False, "title", "string", form],
+            "extract_inside": ["bool", "readOnlyLocal", "args", "readOnly", False],
+        }
+    return form_def
+
+
+def _document(spec: CorpusSpec, rnd: random.Random, stem: str) -> Dict[str, Any]:
+    doc: Dict[str, Any] = {}
+    for category, count in (("groups", spec.groups), ("pages", spec.pages), ("wizardpages", spec.wizardpages)):
+        if count:
+            doc[category] = {f"{stem}_{category[:-1]}{n}": _form(spec, rnd, f"{stem}_{category[:-1]}{n}")
+                             for n in range(count)}
+
+    def pascal(name: str) -> str:
+        return "".join(part[:1].upper() + part[1:] for part in name.split("_"))
+
+    if spec.wizard and spec.wizardpages:
+        doc["wizard"] = {stem: {"pages": [
+            {"class": f"{pascal(n)}WizardPage", "module": f"{pascal(n)}.WizardPage", "name": n, "header": n}
+            for n in doc["wizardpages"]]}}
+    if spec.book and spec.pages:
+        doc["book"] = {stem: {"pages": [
+            {"class": f"{pascal(n)}Page", "module": f"{pascal(n)}.Page", "name": n, "type": f"{pascal(n)}Page"}
+            for n in doc["pages"]]}}
+    return doc
+
+
+def make_corpus(root: Path, spec: CorpusSpec) -> List[Path]:
+    """Write spec.files YAML files under root and return their paths."""
+    rnd = random.Random(spec.seed)
+    files = []
+    for n in range(spec.files):
+        path = Path(root) / f"dir{n % max(spec.dirs, 1)}" / f"form{n:04d}.yaml"
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(yaml.safe_dump(_document(spec, rnd, f"form{n:04d}"), sort_keys=False), encoding="utf-8")
+        files.append(path)
+    return files
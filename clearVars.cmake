@@ -9,10 +9,14 @@ macro(clearVars)
     set (APP_FILE_EXTN)
     set (APP_FILE_FILTERS)
     set (APP_FILE_TYPES)
+    set (APP_GENERATOR_JOBS)
+    set (APP_GENERATOR_REPRODUCIBLE)
+    set (APP_GENERATOR_SOCKET)
     set (APP_GENERATE_RECORDSETS)
     set (APP_GENERATE_UI_CLASSES)
     set (APP_MAGIC_BEAN)
     set (APP_NAME)
+    set (APP_PAGETYPE_REGISTRY)
     set (APP_SHOW_SIZER_INFO_IN_SOURCE)
     set (APP_SUPPLIES_RESOURCES)
     set (APP_TYPE)
@@ -14,19 +14,169 @@ function(generateClasses OUT_DIR SRCDIR TRRGET EXPORT_VAR)
         list(GET ARGN 0 IMPL_DIR)
     endif ()
 
-    # 1) Configure-time generation so CMake can glob and add sources
+    # Batch generation fans out over a process pool. APP_GENERATOR_JOBS (AppSpecific.cmake)
+    # caps the worker count; unset means one worker per CPU. Output is identical either way.
+    if (DEFINED APP_GENERATOR_JOBS AND NOT "${APP_GENERATOR_JOBS}" STREQUAL "")
+        set(GENERATOR_JOBS_FLAG --jobs ${APP_GENERATOR_JOBS})
+    else ()
+        set(GENERATOR_JOBS_FLAG --jobs 0)
+    endif ()
+
+    # PageType IDs come from a committed, append-only registry next to the YAML specs, so
+    # adding or renaming a spec does not renumber (and rebuild) every later page, in this
+    # build tree or any other. Commit the file; set APP_PAGETYPE_REGISTRY to move it, or to
+    # OFF for scan-order numbering. Only the configure-time run below records new classes:
+    # the build rules run --only, which never writes the registry (a class added to a YAML
+    # file fails its rule, and the next build re-runs configure), so an ordinary build
+    # never writes into the source tree.
+    set(PAGETYPE_REGISTRY)
+    if (NOT DEFINED APP_PAGETYPE_REGISTRY)
+        set(PAGETYPE_REGISTRY "${SRCDIR}/pagetypes.json")
+    elseif (APP_PAGETYPE_REGISTRY)
+        set(PAGETYPE_REGISTRY "${APP_PAGETYPE_REGISTRY}")
+    endif ()
+    if (PAGETYPE_REGISTRY)
+        set(GENERATOR_REGISTRY_FLAG --pagetype-registry "${PAGETYPE_REGISTRY}")
+    else ()
+        set(GENERATOR_REGISTRY_FLAG)
+    endif ()
+
+    # Generated module headers name their YAML by content hash and SRCDIR-relative path
+    # rather than mtime and absolute path, so a checkout, fresh clone or cache restore
+    # leaves them byte-identical (no rebuild, and ccache hits across machines). Set
+    # APP_GENERATOR_REPRODUCIBLE to OFF to get the mtime headers back.
+    if (NOT DEFINED APP_GENERATOR_REPRODUCIBLE OR APP_GENERATOR_REPRODUCIBLE)
+        set(GENERATOR_REPRODUCIBLE_FLAG --reproducible --source-root "${SRCDIR}")
+    else ()
+        set(GENERATOR_REPRODUCIBLE_FLAG)
+    endif ()
+
+    # APP_GENERATOR_FUSE (file or dir) emits the classes of each YAML file, or of each
+    # directory under SRCDIR, as a single module ("<Dir>[.<File>].UI") with one global
+    # module fragment -- far fewer BMIs and compiler invocations, and the Core/Gfx headers
+    # parsed once per module instead of once per class. Hand-written code then imports
+    # that module instead of the per-class ones. Unset (the default) keeps one module per class.
+    if (DEFINED APP_GENERATOR_FUSE AND NOT "${APP_GENERATOR_FUSE}" STREQUAL "")
+        set(GENERATOR_FUSE_FLAG --fuse ${APP_GENERATOR_FUSE})
+    else ()
+        set(GENERATOR_FUSE_FLAG)
+    endif ()
+
+    # APP_GENERATOR_PRELUDE (ON) moves the Core/Gfx headers every generated global module
+    # fragment repeats into one generated module, "<target>.Prelude", which the generated
+    # modules import instead -- those headers are then parsed once per output directory
+    # rather than once per BMI. Core.h and gfx_export.h stay in each fragment for their
+    # macros. Unset (the default) keeps the includes where they were.
+    string(MAKE_C_IDENTIFIER "${TRRGET}" _module_prefix)
+    set(PRELUDE_MODULE "${_module_prefix}.Prelude")
+    if (APP_GENERATOR_PRELUDE)
+        set(GENERATOR_PRELUDE_FLAG --prelude "${PRELUDE_MODULE}")
+    else ()
+        set(GENERATOR_PRELUDE_FLAG)
+    endif ()
+
+    # APP_GENERATOR_COMPILED_LAYOUTS (ON) compiles each class's sizer/placement data into
+    # constexpr tables in its module (import LayoutTable), handed to loadLayout() directly,
+    # so constructing a page or group no longer resolves and re-parses its layout YAML.
+    # Classes that name another layout resource ('layout:') still load it at runtime.
+    if (APP_GENERATOR_COMPILED_LAYOUTS)
+        set(GENERATOR_LAYOUTS_FLAG --compiled-layouts)
+    else ()
+        set(GENERATOR_LAYOUTS_FLAG)
+    endif ()
+
+    # APP_GENERATOR_HANDLER_TABLES (ON) binds the controls' 'handlers:' of each class from
+    # one table of (event, member function) entries through a single bindHandlers() loop,
+    # instead of instantiating hookAndHandle() once per handler lambda.
+    if (APP_GENERATOR_HANDLER_TABLES)
+        set(GENERATOR_HANDLERS_FLAG --handler-tables)
+    else ()
+        set(GENERATOR_HANDLERS_FLAG)
+    endif ()
+
+    # APP_GENERATOR_CLASS_ARGS_TABLE (ON) keeps each class's class_args defaults in one
+    # immutable map built on first use, filling a caller's args from it key by key instead
+    # of building and merging a fresh map (twice) on every page/group construction.
+    if (APP_GENERATOR_CLASS_ARGS_TABLE)
+        set(GENERATOR_ARGS_TABLE_FLAG --class-args-table)
+    else ()
+        set(GENERATOR_ARGS_TABLE_FLAG)
+    endif ()
+
+    # APP_GENERATOR_PARAM_KEYS (ON) has the generated param() reads (extract_*, translate:,
+    # if:/condition: keys) name class-scope ParamKey handles, hashed at compile time, instead
+    # of string literals hashed on every construction.
+    if (APP_GENERATOR_PARAM_KEYS)
+        set(GENERATOR_PARAM_KEYS_FLAG --param-keys)
+    else ()
+        set(GENERATOR_PARAM_KEYS_FLAG)
+    endif ()
+
+    # APP_GENERATOR_SHARED_LOOKUPS (ON) loads alt_data_source controls of one class that read
+    # the same (table, value_field, display_field) from a single query through the class's
+    # db::LookupCache, cleared on its recordset events, instead of one query per control.
+    if (APP_GENERATOR_SHARED_LOOKUPS)
+        set(GENERATOR_LOOKUPS_FLAG --shared-lookups)
+    else ()
+        set(GENERATOR_LOOKUPS_FLAG)
+    endif ()
+
+    # APP_GENERATOR_SCHEMA (ON) compiles the tables:/relationships: sections of the specs
+    # into "<target>.Schema": normalized CREATE TABLE / <table>_detail view DDL and a digest
+    # of it (db::schema::statements, db::schema::digest), so db::TableLoader can skip both
+    # the YAML and the DDL at start-up while the digest stored in the database matches.
+    # When it doesn't, TableLoader also rebuilds each table whose definition changed
+    # (db::schema::tables, db::schema::rebuild_at; see the comment in the module).
+    set(SCHEMA_MODULE "${_module_prefix}.Schema")
+    if (APP_GENERATOR_SCHEMA)
+        set(GENERATOR_SCHEMA_FLAG --schema "${SCHEMA_MODULE}")
+    else ()
+        set(GENERATOR_SCHEMA_FLAG)
+    endif ()
+
+    # Every generator run goes through yaml2code_client.py. It keeps a stamp of what the
+    # last successful run was generated from (arguments, YAML sizes/mtimes, the generator
+    # and the manifest it wrote) and exits at once while that still holds -- so the
+    # build-time rules below, which Ninja/Make always run once after a configure, trust
+    # the configure-time generation instead of redoing it. With APP_GENERATOR_SOCKET set
+    # it also forwards real runs to a resident `yaml2code.py --serve` on that socket
+    # (starting one in the background the first time) instead of paying interpreter +
+    # PyYAML start-up on each configure and build.
+    set(GENERATOR_COMMAND "${Python3_EXECUTABLE}" "${cmake_root}/yaml2code_client.py"
+            --stamp "${OUT_DIR}/.yaml2code.stamp")
+    if (DEFINED APP_GENERATOR_SOCKET AND NOT "${APP_GENERATOR_SOCKET}" STREQUAL "")
+        list(APPEND GENERATOR_COMMAND --socket "${APP_GENERATOR_SOCKET}")
+    endif ()
+
+    # 1) Configure-time generation so CMake can glob and add sources. The depfile maps
+    #    every generated module back to the YAML file it came from; it is only rewritten
+    #    when that mapping changes, so listing it in CMAKE_CONFIGURE_DEPENDS re-runs
+    #    configure exactly when modules appear, vanish or move between YAML files.
+    set(CLASSES_DEPFILE "${OUT_DIR}/yaml2code.d")
     file(MAKE_DIRECTORY "${OUT_DIR}")
+    file(MAKE_DIRECTORY "${OUT_DIR}/.stamps")
     file(MAKE_DIRECTORY "${IMPL_DIR}")
     execute_process(
-            COMMAND "${Python3_EXECUTABLE}"
-            "${cmake_root}/${generator}"
+            COMMAND ${GENERATOR_COMMAND}
             ${SHOW_QUIET_FLAG}
             ${SHOW_SIZER_INFO_FLAG}
+            ${GENERATOR_JOBS_FLAG}
+            ${GENERATOR_REGISTRY_FLAG}
+            ${GENERATOR_REPRODUCIBLE_FLAG}
+            ${GENERATOR_FUSE_FLAG}
+            ${GENERATOR_PRELUDE_FLAG}
+            ${GENERATOR_LAYOUTS_FLAG}
+            ${GENERATOR_HANDLERS_FLAG}
+            ${GENERATOR_ARGS_TABLE_FLAG}
+            ${GENERATOR_PARAM_KEYS_FLAG}
+            ${GENERATOR_LOOKUPS_FLAG}
+            ${GENERATOR_SCHEMA_FLAG}
             --scan "${SRCDIR}"
             --output "${OUT_DIR}"
             --impl-dir "${IMPL_DIR}"
             --app-target "${APP_NAME}"
             --export-var "${EXPORT_VAR}"
+            --depfile "${CLASSES_DEPFILE}"
             WORKING_DIRECTORY "${CMAKE_CURRENT_SOURCE_DIR}"
             RESULT_VARIABLE CONFIGURE_RESULT
             ERROR_VARIABLE OOPSIE
@@ -34,35 +184,128 @@ function(generateClasses OUT_DIR SRCDIR TRRGET EXPORT_VAR)
     if (NOT CONFIGURE_RESULT EQUAL 0)
         message(FATAL_ERROR "${generator} batch generation failed at configure time : ${OOPSIE}")
     endif ()
+    set_property(DIRECTORY APPEND PROPERTY CMAKE_CONFIGURE_DEPENDS "${CLASSES_DEPFILE}")
 
-    # 2) Build-time regeneration whenever YAML specs or the generator change
-    #    We use a 'stamp' file as the known OUTPUT so Ninja/Make can track the rule.
-    file(GLOB_RECURSE CLASS_DEPENDENCIES
+    # 2) Build-time regeneration: one rule per YAML file instead of a single stamp that
+    #    depends on all of them, so Ninja/Make only see the modules of the YAML that was
+    #    edited as dirty. Each rule runs the batch scoped to its file (--only): the scan,
+    #    manifest and PageType numbering are the batch's, but it writes nothing except that
+    #    file's own modules and stubs -- exactly its BYPRODUCTS below -- so no rule rewrites
+    #    a file Ninja thinks another rule produces. Right after configure all of them are
+    #    stamp checks that never start the generator.
+    #    Modules assembled from every YAML file (the prelude, the schema, --fuse units) are
+    #    the BYPRODUCTS of one more rule, run after all per-YAML rules (--shared-only).
+    #    (No dyndep: the set of modules only changes when a YAML file gains or loses a
+    #    class, or is added or removed. A --only rule that sees that happen -- or sees
+    #    other files' PageType IDs move, which it may not rewrite -- updates the depfile
+    #    and fails, asking for another build, which re-runs configure and with it the full
+    #    generation. The depfile is CMake's, read below and in CMAKE_CONFIGURE_DEPENDS;
+    #    Ninja never sees it, as it names each rule's outputs rather than extra inputs.)
+    file(GLOB_RECURSE CLASS_YAML_FILES
             CONFIGURE_DEPENDS
             "${SRCDIR}/*.yaml"
-            "${cmake_root}/${generator}"
     )
 
-    set(CLASSES_STAMP "${OUT_DIR}/.generated.stamp")
-    add_custom_command(
-            OUTPUT "${CLASSES_STAMP}"
-            BYPRODUCTS ${CLASS_FILES}
-            COMMAND "${CMAKE_COMMAND}" -E make_directory "${OUT_DIR}"
-            COMMAND "${CMAKE_COMMAND}" -E make_directory "${IMPL_DIR}"
-            COMMAND "${Python3_EXECUTABLE}"
-            "${cmake_root}/${generator}"
-            --quiet ${SHOW_SIZER_INFO_FLAG}
+    # Read the "<out.ixx> <out.ixx>...: <spec.yaml>" lines back, and after the
+    # "# shared:" line the one "<out.ixx>...: <every spec.yaml>" rule for the shared
+    # modules. Make escapes spaces as "\ ", so swap those out before splitting and restore
+    # them per path.
+    set(SHARED_OUTPUTS)
+    set(_shared_line FALSE)
+    if (EXISTS "${CLASSES_DEPFILE}")
+        file(STRINGS "${CLASSES_DEPFILE}" _dep_lines)
+        foreach (_line IN LISTS _dep_lines)
+            if (_line MATCHES "^# shared:")
+                set(_shared_line TRUE)
+                continue()
+            endif ()
+            string(REPLACE "\\ " "<SPACE>" _line "${_line}")
+            string(REPLACE "\\#" "#" _line "${_line}")
+            string(REPLACE "$$" "$" _line "${_line}")
+            string(FIND "${_line}" ": " _colon REVERSE)
+            if (_colon LESS 0)
+                continue()
+            endif ()
+            string(SUBSTRING "${_line}" 0 ${_colon} _outs)
+            math(EXPR _colon "${_colon} + 2")
+            string(SUBSTRING "${_line}" ${_colon} -1 _yaml)
+            string(REPLACE "<SPACE>" " " _yaml "${_yaml}")
+            string(REPLACE " " ";" _outs "${_outs}")
+            string(REPLACE "<SPACE>" " " _outs "${_outs}")
+            if (_shared_line)
+                list(APPEND SHARED_OUTPUTS ${_outs})
+                set(_shared_line FALSE)
+                continue()
+            endif ()
+            string(MD5 _key "${_yaml}")
+            set(_yaml2code_outputs_${_key} ${_outs})
+        endforeach ()
+    endif ()
+
+    set(GENERATOR_ARGS
+            ${SHOW_SIZER_INFO_FLAG}
+            ${GENERATOR_JOBS_FLAG}
+            ${GENERATOR_REGISTRY_FLAG}
+            ${GENERATOR_REPRODUCIBLE_FLAG}
+            ${GENERATOR_FUSE_FLAG}
+            ${GENERATOR_PRELUDE_FLAG}
+            ${GENERATOR_LAYOUTS_FLAG}
+            ${GENERATOR_HANDLERS_FLAG}
+            ${GENERATOR_ARGS_TABLE_FLAG}
+            ${GENERATOR_PARAM_KEYS_FLAG}
+            ${GENERATOR_LOOKUPS_FLAG}
+            ${GENERATOR_SCHEMA_FLAG}
             --scan "${SRCDIR}"
             --output "${OUT_DIR}"
             --impl-dir "${IMPL_DIR}"
             --app-target "${APP_NAME}"
             --export-var "${EXPORT_VAR}"
-            COMMAND "${CMAKE_COMMAND}" -E touch "${CLASSES_STAMP}"
-            DEPENDS ${CLASS_DEPENDENCIES} "${cmake_root}/${generator}"
-            COMMENT "Generating ixx files from YAML specs (batch mode)"
-            VERBATIM
+            --depfile "${CLASSES_DEPFILE}"
     )
 
+    set(CLASSES_STAMPS)
+    foreach (_yaml IN LISTS CLASS_YAML_FILES)
+        file(RELATIVE_PATH _rel "${SRCDIR}" "${_yaml}")
+        string(MAKE_C_IDENTIFIER "${_rel}" _stamp)
+        set(_stamp "${OUT_DIR}/.stamps/${_stamp}.stamp")
+        string(MD5 _key "${_yaml}")
+
+        add_custom_command(
+                OUTPUT "${_stamp}"
+                BYPRODUCTS ${_yaml2code_outputs_${_key}}
+                COMMAND "${CMAKE_COMMAND}" -E make_directory "${OUT_DIR}"
+                COMMAND "${CMAKE_COMMAND}" -E make_directory "${IMPL_DIR}"
+                COMMAND ${GENERATOR_COMMAND} --quiet ${GENERATOR_ARGS} --only "${_yaml}"
+                COMMAND "${CMAKE_COMMAND}" -E touch "${_stamp}"
+                DEPENDS "${_yaml}" "${cmake_root}/${generator}" "${cmake_root}/yaml2code_client.py"
+                COMMENT "Generating ixx files from ${_rel}"
+                VERBATIM
+        )
+        list(APPEND CLASSES_STAMPS "${_stamp}")
+        unset(_yaml2code_outputs_${_key})
+    endforeach ()
+
+    if (GENERATOR_FUSE_FLAG OR APP_GENERATOR_PRELUDE OR APP_GENERATOR_SCHEMA)
+        if (APP_GENERATOR_PRELUDE)
+            list(APPEND SHARED_OUTPUTS "${OUT_DIR}/${PRELUDE_MODULE}.ixx")
+        endif ()
+        if (APP_GENERATOR_SCHEMA)
+            list(APPEND SHARED_OUTPUTS "${OUT_DIR}/${SCHEMA_MODULE}.ixx")
+        endif ()
+        list(REMOVE_DUPLICATES SHARED_OUTPUTS)
+        set(_stamp "${OUT_DIR}/.stamps/shared.stamp")
+        add_custom_command(
+                OUTPUT "${_stamp}"
+                BYPRODUCTS ${SHARED_OUTPUTS}
+                COMMAND ${GENERATOR_COMMAND} --quiet ${GENERATOR_ARGS} --shared-only
+                COMMAND "${CMAKE_COMMAND}" -E touch "${_stamp}"
+                DEPENDS ${CLASSES_STAMPS} "${cmake_root}/${generator}" "${cmake_root}/yaml2code_client.py"
+                COMMENT "Generating shared ixx files"
+                VERBATIM
+        )
+        list(APPEND CLASSES_STAMPS "${_stamp}")
+    endif ()
+
     # 3) Add generated RS.ixx to your target
     #    Do an initial glob after the configure-time generation. yaml2code.py nests output
     #    under record_sets/{rs,ui}/ and user_interface/ui/, so this must recurse.
@@ -73,9 +316,17 @@ function(generateClasses OUT_DIR SRCDIR TRRGET EXPORT_VAR)
             "${OUT_DIR}/*RS.ixx"
             "${OUT_DIR}/*Wizard.ixx"
             "${OUT_DIR}/*Book.ixx"
+            "${OUT_DIR}/*.UI.ixx"
     )
+    # The prelude goes into the file set ahead of the modules that import it.
+    if (APP_GENERATOR_PRELUDE)
+        list(PREPEND CLASS_FILES "${OUT_DIR}/${PRELUDE_MODULE}.ixx")
+    endif ()
+    if (APP_GENERATOR_SCHEMA)
+        list(APPEND CLASS_FILES "${OUT_DIR}/${SCHEMA_MODULE}.ixx")
+    endif ()
 
-    add_custom_target(generate_classes ALL DEPENDS "${CLASSES_STAMP}")
+    add_custom_target(generate_classes ALL DEPENDS ${CLASSES_STAMPS})
 
     # Ensure your target waits for the generation step
     add_dependencies(${TRRGET} generate_classes)
@@ -0,0 +1,54 @@
+"""
+Shared helpers for the yaml2code.py tests.
+
+Every run goes through a fresh `python yaml2code.py` process, as generator.cmake runs it:
+the generator keeps per-run state on module-level objects (the resident --serve mode
+resets it explicitly), so in-process runs could leak one test's options into the next.
+"""
+
+import subprocess
+import sys
+from pathlib import Path
+from typing import Dict
+
+import pytest
+
+REPO = Path(__file__).resolve().parent.parent
+GENERATOR = REPO / "yaml2code.py"
+FIXTURES = Path(__file__).resolve().parent / "fixtures"
+SPECS = FIXTURES / "specs"
+
+# For the few tests that call a helper directly (never a generation run; see above).
+sys.path.insert(0, str(REPO))
+
+
+def run_generator(*argv, cwd=None) -> subprocess.CompletedProcess:
+    """Run yaml2code.py with argv; fails the test on a non-zero exit."""
+    result = subprocess.run([sys.executable, str(GENERATOR), *map(str, argv)], cwd=cwd,
+                            capture_output=True, text=True)
+    assert result.returncode == 0, f"yaml2code.py {' '.join(map(str, argv))} failed:\n{result.stderr}"
+    return result
+
+
+def generate(specs: Path, out: Path, *options) -> subprocess.CompletedProcess:
+    """Batch-generate specs into out/ (impl stubs in out/impl) with stable headers."""
+    return run_generator("--quiet", "--reproducible", "--no-parse-cache", "--scan", specs,
+                         "--output", out / "gen", "--impl-dir", out / "impl", "--app-target", "App",
+                         "--export-var", "GFX_EXPORT", *options)
+
+
+def read_tree(root: Path) -> Dict[str, str]:
+    """Every generated file under root, relative path -> text, minus the generator's own
+       bookkeeping (manifest, digests, fragments, caches)."""
+    return {p.relative_to(root).as_posix(): p.read_text(encoding="utf-8")
+            for p in sorted(root.rglob("*"))
+            if p.is_file() and not any(part.startswith(".yaml2code") for part in p.relative_to(root).parts)}
+
+
+@pytest.fixture
+def specs(tmp_path) -> Path:
+    """A private copy of the fixture specs, safe to edit."""
+    import shutil
+    dest = tmp_path / "specs"
+    shutil.copytree(SPECS, dest)
+    return dest
@@ -0,0 +1,162 @@
+module;
+//
+// Auto-generated from
+// customer.yaml (sha256: 4c69b5a9c3ca1b5a)
+
+// Make any changes there. This file will be overwritten.
+
+#include "Core/Core.h"
+#include "Core/CoreData.h"
+#include "Core/Util.h"
+
+#include "Gfx/gfx_export.h"
+#include "Gfx/WidgetsFwd.h"
+
+#include "Gfx/Sizes.h"
+
+#include <unordered_set>
+
+export module CustomerDetails.Group;
+
+import Ctrl;
+import DB.RowSet;
+import DDT;
+import Database;
+import Group;
+import Interface;
+import Page;
+import RecordSetInterface;
+import StringUtil;
+import TextCtrl;
+import Validator;
+import wxTypes;
+import wxUtil;
+
+export namespace PageType {
+const Type CustomerDetailsGroup(1000);
+}
+
+namespace wx {
+
+struct kindDBSource {
+   static auto table() -> std::string { return "kinds"; }
+   static auto displayText(const db::Row &r) -> std::string { return r.get<std::string>("name"); }
+   static auto value(const db::Row &r) -> ID::Type { return ID::Type(r.get<int>("id")); }
+   static constexpr auto includeBlank() -> bool { return true; }
+   static auto blankText() -> std::string { return ""; }
+   static constexpr auto textField() -> std::string_view { return "name"; }
+   static auto locked(const db::Row &r) -> bool { return r.get<hs_bool>("bLocked").get(); }
+};
+
+struct kind2DBSource {
+   static auto table() -> std::string { return "kinds"; }
+   static auto displayText(const db::Row &r) -> std::string { return r.get<std::string>("name"); }
+   static auto value(const db::Row &r) -> ID::Type { return ID::Type(r.get<int>("id")); }
+   static constexpr auto includeBlank() -> bool { return true; }
+   static auto blankText() -> std::string { return ""; }
+   static constexpr auto textField() -> std::string_view { return "name"; }
+   static auto locked(const db::Row &r) -> bool { return r.get<hs_bool>("bLocked").get(); }
+};
+
+export class GFX_EXPORT CustomerDetailsGroup : public Group {
+   std::filesystem::path layoutPath;
+   std::string layoutKey;
+   static auto custArgsDefault() -> anymap {
+      anymap m;
+         m.emplace("showNotes", std::any(true));
+         m.emplace("title", std::any(std::string{"Customer"}));
+      return m;
+   }
+   static auto custArgsMerged(anymap &a) -> anymap & {
+      a.merge(custArgsDefault());
+      return a;
+   }
+
+protected:
+   // OnKillActive/SetActive/onEvent overrides
+   auto onSetActive(bool autoEnable) -> void override;
+   auto refreshEx(const db::Row *rec) -> void;  // Implemented in CustomerDetailsGroup_impl.cpp
+
+   TextCtrl* m_name {};
+   Choice<ID::Type, kindDBSource>* m_kind {};
+   Combo<ID::Type, kind2DBSource>* m_kind2 {};
+
+public:
+   auto doThing (int x) -> int;  // Implemented in CustomerDetailsGroup_impl.cpp
+   auto refreshFromCurrent (const db::Row *rec) -> void {
+      if (!rec)
+         return;
+      wx::initFromField(m_name, rec->get<std::optional<std::string>>("name"));
+      m_name->where("id = " + std::to_string(rec->get<int>("id")));
+      refreshEx(rec);
+      ICtrl::transferTheseToWindow(controlMap());
+   }
+
+public:
+   ~CustomerDetailsGroup() override = default;
+
+   explicit CustomerDetailsGroup ( UICreateFlags cflags, 
+                                   std::string name, 
+                                   wxWindow *pParent, 
+                                   value_t value = std::string{},
+                                   anymap args = custArgsDefault(),
+                                   long style = 0)
+      : Group (cflags, name, pParent, value, custArgsMerged(args), style) {
+      this->Interface::mergeWithCreationArgs(custArgsDefault());
+      auto showNotesLocal = param(args, "showNotes", false);
+      layoutPath = Util::getInstance().resourceName(UIType::GeneratorSource, "CustomerDetailsGroup", false, nullptr);
+      ASSERT_MSG(!layoutPath.empty(), "Couldn't find layout resource 'CustomerDetailsGroup'");
+      layoutKey = "customer_details";
+
+      auto targetParent = getSBSizer()->GetStaticBox();;
+
+      (m_name = new TextCtrl(UICreateFlags::Null, "name", targetParent, std::string { "" }, args, wxTAB_TRAVERSAL, wxDefaultSize))
+         ->addValidator(new CapsValidator(true, m_name->liveAddr(), [] { return settings()->useCaps(); }))
+         .createLabel(UICreateFlags::Label, "nameLabel", "Name:", sizeLabel, wxALIGN_RIGHT | wxALIGN_CENTER_VERTICAL)
+         .createLabel(UICreateFlags::Label, "nameLabel2", "Surname:", sizeLabelSmall, wxALIGN_RIGHT | wxALIGN_CENTER_VERTICAL)
+         .setToolTip("The name")
+         .hookAndHandle(wxEVT_TEXT, [this](wxEvent &event) {
+            event.Skip();})
+         .hookAndHandle(wxEVT_SET_FOCUS, [this](wxEvent &event) {
+            event.Skip();})
+         .hookAndHandle(wxEVT_KILL_FOCUS, [this](wxEvent &event) {
+            event.Skip();})
+         .setWindowStyleFlags(wxTAB_TRAVERSAL)
+         .dbInfo(db::TableName {"customer"}, db::FieldName {"name"})
+         .transferToWindow();
+      addControl(m_name);
+
+      // Section 'Kind' labels, registered on each of its 2 controls
+      const struct { const char *tag; const char *value; wxSize size; long flags; } section1Labels[] = {
+         { "kindLabel", "Kind:", sizeLabel, wxALIGN_RIGHT | wxALIGN_CENTER_VERTICAL },
+      };
+      anymap kindArgs = args ;
+      add_to_anymap(kindArgs["flag"], true);
+      (m_kind = new Choice<ID::Type, kindDBSource>(UICreateFlags::Null, "kind", targetParent, ID::Type { ID::Null }, kindArgs, wxTAB_TRAVERSAL, sizeCtrlComboLike));
+      for (const auto &label : section1Labels)
+         m_kind->createLabel(UICreateFlags::Label, label.tag, label.value, label.size, label.flags);
+      m_kind
+         ->setWindowStyleFlags(wxTAB_TRAVERSAL)
+         .pushToCtrl();
+      m_kind->loadFromDB();
+      addControl(m_kind);
+
+      auto kindCount = param(kindArgs, "count", 0);
+
+      (m_kind2 = new Combo<ID::Type, kind2DBSource>(UICreateFlags::Null, "kind2", targetParent, ID::Type { ID::Null }, args, wxTAB_TRAVERSAL, wxDefaultSize));
+      for (const auto &label : section1Labels)
+         m_kind2->createLabel(UICreateFlags::Label, label.tag, label.value, label.size, label.flags);
+      m_kind2
+         ->setWindowStyleFlags(wxTAB_TRAVERSAL)
+         .pushToCtrl();
+      m_kind2->loadFromDB();
+      addControl(m_kind2);
+
+      VERIFY_MSG(this->loadLayout(layoutPath, layoutKey), "Error loading layout resource " + layoutPath.string());
+   }
+};
+
+auto CustomerDetailsGroup::onSetActive(bool autoEnable) -> void {
+Interface::onSetActive(autoEnable);
+}
+} // namespace wx
\ No newline at end of file
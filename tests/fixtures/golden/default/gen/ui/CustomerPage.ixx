@@ -0,0 +1,81 @@
+module;
+//
+// Auto-generated from
+// customer.yaml (sha256: 4c69b5a9c3ca1b5a)
+
+// Make any changes there. This file will be overwritten.
+
+#include "Core/Core.h"
+#include "Core/CoreData.h"
+#include "Core/Util.h"
+
+#include "Gfx/gfx_export.h"
+#include "Gfx/WidgetsFwd.h"
+
+#include "Gfx/Sizes.h"
+
+#include <unordered_set>
+#include <vector>
+
+export module Customer.Page;
+
+import Ctrl;
+import CustomerDetails.Group;
+import DDT;
+import Group;
+import RecordSetInterface;
+import StringUtil;
+import wxTypes;
+import DB.RowSet;
+import RecordSetPage;
+
+export namespace PageType {
+const Type CustomerPage(1001);
+}
+
+namespace wx {
+
+export class GFX_EXPORT CustomerPage : public RecordSetPage {
+   std::filesystem::path layoutPath;
+   std::string layoutKey;
+
+protected:
+   // OnKillActive/SetActive/onEvent overrides
+   auto refreshEx(const db::Row *rec) -> void override;  // Implemented in CustomerPage_impl.cpp
+
+   CustomerDetailsGroup* m_details {};
+
+private:
+   int counter {3};
+
+public:
+   auto bindRecordFields (const db::Row *rec) -> void override {
+      if constexpr (requires { m_details->refreshFromCurrent(rec); })
+         m_details->refreshFromCurrent(rec);
+   }
+
+public:
+   ~CustomerPage() override = default;
+
+   explicit CustomerPage ( Book *book, 
+                           wxWindowIDRef id, 
+                           const std::string& name,
+                           PageType::Type type = PageType::CustomerPage,
+                           int imageIndex = -1,
+                           const anymap &args = nullanymap)
+      : RecordSetPage (book, id, name, type, "customer", "name", imageIndex, args) {
+      layoutPath = Util::getInstance().resourceName(UIType::GeneratorSource, "CustomerPage", false, nullptr);
+      ASSERT_MSG(!layoutPath.empty(), "Couldn't find layout resource 'CustomerPage'");
+      layoutKey = "customer";
+
+      auto targetParent = getForm();
+
+      (m_details = new CustomerDetailsGroup(UICreateFlags::Null, "details", targetParent, std::string { "" }, args, wxTAB_TRAVERSAL));
+      addControl(m_details);
+
+      VERIFY_MSG(this->loadLayout(layoutPath, layoutKey), "Error loading layout resource " + layoutPath.string());
+      if (getForm())
+         getForm()->SetSizerAndFit(&grid(), true);
+   }
+};
+} // namespace wx
\ No newline at end of file
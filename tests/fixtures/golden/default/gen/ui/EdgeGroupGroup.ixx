@@ -0,0 +1,76 @@
+module;
+//
+// Auto-generated from
+// edge.yaml (sha256: 734b0420592d89d8)
+
+// Make any changes there. This file will be overwritten.
+
+#include "Core/Core.h"
+#include "Core/CoreData.h"
+#include "Core/Util.h"
+
+#include "Gfx/gfx_export.h"
+#include "Gfx/WidgetsFwd.h"
+
+#include "Gfx/Sizes.h"
+
+#include <unordered_set>
+
+export module EdgeGroup.Group;
+
+import Ctrl;
+import DDT;
+import Group;
+import Page;
+import StringUtil;
+import wxTypes;
+
+export namespace PageType {
+const Type EdgeGroupGroup(1002);
+}
+
+namespace wx {
+
+export class GFX_EXPORT EdgeGroupGroup : public Group {
+   std::filesystem::path layoutPath;
+   std::string layoutKey;
+
+   TextCtrl* m_a {};
+   TextCtrl* None {};
+
+public:
+   ~EdgeGroupGroup() override = default;
+
+   explicit EdgeGroupGroup ( UICreateFlags cflags, 
+                             std::string name, 
+                             wxWindow *pParent, 
+                             value_t value = std::string{},
+                             const anymap &args = nullanymap,
+                             long style = 0)
+      : Group (cflags, name, pParent, value, args, style) {
+      layoutPath = Util::getInstance().resourceName(UIType::GeneratorSource, "EdgeGroupGroup", false, nullptr);
+      ASSERT_MSG(!layoutPath.empty(), "Couldn't find layout resource 'EdgeGroupGroup'");
+      layoutKey = "edge_group";
+
+      auto targetParent = getSBSizer()->GetStaticBox();;
+
+      int sectionLocal = 1;
+      (m_a = new TextCtrl(UICreateFlags::ReadOnly | (x > 1 ? UICreateFlags::Hidden : UICreateFlags::Null), "a-A", targetParent, std::string { "" }, args, wxTAB_TRAVERSAL, wxDefaultSize))
+         ->createLabel(UICreateFlags::Label, "aLabel", someVar, sizeLabel, wxALIGN_RIGHT | wxALIGN_CENTER_VERTICAL)
+         .hookAndHandle(wxEVT_BUTTON, [this](wxCommandEvent &event) {
+            a();
+         b();})
+         .setWindowStyleFlags(wxTAB_TRAVERSAL)
+         .pushToCtrl();
+      doSomething();
+      addControl(m_a);
+
+      (new TextCtrl(UICreateFlags::Null, "novar", targetParent, std::string { "" }, args, wxTAB_TRAVERSAL, wxDefaultSize))
+         ->setWindowStyleFlags(wxTAB_TRAVERSAL)
+         .pushToCtrl();
+      addControl(None);
+
+      VERIFY_MSG(this->loadLayout(layoutPath, layoutKey), "Error loading layout resource " + layoutPath.string());
+   }
+};
+} // namespace wx
\ No newline at end of file
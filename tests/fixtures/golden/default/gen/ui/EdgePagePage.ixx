@@ -0,0 +1,93 @@
+module;
+//
+// Auto-generated from
+// edge.yaml (sha256: 734b0420592d89d8)
+
+// Make any changes there. This file will be overwritten.
+
+#include "Core/Core.h"
+#include "Core/CoreData.h"
+#include "Core/Util.h"
+
+#include "Gfx/gfx_export.h"
+#include "Gfx/WidgetsFwd.h"
+
+#include "Gfx/Sizes.h"
+
+#include <unordered_set>
+
+export module EdgePage.Page;
+
+import Ctrl;
+import DDT;
+import Database;
+import Group;
+import RecordSetInterface;
+import StringUtil;
+import wxTypes;
+import wxUtil;
+import DB.RowSet;
+import RecordSetPage;
+
+export namespace PageType {
+const Type EdgePagePage(1003);
+}
+
+namespace wx {
+
+export class GFX_EXPORT EdgePagePage : public RecordSetPage {
+   std::filesystem::path layoutPath;
+   std::string layoutKey;
+
+protected:
+   // OnKillActive/SetActive/onEvent overrides
+   auto refreshEx(const db::Row *rec) -> void override;  // Implemented in EdgePagePage_impl.cpp
+
+   EdgeGroup* m_g {};
+   OtherGroup* m_h {};
+   TextCtrl* m_t {};
+
+public:
+   auto bindRecordFields (const db::Row *rec) -> void override {
+      wx::initFromField(m_t, rec->get<std::optional<int>>("f"));
+      m_t->where("id = " + std::to_string(rec->get<int>("id")));
+      if constexpr (requires { m_g->refreshFromCurrent(rec); })
+         m_g->refreshFromCurrent(rec);
+      if constexpr (requires { m_h->refreshFromCurrent(rec); })
+         m_h->refreshFromCurrent(rec);
+   }
+
+public:
+   ~EdgePagePage() override = default;
+
+   explicit EdgePagePage ( Book *book, 
+                           wxWindowIDRef id, 
+                           const std::string& name,
+                           PageType::Type type = PageType::EdgePagePage,
+                           int imageIndex = -1,
+                           const anymap &args = nullanymap)
+      : RecordSetPage (book, id, name, type, "t", "id", imageIndex, args) {
+      layoutPath = Util::getInstance().resourceName(UIType::GeneratorSource, "EdgePagePage", false, nullptr);
+      ASSERT_MSG(!layoutPath.empty(), "Couldn't find layout resource 'EdgePagePage'");
+      layoutKey = "edge_page";
+
+      auto targetParent = getForm();
+
+      (m_g = new EdgeGroup(UICreateFlags::Group, "g", targetParent, std::string {  }, args, wxTAB_TRAVERSAL));
+      addGroup(m_g);
+
+      (m_h = new OtherGroup(UICreateFlags::Null, "h", targetParent, std::string { "" }, args, wxTAB_TRAVERSAL));
+      addControl(m_h);
+
+      (m_t = new TextCtrl(UICreateFlags::Null, "t", targetParent, int { "" }, args, wxTAB_TRAVERSAL, wxDefaultSize))
+         ->setWindowStyleFlags(wxTAB_TRAVERSAL)
+         .dbInfo(db::TableName {"t"}, db::FieldName {"f"})
+         .pushToCtrl();
+      addControl(m_t);
+
+      VERIFY_MSG(this->loadLayout(layoutPath, layoutKey), "Error loading layout resource " + layoutPath.string());
+      if (getForm())
+         getForm()->SetSizerAndFit(&grid(), true);
+   }
+};
+} // namespace wx
\ No newline at end of file
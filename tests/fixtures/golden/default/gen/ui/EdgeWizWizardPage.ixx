@@ -0,0 +1,66 @@
+module;
+//
+// Auto-generated from
+// edge.yaml (sha256: 734b0420592d89d8)
+
+// Make any changes there. This file will be overwritten.
+
+#include "Core/Core.h"
+#include "Core/CoreData.h"
+#include "Core/Util.h"
+
+#include "Gfx/gfx_export.h"
+#include "Gfx/WidgetsFwd.h"
+
+#include "Gfx/Sizes.h"
+
+#include <unordered_set>
+
+export module EdgeWiz.WizardPage;
+
+import Ctrl;
+import DDT;
+import GenericValidator;
+import WizardPage;
+import wxTypes;
+
+export namespace PageType {
+const Type EdgeWizWizardPage(1004);
+}
+
+namespace wx {
+
+export class GFX_EXPORT EdgeWizWizardPage : public WizardPage {
+   std::filesystem::path layoutPath;
+   std::string layoutKey;
+
+   CheckBox* m_w {};
+
+public:
+   ~EdgeWizWizardPage() override = default;
+
+   explicit EdgeWizWizardPage ( UICreateFlags cflags, 
+                                std::string name, 
+                                wxWindow *pParent, 
+                                value_t value = std::string{},
+                                const anymap &args = nullanymap,
+                                long style = 0)
+      : WizardPage (cflags, name, pParent, value, args, style) {
+      layoutPath = Util::getInstance().resourceName(UIType::GeneratorSource, "EdgeWizWizardPage", false, nullptr);
+      ASSERT_MSG(!layoutPath.empty(), "Couldn't find layout resource 'EdgeWizWizardPage'");
+      layoutKey = "edge_wiz";
+
+      auto targetParent = this;
+
+      (m_w = new CheckBox(UICreateFlags::Null, "w", targetParent, bool { false }, args, wxTAB_TRAVERSAL, wxDefaultSize))
+         ->addValidator(new GenericValidator(true, m_w->liveAddr()))
+         .setWindowStyleFlags(wxTAB_TRAVERSAL)
+         .transferToWindow();
+      addControl(m_w);
+
+      VERIFY_MSG(this->loadLayout(layoutPath, layoutKey), "Error loading layout resource " + layoutPath.string());
+      GetPageSizer().Add(&grid(), 1, wxALL | wxGROW);
+      SetSizerAndFit(&GetPageSizer(), true);
+   }
+};
+} // namespace wx
\ No newline at end of file
@@ -0,0 +1,31 @@
+module;
+//
+// Auto-generated from
+// sub/wiz.yaml (sha256: f9e1d83642888436)
+
+// Make any changes there. This file will be overwritten.
+
+#include "Core/Core.h"
+#include "Core/CoreData.h"
+#include "Core/Util.h"
+#include "Gfx/gfx_export.h"
+#include "Gfx/WidgetsFwd.h"
+
+export module Main.Book;
+
+import Book;
+import Customer.Page;
+import DDT;
+import Types;
+import Util;
+import wxTypes;
+
+namespace wx {
+export auto populate(Book *book) -> void {
+
+      (void) new CustomerPage(book, wx::nextID(), "customer", PageType::CustomerPage, -1);
+      anymap customer2Args = args;
+      add_to_anymap(customer2Args["title"], "x");
+      (void) new CustomerPage(book, wx::nextID(), "customer2", PageType::CustomerPage, -1, customer2Args);
+}
+} // namespace wx
\ No newline at end of file
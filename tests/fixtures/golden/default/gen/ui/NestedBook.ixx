@@ -0,0 +1,63 @@
+module;
+//
+// Auto-generated from
+// sub/wiz.yaml (sha256: f9e1d83642888436)
+
+// Make any changes there. This file will be overwritten.
+
+#include "Core/Core.h"
+#include "Core/CoreData.h"
+#include "Core/Util.h"
+
+#include "Gfx/gfx_export.h"
+#include "Gfx/WidgetsFwd.h"
+
+#include "Gfx/Sizes.h"
+
+#include <unordered_set>
+
+export module Nested.Page;
+
+import DDT;
+import Page;
+import wxTypes;
+import wxUtil;
+import Customer.Page;
+import Book;
+
+export namespace PageType {
+const Type NestedPage(1006);
+}
+
+namespace wx {
+
+export class GFX_EXPORT NestedPage : public PageContainer {
+   std::filesystem::path layoutPath;
+   std::string layoutKey;
+
+   // No elements defined
+
+public:
+   ~NestedPage() override = default;
+
+   explicit NestedPage ( Book *book, 
+                         wxWindowIDRef id, 
+                         const std::string& name,
+                         PageType::Type type = PageType::NestedPage,
+                         int imageIndex = -1,
+                         const anymap &args = nullanymap)
+      : PageContainer (book, id, name, type, imageIndex, args) {
+      layoutPath = Util::getInstance().resourceName(UIType::GeneratorSource, "NestedPage", false, nullptr);
+      ASSERT_MSG(!layoutPath.empty(), "Couldn't find layout resource 'NestedPage'");
+      layoutKey = "nested";
+
+      // No control creation code
+
+      VERIFY_MSG(this->loadLayout(layoutPath, layoutKey), "Error loading layout resource " + layoutPath.string());
+      load();
+      (void) new CustomerPage(this->book(), wx::nextID(), "inner", PageType::CustomerPage, -1);
+      if (getForm())
+         getForm()->SetSizerAndFit(&grid(), true);
+   }
+};
+} // namespace wx
\ No newline at end of file
@@ -0,0 +1,60 @@
+module;
+//
+// Auto-generated from
+// sub/wiz.yaml (sha256: f9e1d83642888436)
+
+// Make any changes there. This file will be overwritten.
+
+#include "Core/Core.h"
+#include "Core/CoreData.h"
+#include "Core/Util.h"
+#include "Gfx/gfx_export.h"
+#include "Gfx/WidgetsFwd.h"
+#include "App/GlobalIDs.h"
+#include <wx/wizard.h>
+#include <utility>
+
+export module Setup.Wizard;
+
+import Ctrl;
+import CtrlSignals;
+import DDT;
+import HtmlDialog;
+import InterfaceController;
+import Types;
+import Util;
+import Welcome.WizardPage;
+import Wizard;
+import WizardPage;
+
+namespace wx {
+export class GFX_EXPORT SetupWizard : public Wizard {
+   static auto wizArgsDefault() -> anymap {
+      anymap m;
+         add_to_anymap(m["firstRun"], false);
+      return m;
+   }
+   static auto wizArgsMerged(anymap &a) -> anymap & {
+      a.merge(wizArgsDefault());
+      return a;
+   }
+
+protected:
+   [[nodiscard]] auto cancelMessage() const -> std::pair<std::string, std::string> override;
+
+ public:
+   explicit SetupWizard(wxFrame *frame, std::string title, anymap args = wizArgsDefault()) : Wizard(frame, title, wizArgsMerged(args)) {
+
+      TraceCall();;
+
+      addPage(new WelcomeWizardPage(UICreateFlags::ExcludeFromColour | UICreateFlags::NoValidation | UICreateFlags::NoDefaultBinds, "welcome", this, "Welcome"s, args, 0L));
+      if (!param<bool>(args, "firstRun", false)) {
+         addPage(new WelcomeWizardPage(UICreateFlags::ExcludeFromColour | UICreateFlags::NoValidation | UICreateFlags::NoDefaultBinds, "welcome2", this, (param<bool>(args, "firstRun", false) ? "A"s : "B"s), args, 0L));
+      }
+   }
+};
+
+auto SetupWizard::cancelMessage() const -> std::pair<std::string, std::string> {
+   return {"Nope", "<p>The wizard was canceled.</p><p>Setup is incomplete; exiting.</p>"};
+}
+} // namespace wx
\ No newline at end of file
@@ -0,0 +1,65 @@
+module;
+//
+// Auto-generated from
+// sub/wiz.yaml (sha256: f9e1d83642888436)
+
+// Make any changes there. This file will be overwritten.
+
+#include "Core/Core.h"
+#include "Core/CoreData.h"
+#include "Core/Util.h"
+
+#include "Gfx/gfx_export.h"
+#include "Gfx/WidgetsFwd.h"
+
+#include "Gfx/Sizes.h"
+
+#include <unordered_set>
+
+export module Welcome.WizardPage;
+
+import Ctrl;
+import DDT;
+import WizardPage;
+import wxTypes;
+
+export namespace PageType {
+const Type WelcomeWizardPage(1005);
+}
+
+namespace wx {
+
+export class GFX_EXPORT WelcomeWizardPage : public WizardPage {
+   std::filesystem::path layoutPath;
+   std::string layoutKey;
+
+   StaticText* m_intro {};
+
+public:
+   ~WelcomeWizardPage() override = default;
+
+   explicit WelcomeWizardPage ( UICreateFlags cflags, 
+                                std::string name, 
+                                wxWindow *pParent, 
+                                value_t value = std::string{},
+                                const anymap &args = nullanymap,
+                                long style = 0)
+      : WizardPage (cflags, name, pParent, value, args, style) {
+      layoutPath = Util::getInstance().resourceName(UIType::GeneratorSource, "WelcomeWizardPage", false, nullptr);
+      ASSERT_MSG(!layoutPath.empty(), "Couldn't find layout resource 'WelcomeWizardPage'");
+      layoutKey = "welcome";
+
+      auto targetParent = this;
+
+      (m_intro = new StaticText(UICreateFlags::Null, "intro", targetParent, std::string{"Welcome"}, args, wxTAB_TRAVERSAL, wxDefaultSize))
+         ->createLabel(UICreateFlags::Label, "introLabel", "Hi", sizeLabel, wxALIGN_RIGHT | wxALIGN_CENTER_VERTICAL)
+         .setWindowStyleFlags(wxTAB_TRAVERSAL)
+         .pushToCtrl();
+      addControl(m_intro);
+
+      VERIFY_MSG(this->loadLayout(layoutPath, layoutKey), "Error loading layout resource " + layoutPath.string());
+      GetPageSizer().Add(&grid(), 1, wxALL | wxGROW);
+      SetSizerAndFit(&GetPageSizer(), true);
+   }
+};
+} // namespace wx
\ No newline at end of file
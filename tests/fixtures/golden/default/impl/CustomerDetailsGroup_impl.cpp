@@ -0,0 +1,18 @@
+module;
+// Module implementation unit — add includes your implementation needs.
+#include "Core/Core.h"
+#include <wx/event.h>
+
+module CustomerDetails.Group;
+
+namespace wx {
+
+auto CustomerDetailsGroup::doThing (int x) -> int {
+    // TODO: implement
+}
+
+auto CustomerDetailsGroup::refreshEx (const db::Row *rec) -> void {
+    // Tweak values set by refreshFromCurrent() here.
+}
+
+} // namespace wx
@@ -0,0 +1,14 @@
+module;
+// Module implementation unit — add includes your implementation needs.
+#include "Core/Core.h"
+#include <wx/event.h>
+
+module Customer.Page;
+
+namespace wx {
+
+auto CustomerPage::refreshEx (const db::Row *rec) -> void {
+    // Tweak values set by refreshFromCurrent() here.
+}
+
+} // namespace wx
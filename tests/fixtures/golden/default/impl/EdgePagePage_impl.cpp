@@ -0,0 +1,14 @@
+module;
+// Module implementation unit — add includes your implementation needs.
+#include "Core/Core.h"
+#include <wx/event.h>
+
+module EdgePage.Page;
+
+namespace wx {
+
+auto EdgePagePage::refreshEx (const db::Row *rec) -> void {
+    // Tweak values set by refreshFromCurrent() here.
+}
+
+} // namespace wx
@@ -0,0 +1,63 @@
+module;
+//
+// Auto-generated from the tables:/relationships: sections of the scanned YAML files.
+
+// Make any changes there. This file will be overwritten.
+
+#include <array>
+#include <cstddef>
+#include <span>
+#include <string_view>
+
+export module App.Schema;
+
+export namespace db::schema {
+
+// Replaces db::TableLoader's start-up YAML -> DDL step. sha256 of the statements:
+// run them only when it differs from the digest stored in the database, then store it.
+constexpr std::string_view digest = "949f6696222a784e70681cccbf38abe0b7a1c9821147d04202012b0eebb97f58";
+
+// CREATE TABLE IF NOT EXISTS leaves an existing table as it is. So when the digest
+// differs: run statements[0, rebuild_at), which drop the views; rebuild every table
+// in `tables` whose sqlite_master.sql is not its definition; then run the rest.
+//
+//    PRAGMA foreign_keys = OFF;  BEGIN;
+//    CREATE TABLE "<name>__rebuild" (...);  -- the definition, under this name
+//    INSERT INTO "<name>__rebuild" (<kept>) SELECT <kept> FROM "<name>";
+//    DROP TABLE "<name>";  ALTER TABLE "<name>__rebuild" RENAME TO "<name>";
+//    PRAGMA foreign_key_check;  COMMIT;  PRAGMA foreign_keys = ON;
+//
+// <kept> is the columns the table has both before (PRAGMA table_info) and after; the
+// data of a dropped column is lost. A table no YAML file defines any more is left alone.
+constexpr std::size_t rebuild_at = 1;
+
+constexpr std::array<std::string_view, 6> statements {
+   R"sql(DROP VIEW IF EXISTS "customer_detail")sql",
+   R"sql(CREATE TABLE IF NOT EXISTS "kinds" ("id" INTEGER PRIMARY KEY AUTOINCREMENT, "name" TEXT NOT NULL UNIQUE))sql",
+   R"sql(CREATE TABLE IF NOT EXISTS "regions" ("code" VARCHAR(8) PRIMARY KEY, "title" TEXT))sql",
+   R"sql(CREATE TABLE IF NOT EXISTS "customer" ("id" INTEGER PRIMARY KEY, "name" TEXT NOT NULL DEFAULT 'O''Brien', "kind_id" INTEGER REFERENCES "kinds"("id"), "region" TEXT REFERENCES "regions"("code"), "balance" REAL DEFAULT 0.5, "active" INTEGER DEFAULT 1))sql",
+   R"sql(CREATE TABLE IF NOT EXISTS "customer_tag" ("customer_id" INTEGER, "tag" TEXT, PRIMARY KEY ("customer_id", "tag")))sql",
+   R"sql(CREATE VIEW "customer_detail" AS SELECT "customer".*, "r0"."name" AS "kind_id_name", "r1"."title" AS "region_title", "r1"."code" AS "region_code" FROM "customer" LEFT JOIN "kinds" "r0" ON "r0"."id" = "customer"."kind_id" LEFT JOIN "regions" "r1" ON "r1"."code" = "customer"."region")sql",
+};
+
+struct Table {
+   std::string_view name;
+   std::string_view definition;   // CREATE TABLE, as sqlite_master.sql records it
+   std::span<const std::string_view> columns;
+};
+
+namespace detail {
+inline constexpr std::array<std::string_view, 2> columns0 { "id", "name" };
+inline constexpr std::array<std::string_view, 2> columns1 { "code", "title" };
+inline constexpr std::array<std::string_view, 6> columns2 { "id", "name", "kind_id", "region", "balance", "active" };
+inline constexpr std::array<std::string_view, 2> columns3 { "customer_id", "tag" };
+} // namespace detail
+
+constexpr std::array<Table, 4> tables {{
+   { "kinds", R"sql(CREATE TABLE "kinds" ("id" INTEGER PRIMARY KEY AUTOINCREMENT, "name" TEXT NOT NULL UNIQUE))sql", detail::columns0 },
+   { "regions", R"sql(CREATE TABLE "regions" ("code" VARCHAR(8) PRIMARY KEY, "title" TEXT))sql", detail::columns1 },
+   { "customer", R"sql(CREATE TABLE "customer" ("id" INTEGER PRIMARY KEY, "name" TEXT NOT NULL DEFAULT 'O''Brien', "kind_id" INTEGER REFERENCES "kinds"("id"), "region" TEXT REFERENCES "regions"("code"), "balance" REAL DEFAULT 0.5, "active" INTEGER DEFAULT 1))sql", detail::columns2 },
+   { "customer_tag", R"sql(CREATE TABLE "customer_tag" ("customer_id" INTEGER, "tag" TEXT, PRIMARY KEY ("customer_id", "tag")))sql", detail::columns3 },
+}};
+
+} // namespace db::schema
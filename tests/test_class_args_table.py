@@ -0,0 +1,31 @@
+"""--class-args-table: class_args defaults in one shared table, never copied whole per construction."""
+
+from conftest import SPECS, generate, read_tree
+
+
+def test_group_reads_through_the_shared_table(tmp_path):
+    generate(SPECS, tmp_path / "out", "--class-args-table")
+    group = read_tree(tmp_path / "out" / "gen")["ui/CustomerDetailsGroup.ixx"]
+
+    assert ("   static auto custArgsDefault() -> const anymap & {\n"
+            "      static const anymap defaults = [] {\n"
+            "         anymap m;\n"
+            '         m.emplace("showNotes", std::any(true));\n') in group
+    # Only the defaults the caller left out are copied in; the table itself goes by reference.
+    assert ("   static auto custArgsMerged(anymap &a) -> anymap & {\n"
+            "      for (const auto &[key, value] : custArgsDefault())\n"
+            "         a.try_emplace(key, value);\n") in group
+    assert "anymap args = nullanymap," in group
+    assert ": Group (cflags, name, pParent, value, custArgsMerged(args), style) {" in group
+    assert "this->Interface::mergeWithCreationArgs(custArgsDefault());" in group
+    assert "anymap(custArgsDefault())" not in group
+    assert ".merge(" not in group
+
+
+def test_wizard_reads_through_the_shared_table(tmp_path):
+    generate(SPECS, tmp_path / "out", "--class-args-table")
+    wizard = read_tree(tmp_path / "out" / "gen")["ui/SetupWizard.ixx"]
+
+    assert "static auto wizArgsDefault() -> const anymap & {" in wizard
+    assert ("explicit SetupWizard(wxFrame *frame, std::string title, anymap args = nullanymap) "
+            ": Wizard(frame, title, wizArgsMerged(args)) {") in wizard
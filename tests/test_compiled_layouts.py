@@ -0,0 +1,40 @@
+"""--compiled-layouts: a class's own YAML layout as constexpr tables handed to loadLayout()."""
+
+from conftest import SPECS, generate, read_tree
+
+
+def test_tables_replace_the_layout_resource(tmp_path):
+    generate(SPECS, tmp_path / "out", "--compiled-layouts")
+    group = read_tree(tmp_path / "out" / "gen")["ui/CustomerDetailsGroup.ixx"]
+
+    assert "import LayoutTable;" in group
+    assert "constexpr layout::Item CustomerDetailsGroupLayoutItems[] = {" in group
+    assert '{ layout::ItemKind::Control, "name", -1, -1, -1, -1, -1, -1, -1 },' in group
+    assert 'constexpr layout::Table CustomerDetailsGroupLayout { "customer_details", ' \
+           'CustomerDetailsGroupLayoutItems, {}, {} };' in group
+    assert "this->loadLayout(CustomerDetailsGroupLayout)" in group
+    # Nothing is looked up or read at runtime any more.
+    assert "layoutPath" not in group
+    assert "resourceName(UIType::GeneratorSource" not in group
+
+
+def test_explicit_placement_is_kept(tmp_path):
+    generate(SPECS, tmp_path / "out", "--compiled-layouts")
+    edge = read_tree(tmp_path / "out" / "gen")["ui/EdgeGroupGroup.ixx"]
+    assert '{ layout::ItemKind::Label, "aLabel", -1, 0, 0, -1, -1, -1, -1 },' in edge
+    assert "this->loadLayout(EdgeGroupGroupLayout)" in edge
+
+
+def test_named_layout_still_loads_at_runtime(specs, tmp_path):
+    text = (specs / "customer.yaml").read_text(encoding="utf-8")
+    text = text.replace("  customer_details:\n", "  customer_details:\n    layout: Shared:CustomerForm\n", 1)
+    (specs / "customer.yaml").write_text(text, encoding="utf-8")
+
+    generate(specs, tmp_path / "out", "--compiled-layouts")
+    group = read_tree(tmp_path / "out" / "gen")["ui/CustomerDetailsGroup.ixx"]
+
+    assert "CustomerDetailsGroupLayout" not in group
+    assert "import LayoutTable;" not in group
+    assert 'resourceName(UIType::Shared, "CustomerForm", false, nullptr)' in group
+    assert "this->loadLayout(layoutPath, layoutKey)" in group
+
@@ -0,0 +1,64 @@
+"""Default-import pruning: a class imports the default modules its contents need."""
+
+import re
+
+import pytest
+
+from conftest import SPECS, generate, read_tree
+from yaml2code import CppGenerator
+
+KINDS = {"Group.ixx": "groups", "WizardPage.ixx": "wizardpages", "Page.ixx": "pages", "Book.ixx": "pages"}
+
+DEFAULTS = ("Ctrl", "Database", "DDT", "RecordSetInterface", "Interface", "Group", "WizardPage",
+            "StringUtil", "wxTypes", "wxUtil")
+
+
+def imports(module_text):
+    return {line[len("import "):-1] for line in module_text.splitlines() if line.startswith("import ")}
+
+
+def test_generated_only_class_is_pruned(specs, tmp_path):
+    generate(specs, tmp_path / "out")
+    wizard_page = imports(read_tree(tmp_path / "out" / "gen")["ui/EdgeWizWizardPage.ixx"])
+    assert {"Database", "StringUtil"}.isdisjoint(wizard_page)
+    assert "wxTypes" in wizard_page
+
+
+def test_user_code_keeps_what_it_names(specs, tmp_path):
+    # The verbatim block needs Database (db::) and StringUtil (whose names can't be told),
+    # neither of which the generated code names.
+    text = (specs / "edge.yaml").read_text(encoding="utf-8")
+    text = text.replace("      - section: W\n",
+                        "      - section: W\n"
+                        "        verbatim: { body: \"auto n = db::count(trim(name));\" }\n")
+    (specs / "edge.yaml").write_text(text, encoding="utf-8")
+
+    generate(specs, tmp_path / "out")
+    wizard_page = read_tree(tmp_path / "out" / "gen")["ui/EdgeWizWizardPage.ixx"]
+    assert "auto n = db::count(trim(name));" in wizard_page
+    assert {"Database", "StringUtil"} <= imports(wizard_page)
+    assert {"RecordSetInterface", "Interface", "wxUtil"}.isdisjoint(imports(wizard_page))
+
+
+@pytest.mark.parametrize("option", [(), ("--shared-lookups",), ("--class-args-table",), ("--handler-tables",)],
+                         ids=lambda option: " ".join(option) or "default")
+def test_every_default_module_the_output_names_is_imported(tmp_path, option):
+    generate(SPECS, tmp_path / "out", *option)
+    for path, text in read_tree(tmp_path / "out" / "gen").items():
+        kind = next((kind for suffix, kind in KINDS.items() if path.endswith(suffix)), None)
+        if kind is None or "\nexport namespace PageType {" not in text:
+            continue    # (a container:false book is a populate() function, not a class)
+        body = re.sub(r"(?m)^(?:\s*//.*|import .*;)$", "", text.split("\nexport module ", 1)[1])
+        named = {module for module, uses in CppGenerator.DEFAULT_IMPORT_USES.items()
+                 if uses is not None and uses.search(body)}
+        if "RecordSetPage" in imports(text):
+            named.discard("Page")   # RecordSetPage stands in for it
+        assert named & set(CppGenerator.DEFAULT_IMPORTS[kind]) <= imports(text), path
+
+
+def test_ordinary_classes_are_pruned(tmp_path):
+    generate(SPECS, tmp_path / "out")
+    tree = read_tree(tmp_path / "out" / "gen")
+    # Neither an impl unit nor user code keeps everything any more.
+    assert {"Database", "Interface", "wxUtil"}.isdisjoint(imports(tree["ui/CustomerPage.ixx"]))
+    assert {"Database", "Interface", "Validator", "wxUtil"}.isdisjoint(imports(tree["ui/EdgeGroupGroup.ixx"]))
@@ -0,0 +1,62 @@
+"""--fuse file|dir: the same classes, fewer modules."""
+
+import re
+
+import pytest
+
+from conftest import SPECS, generate, read_tree
+
+NAMESPACE_BLOCK = re.compile(r"(?ms)^namespace wx \{\n.*?^\} // namespace wx")
+
+
+def class_blocks(tree):
+    """Each class's 'namespace wx { ... }' block, keyed by the classes it exports. A fused
+       module names its DBSource structs after their class, so they can't collide."""
+    blocks = {}
+    for text in tree.values():
+        for block in NAMESPACE_BLOCK.findall(text):
+            block = re.sub(r"\b\w+_(\w+DBSource)\b", r"\1", block)
+            blocks[tuple(re.findall(r"^export class \w+ (\w+)", block, re.M))] = block
+    return blocks
+
+
+@pytest.fixture(scope="module")
+def per_class(tmp_path_factory):
+    out = tmp_path_factory.mktemp("per_class")
+    generate(SPECS, out)
+    return read_tree(out / "gen")
+
+
+@pytest.mark.parametrize("mode, modules", [
+    ("file", {"ui/Specs.Customer.UI.ixx", "ui/Specs.Edge.UI.ixx", "ui/Specs.Sub.Wiz.UI.ixx", "ui/MainBook.ixx"}),
+    ("dir", {"ui/Specs.UI.ixx", "ui/Specs.Sub.UI.ixx", "ui/MainBook.ixx"}),
+])
+def test_fused_modules_hold_the_same_classes(tmp_path, per_class, mode, modules):
+    generate(SPECS, tmp_path / "out", "--fuse", mode)
+    fused = read_tree(tmp_path / "out" / "gen")
+    assert set(fused) == modules
+    assert class_blocks(fused) == class_blocks(per_class)
+
+    per_class_modules = {m for text in per_class.values() for m in re.findall(r"^export module (\S+);", text, re.M)}
+    for path, text in fused.items():
+        assert text.count("module;\n") == 1 and len(re.findall(r"^export module ", text, re.M)) == 1, path
+        own = re.search(r"^export module (\S+);", text, re.M).group(1)
+        imports = set(re.findall(r"^import (\S+);", text, re.M))
+        # Imports of classes now fused are rewritten to their unit, never to the module itself.
+        assert own not in imports, path
+        assert not imports & (per_class_modules - {own}), path
+        structs = re.findall(r"^struct (\w+) \{", text, re.M)
+        assert len(structs) == len(set(structs)), path
+
+
+def test_impl_units_name_the_fused_module(tmp_path):
+    generate(SPECS, tmp_path / "out", "--fuse", "file")
+    impl = read_tree(tmp_path / "out" / "impl")
+    assert "module Specs.Customer.UI;" in impl["CustomerPage_impl.cpp"]
+    assert "module Specs.Edge.UI;" in impl["EdgePagePage_impl.cpp"]
+
+
+def test_unfusing_restores_per_class_modules(tmp_path, per_class):
+    generate(SPECS, tmp_path / "out", "--fuse", "dir")
+    generate(SPECS, tmp_path / "out")
+    assert read_tree(tmp_path / "out" / "gen") == per_class
@@ -0,0 +1,29 @@
+"""
+Default-options output of the fixture specs, byte for byte.
+
+tests/fixtures/golden/default was generated from tests/fixtures/specs, which exercise
+nested groups, verbatim blocks, conditional flags, handlers, shared alt_data_source
+tables, class_args, wizard 'if:' pages and both book flavours. A change to what the
+generator emits by default shows up here as a diff; if it is intended, regenerate with
+
+    YAML2CODE_UPDATE_GOLDEN=1 python -m pytest tests/test_golden.py
+
+and review the golden diff along with the change.
+"""
+
+import os
+import shutil
+
+from conftest import FIXTURES, SPECS, generate, read_tree
+
+GOLDEN = FIXTURES / "golden" / "default"
+
+
+def test_default_output_matches_golden(tmp_path):
+    generate(SPECS, tmp_path / "out")
+    if os.environ.get("YAML2CODE_UPDATE_GOLDEN"):
+        shutil.rmtree(GOLDEN, ignore_errors=True)
+        for path, text in read_tree(tmp_path / "out").items():
+            (GOLDEN / path).parent.mkdir(parents=True, exist_ok=True)
+            (GOLDEN / path).write_text(text, encoding="utf-8")
+    assert read_tree(tmp_path / "out") == read_tree(GOLDEN)
@@ -0,0 +1,29 @@
+"""--handler-tables: a class's control handlers as member functions bound from one table."""
+
+from conftest import generate, read_tree
+
+BODY = '''\
+                  handler: |
+                    if (event.IsChecked()) {
+                        apply(R"(line one
+                      line two)");
+                    }
+'''
+
+
+def test_handler_body_keeps_its_indentation(specs, tmp_path):
+    text = (specs / "customer.yaml").read_text(encoding="utf-8")
+    text = text.replace('                  handler: "event.Skip();"\n', BODY, 1)
+    (specs / "customer.yaml").write_text(text, encoding="utf-8")
+
+    generate(specs, tmp_path / "out", "--handler-tables")
+    group = read_tree(tmp_path / "out" / "gen")["ui/CustomerDetailsGroup.ixx"]
+
+    assert "   auto handler0(wxEvent &event) -> void {\n" \
+           "      if (event.IsChecked()) {\n" \
+           "          apply(R\"(line one\n" \
+           "        line two)\");\n" \
+           "      }\n" \
+           "   }\n" in group
+    assert "{ wxEVT_TEXT, &CustomerDetailsGroup::handler0 },  // m_name" in group
+    assert "bindHandlers(" in group
@@ -0,0 +1,39 @@
+"""Per-section label tables: evaluated on every construction, not frozen on the first."""
+
+import re
+
+from conftest import SPECS, generate, read_tree
+
+
+def test_label_table_is_not_static(tmp_path):
+    generate(SPECS, tmp_path / "out")
+    group = read_tree(tmp_path / "out" / "gen")["ui/CustomerDetailsGroup.ixx"]
+    tables = re.findall(r"^\s*(.*)\bsection\d+Labels\[\] = \{", group, re.M)
+    assert tables, "fixture no longer produces a label table"
+    for declaration in tables:
+        assert "static" not in declaration
+    # The label's size is a member expression, so it has to be read per construction.
+    assert '{ "kindLabel", "Kind:", sizeLabel,' in group
+
+
+def test_control_without_a_member_keeps_its_chain(specs, tmp_path):
+    # The loop registers labels on the control's member; one without 'variable:' has none
+    # (the loop used to be emitted against an empty name: `   ->createLabel(label.tag, ...)`).
+    text = (specs / "customer.yaml").read_text(encoding="utf-8")
+    (specs / "customer.yaml").write_text(text.replace("              variable: m_kind2\n", ""), encoding="utf-8")
+
+    generate(specs, tmp_path / "out")
+    group = read_tree(tmp_path / "out" / "gen")["ui/CustomerDetailsGroup.ixx"]
+    assert "label.tag" not in group
+    assert group.count('createLabel(UICreateFlags::Label, "kindLabel", "Kind:",') == 2
+    # m_kind is then the section's only member, which is not worth a table.
+    assert "section1Labels" not in group
+
+
+def test_table_only_counts_controls_that_use_it(specs, tmp_path):
+    text = (specs / "customer.yaml").read_text(encoding="utf-8")
+    (specs / "customer.yaml").write_text(text.replace("              variable: m_name\n", ""), encoding="utf-8")
+    generate(specs, tmp_path / "out")
+    group = read_tree(tmp_path / "out" / "gen")["ui/CustomerDetailsGroup.ixx"]
+    assert "section0Labels" not in group
+    assert "for (const auto &label : section1Labels)" in group
@@ -0,0 +1,29 @@
+"""'lazy: true' book children: the factory lambda the placeholder holds."""
+
+from conftest import generate, read_tree
+
+
+def make_lazy(specs):
+    text = (specs / "sub" / "wiz.yaml").read_text(encoding="utf-8")
+    text = text.replace("        name: customer\n", "        name: customer\n        lazy: true\n")
+    text = text.replace("        name: inner\n        type: CustomerPage",
+                        "        name: inner\n        type: CustomerPage\n        lazy: true\n"
+                        "        args: { arg_name: innerArgs, insert: [ title, std::string, \"x\" ] }\n"
+                        "      - class: CustomerPage\n        module: Customer.Page\n        name: plain\n"
+                        "        type: CustomerPage\n        lazy: true")
+    (specs / "sub" / "wiz.yaml").write_text(text, encoding="utf-8")
+
+
+def test_container_factories_capture_this_and_copy_args(specs, tmp_path):
+    make_lazy(specs)
+    generate(specs, tmp_path / "out")
+    nested = read_tree(tmp_path / "out" / "gen")["ui/NestedBook.ixx"]
+    assert "[this, args](Book *book, wxWindowIDRef id) mutable -> Page * {" in nested
+    assert "[this](Book *book, wxWindowIDRef id) mutable -> Page * {" in nested
+
+
+def test_populate_factory_captures_nothing(specs, tmp_path):
+    make_lazy(specs)
+    generate(specs, tmp_path / "out")
+    main = read_tree(tmp_path / "out" / "gen")["ui/MainBook.ixx"]
+    assert "[](Book *book, wxWindowIDRef id) mutable -> Page * {" in main
@@ -0,0 +1,95 @@
+"""The generation manifest and the client stamp: a skipped file must still be current."""
+
+import json
+import os
+import shutil
+import subprocess
+import sys
+
+import pytest
+
+from conftest import REPO, SPECS, generate, read_tree
+
+OPTIONS = [
+    ("--param-keys",), ("--handler-tables",), ("--class-args-table",), ("--shared-lookups",),
+    ("--compiled-layouts",), ("--sizer-info",), ("--fuse", "file"), ("--prelude", "App.Prelude"),
+    ("--schema", "App.Schema"), ("--first-pagetype", "2000"), ("--export-var", "OTHER_EXPORT"),
+]
+
+
+def reported(result):
+    """The outputs a run reports writing or checking; a file the manifest skips reports nothing."""
+    return [line for line in result.stdout.splitlines() if " OK (" in line]
+
+
+def test_unchanged_rerun_skips_everything(tmp_path):
+    generate(SPECS, tmp_path / "out")
+    assert reported(generate(SPECS, tmp_path / "out")) == []
+
+
+@pytest.mark.parametrize("option", OPTIONS, ids=lambda o: o[0])
+def test_option_change_regenerates(tmp_path, option):
+    generate(SPECS, tmp_path / "out")
+    assert reported(generate(SPECS, tmp_path / "out", *option))
+    generate(SPECS, tmp_path / "fresh", *option)
+    assert read_tree(tmp_path / "out") == read_tree(tmp_path / "fresh")
+
+
+def test_registry_is_part_of_the_key(tmp_path):
+    generate(SPECS, tmp_path / "out")
+    registry = tmp_path / "pagetypes.json"
+    registry.write_text(json.dumps({"first_pagetype": 5000, "page_types": {}}), encoding="utf-8")
+    assert reported(generate(SPECS, tmp_path / "out", "--pagetype-registry", registry))
+    manifest = json.loads((tmp_path / "out" / "gen" / ".yaml2code.manifest.json").read_text(encoding="utf-8"))
+    assert manifest["options"]["pagetype_registry"] == str(registry)
+    assert "const Type CustomerPage(5001)" in read_tree(tmp_path / "out" / "gen")["ui/CustomerPage.ixx"]
+
+
+def test_registry_edit_regenerates_the_classes_it_renumbers(tmp_path):
+    registry = tmp_path / "pagetypes.json"
+    generate(SPECS, tmp_path / "out", "--pagetype-registry", registry)
+    ids = json.loads(registry.read_text(encoding="utf-8"))
+    ids["page_types"]["CustomerPage"] = 1900
+    registry.write_text(json.dumps(ids), encoding="utf-8")
+    generate(SPECS, tmp_path / "out", "--pagetype-registry", registry)
+    assert "const Type CustomerPage(1900)" in read_tree(tmp_path / "out" / "gen")["ui/CustomerPage.ixx"]
+
+
+def test_generator_change_regenerates(tmp_path):
+    generator = tmp_path / "tool" / "yaml2code.py"
+    generator.parent.mkdir()
+    shutil.copy(REPO / "yaml2code.py", generator)
+    argv = ["--quiet", "--no-parse-cache", "--scan", SPECS, "--output", tmp_path / "gen", "--impl-dir",
+            tmp_path / "impl", "--app-target", "App"]
+
+    def run():
+        result = subprocess.run([sys.executable, str(generator), *map(str, argv)], capture_output=True, text=True)
+        assert result.returncode == 0, result.stderr
+        return result
+
+    run()
+    assert reported(run()) == []
+    with open(generator, "a", encoding="utf-8") as fh:
+        fh.write("\n# edited\n")
+    modules = [path for path in read_tree(tmp_path / "gen") if path.endswith(".ixx")]
+    assert len(reported(run())) == len(modules)
+
+
+def test_stamp_sees_registry_content_not_just_stat(tmp_path):
+    registry = tmp_path / "pagetypes.json"
+    stamp = tmp_path / "out" / ".yaml2code.stamp"
+    argv = [sys.executable, str(REPO / "yaml2code_client.py"), "--stamp", str(stamp), "--quiet", "--reproducible",
+            "--no-parse-cache", "--pagetype-registry", str(registry), "--scan", str(SPECS), "--output",
+            str(tmp_path / "out"), "--impl-dir", str(tmp_path / "impl"), "--app-target", "App"]
+    assert subprocess.run(argv, capture_output=True).returncode == 0
+    assert reported(subprocess.run(argv, capture_output=True, text=True)) == []   # stamp current
+
+    # Same size, same mtime, different IDs: only the content tells.
+    text = registry.read_text(encoding="utf-8")
+    st = registry.stat()
+    registry.write_text(text.replace("1001", "1901"), encoding="utf-8")
+    os.utime(registry, ns=(st.st_atime_ns, st.st_mtime_ns))
+    assert registry.stat().st_size == st.st_size
+    result = subprocess.run(argv, capture_output=True, text=True)
+    assert result.returncode == 0
+    assert "const Type CustomerPage(1901)" in read_tree(tmp_path / "out")["ui/CustomerPage.ixx"]
@@ -0,0 +1,40 @@
+"""
+Opt-in options leave default output alone.
+
+Every output-shaping option is off by default, and each was added with the promise that
+without it the generator emits exactly what it did before. The golden tree pins that
+default output; these tests hold every option to it -- a fresh default run, and a default
+run into a directory last generated with the option, must both reproduce it byte for byte
+(nothing the option wrote may linger).
+"""
+
+import pytest
+
+from conftest import SPECS, generate, read_tree
+from test_golden import GOLDEN
+
+OPT_IN = [
+    ("--handler-tables",), ("--class-args-table",), ("--param-keys",), ("--shared-lookups",),
+    ("--compiled-layouts",), ("--sizer-info",), ("--fuse", "file"), ("--fuse", "dir"),
+    ("--prelude", "App.Prelude"), ("--schema", "App.Schema"),
+]
+
+
+def test_default_run_matches_golden(tmp_path):
+    generate(SPECS, tmp_path / "out")
+    assert read_tree(tmp_path / "out") == read_tree(GOLDEN)
+
+
+@pytest.mark.parametrize("option", OPT_IN, ids=" ".join)
+def test_dropping_an_option_restores_golden(tmp_path, option):
+    generate(SPECS, tmp_path / "out", *option)
+    assert read_tree(tmp_path / "out") != read_tree(GOLDEN)
+    generate(SPECS, tmp_path / "out")
+    assert read_tree(tmp_path / "out") == read_tree(GOLDEN)
+
+
+def test_renamed_module_replaces_the_old_one(tmp_path):
+    generate(SPECS, tmp_path / "out", "--prelude", "App.Prelude", "--schema", "App.Schema")
+    generate(SPECS, tmp_path / "out", "--prelude", "App.Base", "--schema", "App.Db")
+    gen = tmp_path / "out" / "gen"
+    assert sorted(p.name for p in gen.glob("App.*.ixx")) == ["App.Base.ixx", "App.Db.ixx"]
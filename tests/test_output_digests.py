@@ -0,0 +1,59 @@
+"""Sidecar output digests: an output is only left alone when it is known to be current."""
+
+import os
+import pathlib
+
+import pytest
+
+from conftest import generate, read_tree
+
+import yaml2code
+
+
+@pytest.fixture
+def digests(tmp_path):
+    return yaml2code.OutputDigests(tmp_path / yaml2code.OutputDigests.FILE_NAME, {})
+
+
+def test_unchanged_output_is_not_read_or_touched(tmp_path, digests, monkeypatch):
+    out = tmp_path / "A.ixx"
+    assert yaml2code._commit_output(out, "one\n", digests) == "created"
+    mtime = out.stat().st_mtime_ns
+
+    def no_reads(*_args, **_kwargs):
+        raise AssertionError("the output was read back")
+    monkeypatch.setattr(pathlib.Path, "read_text", no_reads)
+    assert yaml2code._commit_output(out, "one\n", digests) == "unchanged"
+    assert out.stat().st_mtime_ns == mtime
+    assert yaml2code._commit_output(out, "two\n", digests) == "updated"
+
+
+def test_edited_or_deleted_output_is_rewritten(tmp_path, digests):
+    out = tmp_path / "A.ixx"
+    yaml2code._commit_output(out, "one\n", digests)
+    out.write_text("hand edit\n", encoding="utf-8")
+    assert yaml2code._commit_output(out, "one\n", digests) == "updated"
+    assert out.read_text(encoding="utf-8") == "one\n"
+    out.unlink()
+    assert yaml2code._commit_output(out, "one\n", digests) == "created"
+
+
+def test_without_a_record_the_output_is_compared(tmp_path, digests):
+    out = tmp_path / "A.ixx"
+    out.write_text("one\n", encoding="utf-8")
+    os.utime(out, ns=(0, 0))
+    assert yaml2code._commit_output(out, "one\n", digests) == "unchanged"
+    assert out.stat().st_mtime_ns == 0          # same content: kept, timestamp and all
+    assert yaml2code._commit_output(out, "two\n", digests) == "updated"
+
+
+def test_regeneration_repairs_a_hand_edited_module(specs, tmp_path):
+    generate(specs, tmp_path / "out")
+    module = tmp_path / "out" / "gen" / "ui" / "CustomerPage.ixx"
+    module.write_text(module.read_text(encoding="utf-8").replace("TraceCall();", "TraceCall(); hack();"), encoding="utf-8")
+    with open(specs / "customer.yaml", "a", encoding="utf-8") as fh:
+        fh.write("# touched\n")                 # new digest: the file is regenerated
+    generate(specs, tmp_path / "out")
+    generate(specs, tmp_path / "fresh")
+    assert "hack();" not in module.read_text(encoding="utf-8")
+    assert read_tree(tmp_path / "out") == read_tree(tmp_path / "fresh")
@@ -0,0 +1,45 @@
+"""--pagetype-registry: a class keeps its PageType ID whatever else comes and goes."""
+
+import json
+import re
+
+from conftest import SPECS, generate, read_tree
+
+
+def page_types(out):
+    return {m.group(1): int(m.group(2)) for text in read_tree(out / "gen").values()
+            for m in re.finditer(r"const Type (\w+)\((\d+)\)", text)}
+
+
+def test_ids_survive_add_and_remove(specs, tmp_path):
+    registry = tmp_path / "pagetypes.json"
+    generate(specs, tmp_path / "out", "--pagetype-registry", registry)
+    before = page_types(tmp_path / "out")
+    assert before
+
+    # A new file that scans first, and the removal of one that scanned early.
+    (specs / "aaa.yaml").write_text("pages:\n  early:\n    elements: []\n", encoding="utf-8")
+    (specs / "edge.yaml").unlink()
+    generate(specs, tmp_path / "out", "--pagetype-registry", registry)
+    after = page_types(tmp_path / "out")
+
+    survivors = {name: before[name] for name in after if name in before}
+    assert survivors and all(after[name] == id_ for name, id_ in survivors.items())
+    assert after["EarlyPage"] == max(before.values()) + 1
+
+    # The removed classes' IDs stay reserved: bringing one back restores it, and a
+    # later newcomer doesn't reuse it.
+    recorded = json.loads(registry.read_text(encoding="utf-8"))["page_types"]
+    assert all(recorded[name] == id_ for name, id_ in before.items())
+    (specs / "zzz.yaml").write_text("pages:\n  late:\n    elements: []\n", encoding="utf-8")
+    (specs / "edge.yaml").write_text((SPECS / "edge.yaml").read_text(encoding="utf-8"), encoding="utf-8")
+    generate(specs, tmp_path / "out", "--pagetype-registry", registry)
+    restored = page_types(tmp_path / "out")
+    assert restored["LatePage"] == max(before.values()) + 2
+    assert restored["EdgePagePage"] == before["EdgePagePage"]
+
+
+def test_empty_registry_reproduces_scan_order(specs, tmp_path):
+    generate(specs, tmp_path / "plain")
+    generate(specs, tmp_path / "registry", "--pagetype-registry", tmp_path / "pagetypes.json")
+    assert read_tree(tmp_path / "registry" / "gen") == read_tree(tmp_path / "plain" / "gen")
@@ -0,0 +1,32 @@
+"""--param-keys: the ParamKey handles generated param() reads name."""
+
+import re
+
+from conftest import SPECS, generate, read_tree
+
+
+def test_handles_cannot_collide_with_class_members(specs, tmp_path):
+    # 'layout' used to become 'layoutKey', colliding with the generated layoutKey member;
+    # '2nd' used to become the invalid identifier '2ndKey'.
+    text = (specs / "customer.yaml").read_text(encoding="utf-8")
+    text = text.replace("showNotes", "layout").replace("kindCount, kindArgs, count", "kindCount, kindArgs, 2nd")
+    (specs / "customer.yaml").write_text(text, encoding="utf-8")
+
+    generate(specs, tmp_path / "out", "--param-keys")
+    group = read_tree(tmp_path / "out" / "gen")["ui/CustomerDetailsGroup.ixx"]
+
+    assert "   std::string layoutKey;" in group
+    assert 'static constexpr ParamKey k_layout{"layout"};' in group
+    assert 'static constexpr ParamKey k_2nd{"2nd"};' in group
+    assert "param(args, ParamKeys::k_layout, false)" in group
+    assert "param(kindArgs, ParamKeys::k_2nd, 0)" in group
+    for handle in re.findall(r"static constexpr ParamKey (\w+)\{", group):
+        assert re.fullmatch(r"[A-Za-z_]\w*", handle)
+
+
+def test_wizard_conditions_use_handles(tmp_path):
+    generate(SPECS, tmp_path / "out", "--param-keys")
+    wizard = read_tree(tmp_path / "out" / "gen")["ui/SetupWizard.ixx"]
+    assert 'static constexpr ParamKey k_firstRun{"firstRun"};' in wizard
+    assert "param<bool>(args, ParamKeys::k_firstRun, false)" in wizard
+    assert 'param<bool>(args, "firstRun"' not in wizard
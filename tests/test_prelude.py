@@ -0,0 +1,38 @@
+"""--prelude: one module for the headers generated modules share, exporting what they use."""
+
+import re
+
+from conftest import SPECS, generate, read_tree
+from test_golden import GOLDEN
+
+MOVED = re.compile(r'#include "(?:Core/CoreData|Core/Util|Gfx/Sizes)\.h"\n')
+
+
+def exports(prelude):
+    return re.findall(r"^export using ::(\w+);$", prelude, re.M)
+
+
+def test_prelude_exports_the_names_generated_code_uses(tmp_path):
+    generate(SPECS, tmp_path / "out", "--prelude", "App.Prelude")
+    tree = read_tree(tmp_path / "out" / "gen")
+    prelude = tree.pop("App.Prelude.ixx")
+
+    assert '#include "Core/CoreData.h"\n#include "Core/Util.h"\n#include "Gfx/Sizes.h"\n' in prelude
+    assert "namespace std" not in prelude
+    assert exports(prelude) == ["anymap", "nullanymap", "add_to_anymap", "Util", "UIType",
+                                "sizeCtrlComboLike", "sizeLabel", "sizeLabelSmall"]
+    # Everything else -- the macro-supplying headers, <unordered_set> -- stays where it was.
+    golden = read_tree(GOLDEN / "gen")
+    for path, module in tree.items():
+        fragment, body = module.split("\nexport module ", 1)
+        default_fragment = golden[path].split("\nexport module ", 1)[0]
+        assert re.sub(r"\n\n+", "\n\n", MOVED.sub("", default_fragment)) == fragment, path
+        assert "\nimport App.Prelude;\n" in body, path
+
+
+def test_exports_follow_what_the_emitters_write(tmp_path):
+    # Compiled layouts no longer look the layout resource up, so nothing names UIType.
+    generate(SPECS, tmp_path / "out", "--prelude", "App.Prelude", "--compiled-layouts")
+    tree = read_tree(tmp_path / "out" / "gen")
+    assert not any("UIType" in text for text in tree.values())
+    assert "Util" in exports(tree["App.Prelude.ixx"])
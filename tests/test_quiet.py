@@ -0,0 +1,17 @@
+"""-q/--quiet: run banners are informational, per-file results are not."""
+
+from conftest import SPECS, generate, run_generator
+
+
+def test_quiet_drops_run_banners(tmp_path):
+    out = generate(SPECS, tmp_path / "out").stdout
+    assert "Processing classes" not in out
+    assert "YAML loader" not in out
+    assert "ui/SetupWizard.ixx : Wizard OK (created)" in out
+
+
+def test_banners_without_quiet(tmp_path):
+    out = run_generator("--no-parse-cache", "--scan", SPECS, "--output", tmp_path / "gen",
+                        "--impl-dir", tmp_path / "impl", "--app-target", "App").stdout
+    assert "Processing classes in 4 YAML files from one directory..." in out
+    assert "YAML loader: " in out
@@ -0,0 +1,105 @@
+"""--schema: table specs -> the DDL and digest db::TableLoader runs instead of its own."""
+
+import hashlib
+import re
+import shutil
+import sqlite3
+
+from conftest import FIXTURES, generate, read_tree
+
+SCHEMA = FIXTURES / "schema"
+
+
+def compiled(tmp_path, specs=SCHEMA / "specs"):
+    generate(specs, tmp_path / "out", "--schema", "App.Schema")
+    return read_tree(tmp_path / "out" / "gen")["App.Schema.ixx"]
+
+
+def statements(module):
+    return re.findall(r'^   R"sql\((.*)\)sql",$', module, re.M)
+
+
+def tables(module):
+    """name -> (definition, columns), as exported in db::schema::tables."""
+    columns = {index: re.findall(r'"([^"]*)"', names) for index, names in
+               re.findall(r"^inline constexpr std::array<std::string_view, \d+> columns(\d+) \{ (.*) \};$", module, re.M)}
+    return {name: (definition, columns[index]) for name, definition, index in
+            re.findall(r'^   \{ "(\w+)", R"sql\((.*)\)sql", detail::columns(\d+) \},$', module, re.M)}
+
+
+def apply(db, module):
+    """What the module asks of TableLoader once the digest differs."""
+    run, rebuild_at = statements(module), int(re.search(r"rebuild_at = (\d+);", module).group(1))
+    for statement in run[:rebuild_at]:
+        db.execute(statement)
+    for name, (definition, columns) in tables(module).items():
+        recorded = db.execute("SELECT sql FROM sqlite_master WHERE type = 'table' AND name = ?", (name,)).fetchone()
+        if recorded is None or recorded[0] == definition:
+            continue
+        had = {row[1] for row in db.execute(f'PRAGMA table_info("{name}")')}
+        kept = ", ".join(f'"{c}"' for c in columns if c in had)
+        db.execute("PRAGMA foreign_keys = OFF")
+        with db:
+            db.execute(definition.replace(f'CREATE TABLE "{name}"', f'CREATE TABLE "{name}__rebuild"', 1))
+            db.execute(f'INSERT INTO "{name}__rebuild" ({kept}) SELECT {kept} FROM "{name}"')
+            db.execute(f'DROP TABLE "{name}"')
+            db.execute(f'ALTER TABLE "{name}__rebuild" RENAME TO "{name}"')
+        db.execute("PRAGMA foreign_keys = ON")
+    for statement in run[rebuild_at:]:
+        db.execute(statement)
+
+
+def test_matches_golden(tmp_path):
+    assert compiled(tmp_path) == (SCHEMA / "expected" / "App.Schema.ixx").read_text(encoding="utf-8")
+
+
+def test_digest_covers_the_statements(tmp_path):
+    module = compiled(tmp_path)
+    digest = re.search(r'digest = "([0-9a-f]{64})"', module).group(1)
+    assert digest == hashlib.sha256("\n".join(statements(module)).encode("utf-8")).hexdigest()
+
+
+def test_statements_run_on_sqlite(tmp_path):
+    db = sqlite3.connect(":memory:")
+    for _ in range(2):      # CREATE ... IF NOT EXISTS / DROP VIEW IF EXISTS: safe to re-run
+        for statement in statements(compiled(tmp_path)):
+            db.execute(statement)
+    db.execute("INSERT INTO kinds (name) VALUES ('retail')")
+    db.execute("INSERT INTO regions VALUES ('N', 'North')")
+    db.execute("INSERT INTO customer (id, kind_id, region) VALUES (1, 1, 'N')")
+    row = db.execute("SELECT name, kind_id_name, region_title, region_code, balance, active "
+                     "FROM customer_detail").fetchone()
+    assert row == ("O'Brien", "retail", "North", "N", 0.5, 1)
+
+
+def test_definitions_are_what_sqlite_records(tmp_path):
+    db = sqlite3.connect(":memory:")
+    module = compiled(tmp_path)
+    for statement in statements(module):
+        db.execute(statement)
+    for name, (definition, columns) in tables(module).items():
+        assert db.execute("SELECT sql FROM sqlite_master WHERE name = ?", (name,)).fetchone() == (definition,)
+        assert [row[1] for row in db.execute(f'PRAGMA table_info("{name}")')] == columns
+
+
+def test_changed_table_is_rebuilt_keeping_its_rows(tmp_path):
+    specs = tmp_path / "specs"
+    shutil.copytree(SCHEMA / "specs", specs)
+    db = sqlite3.connect(":memory:")
+    apply(db, compiled(tmp_path / "before", specs))
+    db.execute("INSERT INTO kinds (name) VALUES ('retail')")
+    db.execute("INSERT INTO customer (id, name, kind_id, balance, active) VALUES (1, 'Ann', 1, 2.5, 0)")
+
+    path = specs / "sales" / "customer.yaml"
+    text = path.read_text(encoding="utf-8")
+    text = text.replace("      active: { type: hs_bool, default: true }\n", "      note: { type: string, default: \"-\" }\n")
+    path.write_text(text.replace("balance: { type: double, default: 0.5 }", "balance: { type: double, not_null: true }"),
+                    encoding="utf-8")
+    module = compiled(tmp_path / "after", specs)
+    apply(db, module)
+
+    recorded = db.execute("SELECT sql FROM sqlite_master WHERE name = 'customer'").fetchone()[0]
+    assert recorded == tables(module)["customer"][0]
+    assert db.execute("SELECT id, name, balance, note, kind_id_name FROM customer_detail").fetchall() == \
+        [(1, "Ann", 2.5, "-", "retail")]
+    assert db.execute("PRAGMA foreign_key_check").fetchall() == []
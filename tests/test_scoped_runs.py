@@ -0,0 +1,130 @@
+"""--only / --shared-only: a build rule's share of the batch, and nothing outside it."""
+
+import subprocess
+import sys
+
+from conftest import GENERATOR, REPO, generate, read_tree
+
+TABLES = "tables:\n  notes:\n    id: { type: integer, primary_key: true }\n    text: string\n"
+SHARED = ("--schema", "App.Schema", "--prelude", "App.Prelude")
+
+
+def scoped(specs, out, *options):
+    """Like generate(), but returns the result whatever the exit status."""
+    argv = ["--quiet", "--reproducible", "--no-parse-cache", "--scan", specs, "--output", out / "gen",
+            "--impl-dir", out / "impl", "--app-target", "App", "--export-var", "GFX_EXPORT",
+            "--depfile", out / "gen.d", *options]
+    return subprocess.run([sys.executable, str(GENERATOR), *map(str, argv)], capture_output=True, text=True)
+
+
+def stats(root):
+    return {p.relative_to(root).as_posix(): p.stat().st_mtime_ns for p in root.rglob("*.ixx")}
+
+
+def edit(specs, name, old, new):
+    path = specs / name
+    text = path.read_text(encoding="utf-8")
+    assert old in text
+    path.write_text(text.replace(old, new, 1), encoding="utf-8")
+
+
+def test_only_writes_nothing_but_its_own_modules(specs, tmp_path):
+    (specs / "customer.yaml").write_text((specs / "customer.yaml").read_text(encoding="utf-8") + TABLES,
+                                         encoding="utf-8")
+    out = tmp_path / "out"
+    assert scoped(specs, out, *SHARED).returncode == 0
+    before, tree = stats(out / "gen"), read_tree(out / "gen")
+
+    edit(specs, "customer.yaml", '"Name:"', '"Full name:"')
+    edit(specs, "customer.yaml", "text: string", "text: integer")
+    edit(specs, "edge.yaml", "int sectionLocal = 1;", "int sectionLocal = 2;")
+    result = scoped(specs, out, *SHARED, "--only", specs / "customer.yaml")
+    assert result.returncode == 0, result.stderr
+
+    after = stats(out / "gen")
+    changed = sorted(path for path in after if after[path] != before[path])
+    assert changed == ["ui/CustomerDetailsGroup.ixx", "ui/CustomerPage.ixx"]   # both name the YAML's hash
+    assert read_tree(out / "gen")["App.Schema.ixx"] == tree["App.Schema.ixx"]
+
+    # The shared rule then picks up the table edit; nothing per-file is touched.
+    result = scoped(specs, out, *SHARED, "--shared-only")
+    assert result.returncode == 0, result.stderr
+    final = stats(out / "gen")
+    assert sorted(path for path in final if final[path] != after[path]) == ["App.Schema.ixx"]
+    assert '"text" INTEGER' in read_tree(out / "gen")["App.Schema.ixx"]
+
+
+def test_depfile_lists_shared_modules_apart(specs, tmp_path):
+    out = tmp_path / "out"
+    assert scoped(specs, out, *SHARED).returncode == 0
+    lines = (out / "gen.d").read_text(encoding="utf-8").splitlines()
+    marker = lines.index("# shared: written by --shared-only")
+    assert marker == len(lines) - 2
+    shared, prerequisites = lines[-1].split(": ")
+    assert sorted(p.rsplit("/", 1)[1] for p in shared.split(" ")) == ["App.Prelude.ixx", "App.Schema.ixx"]
+    assert len(prerequisites.split(" ")) == len(list(specs.rglob("*.yaml")))
+    assert not any("App." in line for line in lines[:marker])
+
+
+def test_module_set_change_fails_and_rewrites_depfile(specs, tmp_path):
+    # With a registry, so no other file is renumbered.
+    out, registry = tmp_path / "out", ("--pagetype-registry", tmp_path / "pagetypes.json")
+    assert scoped(specs, out, *registry).returncode == 0
+    edit(specs, "customer.yaml", "pages:\n", "  extra_details:\n    elements: []\npages:\n")
+
+    result = scoped(specs, out, *registry, "--only", specs / "customer.yaml")
+    assert result.returncode == 1
+    assert "its set of generated modules changed; CMake has to re-run" in result.stderr
+    assert "ExtraDetailsGroup.ixx" in (out / "gen.d").read_text(encoding="utf-8")
+
+
+def test_renumbering_other_files_fails_and_touches_depfile(specs, tmp_path):
+    # Scan-order numbering and fused modules: a class added to the first file moves every
+    # later file's IDs, without changing which modules exist.
+    out = tmp_path / "out"
+    assert scoped(specs, out, "--fuse", "file").returncode == 0
+    depfile_before = (out / "gen.d").stat().st_mtime_ns
+    edit(specs, "customer.yaml", "pages:\n  customer:\n", "pages:\n  other:\n    elements: []\n  customer:\n")
+
+    result = scoped(specs, out, "--fuse", "file", "--only", specs / "customer.yaml")
+    assert result.returncode == 1
+    assert "the PageType IDs of 2 other file(s) moved" in result.stderr
+    assert (out / "gen.d").stat().st_mtime_ns > depfile_before
+
+
+def test_registry_keeps_other_files_and_is_left_to_full_runs(specs, tmp_path):
+    out, registry = tmp_path / "out", tmp_path / "pagetypes.json"
+    assert scoped(specs, out, "--fuse", "file", "--pagetype-registry", registry).returncode == 0
+    recorded = registry.read_text(encoding="utf-8")
+    edit(specs, "customer.yaml", "pages:\n  customer:\n", "pages:\n  other:\n    elements: []\n  customer:\n")
+
+    result = scoped(specs, out, "--fuse", "file", "--pagetype-registry", registry, "--only", specs / "customer.yaml")
+    assert result.returncode == 0, result.stderr
+    assert registry.read_text(encoding="utf-8") == recorded
+    result = scoped(specs, out, "--fuse", "file", "--pagetype-registry", registry, "--shared-only")
+    assert result.returncode == 0, result.stderr
+    unit = next(text for path, text in read_tree(out / "gen").items() if path.endswith(".Customer.UI.ixx"))
+    assert "export class GFX_EXPORT OtherPage : public Page {" in unit
+
+    # The configure-time (full) run records the new class, with the ID the rules used.
+    generate(specs, out, "--fuse", "file", "--pagetype-registry", registry)
+    assert '"OtherPage"' in registry.read_text(encoding="utf-8")
+
+
+def test_scoped_client_run_trusts_but_never_writes_the_stamp(specs, tmp_path):
+    stamp = tmp_path / "out" / ".yaml2code.stamp"
+    argv = [sys.executable, str(REPO / "yaml2code_client.py"), "--stamp", str(stamp), "--reproducible",
+            "--no-parse-cache", "--scan", str(specs), "--output", str(tmp_path / "out"), "--impl-dir",
+            str(tmp_path / "impl"), "--app-target", "App"]
+    only = ["--only", str(specs / "customer.yaml")]
+    assert subprocess.run(argv, capture_output=True).returncode == 0
+    recorded = stamp.read_text(encoding="utf-8")
+
+    result = subprocess.run(argv + only, capture_output=True, text=True)
+    assert result.returncode == 0 and result.stdout == ""   # stamp current: the generator never ran
+
+    edit(specs, "customer.yaml", '"Name:"', '"Full name:"')
+    result = subprocess.run(argv + only, capture_output=True, text=True)
+    assert result.returncode == 0, result.stderr
+    assert "CustomerDetailsGroup.ixx" in result.stdout
+    assert stamp.read_text(encoding="utf-8") == recorded
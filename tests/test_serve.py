@@ -0,0 +1,52 @@
+"""--serve: the resident generator only answers its own user."""
+
+import os
+import socket
+import stat
+import subprocess
+import sys
+import time
+
+import pytest
+
+from conftest import GENERATOR, SPECS
+
+pytestmark = pytest.mark.skipif(not hasattr(socket, "AF_UNIX"), reason="needs Unix domain sockets")
+
+
+@pytest.fixture
+def server(tmp_path):
+    sock = tmp_path / "run" / "y2c.sock"
+    proc = subprocess.Popen([sys.executable, str(GENERATOR), "--serve", str(sock), "--idle-timeout", "30"],
+                            stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    try:
+        deadline = time.monotonic() + 10
+        while not sock.exists():
+            assert proc.poll() is None and time.monotonic() < deadline, "server did not start"
+            time.sleep(0.05)
+        yield sock
+    finally:
+        proc.kill()
+        proc.wait()
+
+
+def test_socket_and_directory_are_private(server):
+    assert stat.S_IMODE(server.stat().st_mode) == 0o600
+    assert stat.S_IMODE(server.parent.stat().st_mode) == 0o700
+
+
+def test_own_user_is_served(server, tmp_path):
+    import yaml2code_client
+    reply = yaml2code_client.forward(str(server), [
+        "--quiet", "--reproducible", "--no-parse-cache", "--scan", str(SPECS), "--output", str(tmp_path / "gen"),
+        "--impl-dir", str(tmp_path / "impl"), "--app-target", "App"])
+    assert reply["rc"] == 0, reply["stderr"]
+    assert (tmp_path / "gen" / "ui" / "SetupWizard.ixx").is_file()
+
+
+@pytest.mark.skipif(not hasattr(socket, "SO_PEERCRED"), reason="no SO_PEERCRED")
+def test_peer_uid():
+    import yaml2code
+    a, b = socket.socketpair(socket.AF_UNIX)
+    with a, b:
+        assert yaml2code._peer_uid(a) == os.getuid()
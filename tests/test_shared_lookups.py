@@ -0,0 +1,67 @@
+"""--shared-lookups: controls reading the same lookup load it once per page build, from m_lookupCache."""
+
+from conftest import SPECS, generate, read_tree
+
+CACHE = "   db::LookupCache m_lookupCache;  // shared alt_data_source lookups (--shared-lookups)"
+
+# Two Choices on one lookup, a third on its own, and nothing else that needs Database.
+LOOKUPS = """groups:
+  picker:
+    elements:
+      - section: S
+        items:
+          - control: { variable: m_a, name: a, base_class: Choice, contains: ID::Type,
+                       alt_data_source: { table: kinds, value_field: id, display_field: name } }
+          - control: { variable: m_b, name: b, base_class: Choice, contains: ID::Type,
+                       alt_data_source: { table: kinds, value_field: id, display_field: name } }
+          - control: { variable: m_c, name: c, base_class: Choice, contains: ID::Type,
+                       alt_data_source: { table: regions, value_field: code, display_field: title } }
+"""
+
+
+def picker(specs, tmp_path, extra=""):
+    for path in specs.rglob("*.yaml"):
+        path.unlink()
+    (specs / "picker.yaml").write_text(LOOKUPS + extra, encoding="utf-8")
+    generate(specs, tmp_path / "out", "--shared-lookups")
+    return read_tree(tmp_path / "out" / "gen")["ui/PickerGroup.ixx"]
+
+
+def test_controls_on_one_lookup_share_one_query(tmp_path):
+    generate(SPECS, tmp_path / "out", "--shared-lookups")
+    group = read_tree(tmp_path / "out" / "gen")["ui/CustomerDetailsGroup.ixx"]
+    assert CACHE in group
+    assert '      m_kind->loadFromDB(m_lookupCache.rows("kinds", "id", "name"));' in group
+    assert '      m_kind2->loadFromDB(m_lookupCache.rows("kinds", "id", "name"));' in group
+    assert "->loadFromDB();" not in group
+
+
+def test_a_lookup_read_once_keeps_its_own_query(specs, tmp_path):
+    group = picker(specs, tmp_path)
+    assert '      m_b->loadFromDB(m_lookupCache.rows("kinds", "id", "name"));' in group
+    assert "      m_c->loadFromDB();" in group
+
+
+def test_recordset_events_clear_the_cache(specs, tmp_path):
+    group = picker(specs, tmp_path)
+    assert ("protected:\n"
+            "   auto onEvent(sig::RecordSetEvent event) -> void override {\n"
+            "      m_lookupCache.clear();\n"
+            "      Interface::onEvent(event);\n"
+            "   }\n") in group
+
+
+def test_a_written_on_event_clears_first(specs, tmp_path):
+    group = picker(specs, tmp_path, '    on_event: { body: "   Interface::onEvent(event);" }\n')
+    assert ("auto PickerGroup::onEvent(sig::RecordSetEvent event) -> void {\n"
+            "   m_lookupCache.clear();\n"
+            "   Interface::onEvent(event);\n"
+            "}") in group
+    assert group.count("m_lookupCache.clear();") == 1
+
+
+def test_cache_module_is_imported(specs, tmp_path):
+    # No table/field binding and no recordset: only m_lookupCache names db::.
+    assert "\nimport Database;\n" in picker(specs, tmp_path)
+    generate(specs, tmp_path / "plain")
+    assert "\nimport Database;\n" not in read_tree(tmp_path / "plain" / "gen")["ui/PickerGroup.ixx"]
@@ -0,0 +1,65 @@
+"""'look_ahead: true' wizards: one page built in the constructor, the rest on demand."""
+
+from conftest import generate, read_tree
+
+
+def look_ahead_wizard(specs, tmp_path):
+    text = (specs / "sub" / "wiz.yaml").read_text(encoding="utf-8")
+    (specs / "sub" / "wiz.yaml").write_text(text.replace("  setup:\n", "  setup:\n    look_ahead: true\n"),
+                                            encoding="utf-8")
+    generate(specs, tmp_path / "out")
+    return read_tree(tmp_path / "out" / "gen")["ui/SetupWizard.ixx"]
+
+
+def constructor(wizard):
+    return wizard[wizard.index(" public:"):]
+
+
+def test_constructor_builds_exactly_one_page(specs, tmp_path):
+    body = constructor(look_ahead_wizard(specs, tmp_path))
+    # The first page synchronously; the next only once a page is shown (PAGE_CHANGED).
+    assert body.count("buildNextPage();") == 3
+    assert "      buildNextPage();\n" in body
+    assert "\n      CallAfter(" not in body
+
+
+def test_unbuilt_successor_is_built_before_next_reads_it(specs, tmp_path):
+    # wxWizard::OnBackOrNext() reads GetNext() after BEFORE_PAGE_CHANGED but before
+    # PAGE_CHANGING; building from the latter would finish the wizard early.
+    body = constructor(look_ahead_wizard(specs, tmp_path))
+    assert ("      Bind(wxEVT_WIZARD_BEFORE_PAGE_CHANGED, [this](wxWizardEvent &event) {\n"
+            "         event.Skip();\n"
+            "         if (event.GetDirection() && event.GetPage() && !event.GetPage()->GetNext())\n"
+            "            buildNextPage();\n"
+            "      });") in body
+    assert ("      Bind(wxEVT_WIZARD_PAGE_CHANGED, [this](wxWizardEvent &event) {\n"
+            "         event.Skip();\n"
+            "         CallAfter([this] { buildNextPage(); });\n"
+            "      });") in body
+    assert "wxEVT_WIZARD_PAGE_CHANGING" not in body
+
+
+def test_adding_a_page_relabels_the_next_button(specs, tmp_path):
+    # ShowPage() said "Finish" while the shown page had no successor yet.
+    body = look_ahead_wizard(specs, tmp_path)
+    assert ("         if (m_pageFactories[m_nextPage++]()) {\n"
+            "            updateNextButton();\n"
+            "            return true;\n") in body
+    assert ("next->SetLabel(wxGetTranslation(HasNextPage(page) ? \"&Next >\" : \"&Finish\"));") in body
+    assert "if (auto *next = FindWindow(wxID_FORWARD))" in body
+
+
+def test_if_condition_guards_the_factory(specs, tmp_path):
+    body = constructor(look_ahead_wizard(specs, tmp_path))
+    assert ("      m_pageFactories.emplace_back([this, args]() mutable -> bool {\n"
+            "         if (!param<bool>(args, \"firstRun\", false)) {\n"
+            "            addPage(new WelcomeWizardPage(") in body
+    assert "            return true;\n         }\n         return false;\n      });" in body
+
+
+def test_eager_wizard_unchanged(tmp_path):
+    from conftest import SPECS
+    generate(SPECS, tmp_path / "out")
+    body = constructor(read_tree(tmp_path / "out" / "gen")["ui/SetupWizard.ixx"])
+    assert "m_pageFactories" not in body
+    assert "      if (!param<bool>(args, \"firstRun\", false)) {\n         addPage(" in body
@@ -0,0 +1,72 @@
+"""YamlSchema: one pass over the document, dropping what it rejects before any emitter runs."""
+
+from pathlib import Path
+
+from conftest import generate, read_tree
+from yaml2code import YamlSchema
+
+SPEC = Path("spec.yaml")
+
+
+def validate(data):
+    return YamlSchema().validate(data, SPEC)
+
+
+def control(**member):
+    return {"groups": {"g": {"elements": [{"section": "S", "items": [{"control": member}]}]}}}
+
+
+def test_wrongly_typed_scalars_are_dropped():
+    data = control(variable="m_a", name="a", is_group="yes", transfer=False,
+                   alt_data_source={"table": "t", "include_blank": 0, "blank_text": "-"})
+    assert validate(data) == [
+        "groups.g.elements[0].items[0].control.is_group must be a bool, not str; dropped spec.yaml",
+        "groups.g.elements[0].items[0].control.alt_data_source.include_blank must be a bool, not int; "
+        "dropped spec.yaml",
+    ]
+    member = data["groups"]["g"]["elements"][0]["items"][0]["control"]
+    assert "is_group" not in member and member["transfer"] is False
+    assert member["alt_data_source"] == {"table": "t", "blank_text": "-"}
+
+
+def test_incomplete_conditional_values_are_dropped():
+    data = control(variable="m_a", name="a",
+                   size={"condition": "x", "if_true": "sizeLabel"},
+                   style=["wxBORDER", {"condition": "x", "if_true": "A", "if_false": "B", "when": 1},
+                          {"condition": "y", "if_true": ["C", {"if_false": "D"}], "if_false": "E"}],
+                   uicreateflags=["ReadOnly", {"condition": "x", "if_false": "Hidden"}])
+    diagnostics = validate(data)
+    assert "groups.g.elements[0].items[0].control.size is missing required 'if_false'; dropped spec.yaml" \
+        in diagnostics
+    assert "unknown keys ['when'] in groups.g.elements[0].items[0].control.style[1] spec.yaml" in diagnostics
+    assert "groups.g.elements[0].items[0].control.style[2].if_true[1] is missing required 'condition'; " \
+           "dropped spec.yaml" in diagnostics
+    member = data["groups"]["g"]["elements"][0]["items"][0]["control"]
+    assert "size" not in member
+    assert member["style"][2]["if_true"] == ["C"]          # the flag list loses one entry
+    assert member["uicreateflags"] == ["ReadOnly"]
+
+
+def test_positional_lists_are_dropped_whole():
+    # Dropping one default would shift every later triplet out of place.
+    data = {"pages": {"p": {"class_args": {"arg_name": "a", "args_in": [
+        "x", "bool", {"condition": "c", "if_true": True}, "y", "int", 1]}}}}
+    assert validate(data)[-1] == "pages.p.class_args.args_in is read by position; dropped as a whole spec.yaml"
+    assert data["pages"]["p"]["class_args"] == {"arg_name": "a"}
+
+
+def test_strict_list_entries_are_dropped():
+    data = {"groups": {"g": {"elements": [{"section": "S", "items": [
+        {"labels": [{"value": "no key"}, {"key": "k"}]}, "text"]}]}}}
+    validate(data)
+    assert data["groups"]["g"]["elements"][0]["items"] == [{"labels": [{"key": "k"}]}]
+
+
+def test_emitters_see_the_default(specs, tmp_path):
+    path = specs / "sub" / "wiz.yaml"
+    text = path.read_text(encoding="utf-8")
+    path.write_text(text.replace("        name: customer\n", "        name: customer\n        lazy: \"yes\"\n"),
+                    encoding="utf-8")
+    result = generate(specs, tmp_path / "out")
+    assert "].lazy must be a bool, not str; dropped" in result.stderr
+    assert "Page * {" not in read_tree(tmp_path / "out" / "gen")["ui/MainBook.ixx"]   # not made lazy
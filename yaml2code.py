@@ -5,11 +5,21 @@ Generates C++ Group module files from YAML form definitions.
 """
 
 import sys
+import os
+import io
 import subprocess
 import argparse
 import re
+import contextlib
+import concurrent.futures
+import functools
+import hashlib
+import json
+import pickle
+import textwrap
+import time
 from pathlib import Path
-from typing import Dict, Any, List, Tuple, Optional
+from typing import Dict, Any, Iterable, List, Tuple, Optional, Callable
 import datetime
 from dataclasses import dataclass
 
@@ -30,6 +40,119 @@ def ensure_yaml():
 
 yaml = ensure_yaml()
 
+
+class YamlMap(dict):
+    """A YAML mapping that remembers the (1-based) line it starts on, so schema
+       diagnostics can point at it. Otherwise an ordinary dict."""
+    __slots__ = ("line",)
+
+
+def _construct_yaml_map(loader: Any, node: Any):
+    data = YamlMap()
+    data.line = node.start_mark.line + 1
+    yield data
+    data.update(loader.construct_mapping(node))
+
+
+@functools.lru_cache(maxsize=None)
+def _line_marking(loader_cls: Any) -> Any:
+    marking = type(f"LineMarking{loader_cls.__name__}", (loader_cls,), {})
+    marking.add_constructor("tag:yaml.org,2002:map", _construct_yaml_map)
+    return marking
+
+
+def yaml_loader(backend: str = "auto") -> Tuple[Any, str]:
+    """The PyYAML loader class for a backend name ('auto', 'libyaml' or 'python') and the
+       name of the backend actually used. Both are safe_load() loaders; 'auto' prefers
+       libyaml's CSafeLoader -- the same documents, several times faster -- whenever
+       PyYAML was built against libyaml, and quietly falls back to pure Python otherwise.
+       Either way mappings load as YamlMap, carrying their line number."""
+    c_loader = getattr(yaml, "CSafeLoader", None)
+    if backend == "python" or (backend == "auto" and c_loader is None):
+        return _line_marking(yaml.SafeLoader), "python"
+    if backend not in ("auto", "libyaml"):
+        raise ValueError(f"Unknown YAML backend '{backend}' (expected auto, libyaml or python)")
+    if c_loader is None:
+        raise ValueError("YAML backend 'libyaml' requested, but PyYAML was built without libyaml")
+    return _line_marking(c_loader), "libyaml"
+
+
+class _Profiler:
+    """
+    --profile: nested timing spans, written out as Chrome trace-event JSON (load it in
+    chrome://tracing or ui.perfetto.dev). Spans are complete ("ph": "X") events; each also
+    carries its self time -- its duration minus that of the spans nested in it -- which is
+    what the phase summary adds up. Pool workers profile into their own instance and hand
+    their events back with each result (see _pool_parse()/_pool_generate()).
+    """
+
+    def __init__(self):
+        self.events: List[Dict[str, Any]] = []
+        self._children: List[int] = []  # nested-span time, one slot per open span
+
+    @contextlib.contextmanager
+    def span(self, name: str, cat: str, **args: Any):
+        start = time.perf_counter_ns()
+        self._children.append(0)
+        try:
+            yield
+        finally:
+            dur = time.perf_counter_ns() - start
+            children = self._children.pop()
+            if self._children:
+                self._children[-1] += dur
+            self.events.append({"name": name, "cat": cat, "ph": "X", "pid": os.getpid(), "tid": 0,
+                                "ts": start / 1000, "dur": dur / 1000,
+                                "args": {**args, "self_ms": round((dur - children) / 1e6, 3)}})
+
+    def drain(self) -> List[Dict[str, Any]]:
+        events, self.events = self.events, []
+        return events
+
+    def write(self, path: Path) -> None:
+        origin = min((e["ts"] for e in self.events), default=0)
+        events = [{**e, "ts": round(e["ts"] - origin, 3), "dur": round(e["dur"], 3)} for e in self.events]
+        Path(path).write_text(json.dumps({"traceEvents": events, "displayTimeUnit": "ms"}), encoding="utf-8")
+
+    def summary(self, top: int = 10) -> str:
+        """The slowest files (all their spans, summed) and where time went by phase (self time)."""
+        files: Dict[str, float] = {}
+        phases: Dict[str, List[float]] = {}
+        for e in self.events:
+            if e["cat"] == "file":
+                files[e["name"]] = files.get(e["name"], 0.0) + e["dur"] / 1000
+            else:
+                totals = phases.setdefault(e["cat"], [0.0, 0])
+                totals[0] += e["args"]["self_ms"]
+                totals[1] += 1
+
+        lines = [f"Slowest files ({min(top, len(files))} of {len(files)}):"]
+        for name, ms in sorted(files.items(), key=lambda kv: -kv[1])[:top]:
+            lines.append(f"  {ms:10.1f} ms  {name}")
+        lines.append("Phases (self time):")
+        for cat, (ms, calls) in sorted(phases.items(), key=lambda kv: -kv[1][0]):
+            lines.append(f"  {ms:10.1f} ms  {cat:<10} {calls:>7} span(s)")
+        return "\n".join(lines)
+
+
+# Set only while a --profile run is in progress.
+_profiler: Optional[_Profiler] = None
+
+
+def _profiled(phase: str, label: Optional[Callable[..., str]] = None):
+    """Method decorator: with --profile on, time each call as a span of the given phase,
+       named by label(*call args) or else the method name. A no-op check otherwise."""
+    def wrap(fn):
+        @functools.wraps(fn)
+        def inner(*args, **kwargs):
+            if _profiler is None:
+                return fn(*args, **kwargs)
+            with _profiler.span(label(*args, **kwargs) if label else fn.__name__, phase):
+                return fn(*args, **kwargs)
+        return inner
+    return wrap
+
+
 # A C++ numeric literal, optionally signed, optionally hex, optionally carrying an
 # integer/float suffix (-1L, 0x10u, 3.0f, 123ULL, .5, 5.). Recognized so it can be
 # emitted verbatim instead of being run through int()/float() (which chokes on the
@@ -41,6 +164,335 @@ _CPP_NUMERIC_LITERAL_RE = re.compile(r'^[+-]?(?:0[xX][0-9a-fA-F]+|\d+\.\d*|\.\d+
 # instead of being quoted as a string literal.
 _CPP_IDENTIFIER_RE = re.compile(r'^[A-Za-z_]\w*$')
 
+
+# Typed intermediate representation of one group/page/wizardpage class's elements[*].items[*]
+# tree. CppGenerator.build_class_ir() walks (and validates) the YAML once per class; the
+# emitters in generate_ui_module() -- imports, DBSource structs, declarations, refresh
+# scaffolding, creation code -- all read from it instead of each re-walking the raw dicts
+# and re-running the extract_*() helpers (and re-printing their warnings) per pass.
+
+@dataclass(slots=True)
+class LabelIR:
+    """One 'labels:' entry of a section, resolved to createLabel() arguments."""
+    tag: str
+    value: str
+    quoted: bool                 # False for a `value: [ expr ]` one-item list (emitted unquoted)
+    size: str
+    flags: str
+    sizer: Any                   # raw 'sizer:' mapping, only rendered with --sizer-info
+
+
+@dataclass(slots=True)
+class HandlerIR:
+    """One 'handlers:' entry: the hookAndHandle() calls it expands to."""
+    events: List[str]            # normalized wxEVT_* tokens, one hook each
+    event_type: str
+    body: str                    # handler code, already re-indented for the lambda body
+    source: str                  # handler code as written ('\n' escapes expanded), for --handler-tables
+
+
+@dataclass(slots=True)
+class SpacerIR:
+    kind: str                    # "spacer" | "expanding_spacer"
+    sizer: Any
+
+
+@dataclass(slots=True)
+class ControlIR:
+    """A 'control:' item with everything the emitters need resolved exactly once. md keeps
+       the raw mapping for the single-use extract_*() calls made while creating it."""
+    md: Dict[str, Any]
+    var: Optional[str]
+    control_class: str
+    base_class: str
+    cpp_type: str                # member declaration/construction type
+    data_type: Any               # 'contains:'
+    alt_data_source: Optional[Dict[str, Any]]
+    tag: Optional[str]           # 'name:', resolved up front only when alt_data_source needs it
+    cflags_list: List[str]
+    cflags: str
+    is_group: bool               # 'is_group:' as validated by extract_uicreate_flags()
+    nested_group: bool           # created as a nested Group on a page/wizardpage
+    modules: List[str]
+    validator: Any
+    handlers: List[HandlerIR]
+    verbatim: str
+
+
+@dataclass(slots=True)
+class SectionIR:
+    identity: str
+    tool_tip: str
+    verbatim: str
+    items: Optional[List[Any]]   # ControlIR/SpacerIR in order; None if 'items' wasn't a list
+    labels: List[LabelIR]
+    sizer: Any                   # raw 'sizer:' mapping of the section itself
+    placed: List[Any]            # LabelIR/ControlIR/SpacerIR in YAML order: what loadLayout places
+
+
+@dataclass(slots=True)
+class ClassIR:
+    sections: List[SectionIR]
+    controls: List[ControlIR]    # every section's controls, in order
+
+
+@dataclass(slots=True)
+class WizardPageIR:
+    """One wizard 'pages:' entry as its constructor runs it (see generate_wizard_module())."""
+    condition: Optional[str]     # the 'if:' test, as a C++ bool expression; None = unconditional
+    args_lines: List[str]        # builds the page's own anymap, when it has an 'args:' mapping
+    call: str                    # the addPage(new ...) statement
+    reads_args: bool             # whether any of the above reads the wizard's 'args'
+
+
+@dataclass(frozen=True, slots=True)
+class _SchemaRule:
+    keys: Optional[frozenset]                  # allowed keys; None = not checked
+    children: Tuple[Tuple[str, str, str], ...] = ()  # (key, shape, rule): shape is "one" (a mapping),
+                                               # "list" (of mappings) or "dict" (name -> mapping)
+    required: frozenset = frozenset()
+    lenient: bool = False                      # keys only checked once one of them is present
+    strict_lists: frozenset = frozenset()      # child lists whose shape problems get reported
+    types: Tuple[Tuple[str, str], ...] = ()    # (key, scalar type name in YamlSchema.TYPES)
+    conditionals: frozenset = frozenset()      # keys whose value, or list entries, may be conditional_values
+    positional: frozenset = frozenset()        # of those, flat lists read by position (args triplets)
+
+
+class YamlSchema:
+    """
+    The YAML spec schema -- allowed keys per node kind, which keys nest which node kinds,
+    required keys, scalar types, and where a {condition, if_true, if_false} value may
+    stand -- declared once below and compiled at import into frozen rules.
+    validate() checks a whole parsed document against it in one traversal, before any
+    emitter runs, and returns its diagnostics with the line each offending mapping starts
+    on (see YamlMap). It also drops what it rejects -- a wrongly typed key, an incomplete
+    conditional value, a list entry of the wrong shape -- so the emitters only ever see
+    valid nodes, and read a dropped key's default as if it had never been written. Key,
+    shape and type checks therefore live here rather than in the emitters; those only
+    keep the value checks that decide what they emit.
+    """
+
+    # Allowed keys per node kind.
+    KEYS: Dict[str, frozenset] = {name: frozenset(keys) for name, keys in {
+        "class_def": (               # groups / pages / wizardpages / book items
+            "class_args", "base_class", "class", "class_name", "container", "elements", "export_module",
+            "finally", "functions", "layout", "module", "modules", "on_event", "on_kill_active",
+            "on_set_active", "pages", "pos", "recordset", "run_generator", "size", "sizer", "style",
+            "title", "value", "variables", "verbatim",
+        ),
+        "sizer_def": (
+            "border", "col_widths", "cols", "growable_cols", "growable_rows", "hgap", "kind",
+            "position", "proportion", "row_heights", "rows", "span", "vgap",
+        ),
+        "sizer_kinds": ("flex", "grid"),
+        "class_args_def": ("arg_name", "args_in", "extract_inside"),   # page / group / wizardpage / book(container:true)
+        "wizard_class_args_def": ("arg_name", "args_in"),              # wizard: only -- reduced scope, no extraction
+        "args_def": ("arg_name", "insert", "translate", "extract_before", "extract_after"),  # nested inside control: only
+        "recordset_def": ("table", "order_by", "allow_add"),
+        "alt_data_source_def": ("blank_text", "display_field", "include_blank", "table", "value_field"),
+        "control_set": ("section", "Section", "has_control", "has_group", "items", "size", "sizer", "tool_tip",
+                        "verbatim"),
+        "item_entry": ("labels", "control", "spacer", "expanding_spacer"),
+        "control_member_def": (
+            "alt_data_source", "args", "base_class", "class", "contains", "default", "field", "handlers",
+            "is_group", "module", "name", "pos", "signature", "size", "sizer", "style", "table", "transfer",
+            "uicreateflags", "validator", "value", "variable", "verbatim",
+        ),
+        "spacer_def": ("sizer",),
+        "label_entry": ("class", "key", "pos", "size", "sizer", "style", "name", "value"),
+        "handler_entry": ("event", "handler", "type"),
+        "validator_def": ("allow_empty", "class", "tool_tip", "transfer_model"),
+        "variable_def": ("access", "default", "include", "module", "type"),
+        "wizard_def": ("class_args", "cancel_message", "class", "finally", "look_ahead", "module", "modules",
+                       "pages", "run_generator"),
+        "wizard_page_entry": ("args", "class", "header", "if", "module", "name", "uicreateflags"),
+        "book_page_entry": ("args", "class", "lazy", "module", "name", "type"),
+        "conditional_value": ("condition", "anymap", "if_true", "if_false"),
+    }.items()}
+
+    # Scalar types a "types" entry below may name. bool is checked as such (YAML's
+    # true/false), never by truthiness: 'lazy: "no"' is a mistake, not a false.
+    TYPES: Dict[str, type] = {"bool": bool, "string": str}
+
+    # The args triplet lists -- [name, type, default, name, type, default, ...] -- whose
+    # defaults may be conditional values. Read by position, so an invalid entry drops the
+    # whole list rather than shifting every later entry into the wrong slot.
+    _ARGS_LISTS = ("args_in", "insert", "translate", "extract_inside", "extract_before", "extract_after")
+
+    # Node kind -> (nested node kinds, required keys, scalar types, conditional-value keys,
+    # ...). Kinds without an entry here are only checked for unknown keys.
+    _STRUCTURE: Dict[str, Dict[str, Any]] = {
+        "class_def": {"children": (("class_args", "one", "class_args_def"),
+                                   ("recordset", "one", "recordset_def"),
+                                   ("variables", "dict", "variable_def"),
+                                   ("elements", "list", "control_set"),
+                                   ("pages", "list", "book_page_entry")),
+                      "types": {"container": "bool", "run_generator": "bool"},
+                      "conditionals": ("size", "style", "value")},
+        "class_args_def": {"positional": _ARGS_LISTS},
+        "wizard_class_args_def": {"positional": _ARGS_LISTS},
+        "args_def": {"positional": _ARGS_LISTS},
+        "recordset_def": {"types": {"allow_add": "bool"}},
+        "alt_data_source_def": {"types": {"include_blank": "bool", "blank_text": "string"}},
+        "variable_def": {"conditionals": ("default",)},
+        "control_set": {"children": (("items", "list", "item_entry"),),
+                        "strict_lists": ("items",)},
+        "item_entry": {"children": (("control", "one", "control_member_def"),
+                                    ("spacer", "one", "spacer_def"),
+                                    ("expanding_spacer", "one", "spacer_def"),
+                                    ("labels", "list", "label_entry")),
+                       "strict_lists": ("labels",)},
+        "control_member_def": {"children": (("validator", "one", "validator_def"),
+                                            ("alt_data_source", "one", "alt_data_source_def"),
+                                            ("args", "one", "args_def"),
+                                            ("handlers", "list", "handler_entry")),
+                               "strict_lists": ("handlers",),
+                               "types": {"is_group": "bool", "transfer": "bool"},
+                               "conditionals": ("size", "style", "value", "default", "uicreateflags")},
+        "label_entry": {"required": ("key",),
+                        "conditionals": ("size", "style", "value")},
+        "validator_def": {"types": {"allow_empty": "bool"}},
+        "wizard_def": {"children": (("class_args", "one", "wizard_class_args_def"),
+                                    ("pages", "list", "wizard_page_entry")),
+                       "types": {"look_ahead": "bool", "run_generator": "bool"}},
+        "wizard_page_entry": {"children": (("args", "one", "args_def"),),
+                              "conditionals": ("header", "uicreateflags")},
+        # A book child's args: is either a flat {key: value} map or, once it uses any of
+        # these keys, an args_def block (see _generate_book_child_calls()).
+        "book_page_entry": {"children": (("args", "one", "book_child_args"),),
+                            "types": {"lazy": "bool"}},
+        "book_child_args": {"keys": "args_def", "lenient": True, "positional": _ARGS_LISTS},
+        # {condition, [anymap,] if_true, if_false}, wherever a "conditionals" key holds one.
+        # A style branch may be a flag list holding further conditional entries.
+        "conditional_value": {"required": ("condition", "if_true", "if_false"),
+                              "conditionals": ("if_true", "if_false")},
+    }
+
+    CATEGORIES = {"groups": "class_def", "pages": "class_def", "wizardpages": "class_def",
+                  "book": "class_def", "wizard": "wizard_def"}
+
+    def __init__(self):
+        self.rules: Dict[str, _SchemaRule] = {}
+        for name in set(self.KEYS) | set(self._STRUCTURE):
+            spec = self._STRUCTURE.get(name, {})
+            self.rules[name] = _SchemaRule(
+                keys=self.KEYS[spec.get("keys", name)] if spec.get("keys", name) in self.KEYS else None,
+                children=tuple(spec.get("children", ())),
+                required=frozenset(spec.get("required", ())),
+                lenient=spec.get("lenient", False),
+                strict_lists=frozenset(spec.get("strict_lists", ())),
+                types=tuple(spec.get("types", {}).items()),
+                conditionals=frozenset(spec.get("conditionals", ())) | frozenset(spec.get("positional", ())),
+                positional=frozenset(spec.get("positional", ())),
+            )
+
+    def validate(self, data: Any, yaml_file: Path) -> List[str]:
+        """Diagnostics for every item that will be generated (run_generator: false items are
+           skipped, as generation skips them), each ending in '<file>:<line>'. Drops from
+           `data`, in place, every node a diagnostic rejects."""
+        diagnostics: List[str] = []
+        if not isinstance(data, dict):
+            return diagnostics
+        for category, rule in self.CATEGORIES.items():
+            items = data.get(category)
+            if not isinstance(items, dict):
+                continue  # _process_category() reports that
+            for name, item_def in items.items():
+                if name == "verbatim" or not isinstance(item_def, dict) or item_def.get("run_generator") is False:
+                    continue
+                self._check(item_def, self.rules[rule], f"{category}.{name}", yaml_file, diagnostics)
+        return diagnostics
+
+    @staticmethod
+    def _where(node: Any, yaml_file: Path) -> str:
+        return f"{yaml_file}:{node.line}" if isinstance(node, YamlMap) else f"{yaml_file}"
+
+    def _check(self, node: Dict[str, Any], rule: _SchemaRule, path: str, yaml_file: Path,
+               diagnostics: List[str]) -> bool:
+        """Check one mapping against its rule, dropping what it rejects below it. Returns
+           False when the node itself is invalid (a required key is missing) -- its parent
+           then drops it."""
+        where = self._where(node, yaml_file)
+        if rule.keys is not None and not (rule.lenient and rule.keys.isdisjoint(node)):
+            unknown = [k for k in node if k not in rule.keys]
+            if unknown:
+                diagnostics.append(f"unknown keys {unknown} in {path} {where}")
+        missing = [key for key in sorted(rule.required) if key not in node]
+        for key in missing:
+            diagnostics.append(f"{path} is missing required '{key}'; dropped {where}")
+        if missing:
+            return False
+
+        for key, type_name in rule.types:
+            if key in node and not isinstance(node[key], self.TYPES[type_name]):
+                diagnostics.append(f"{path}.{key} must be a {type_name}, not {type(node[key]).__name__}; "
+                                   f"dropped {where}")
+                del node[key]
+
+        for key in sorted(rule.conditionals):
+            if key in node and not self._check_conditional(node[key], key in rule.positional,
+                                                           f"{path}.{key}", yaml_file, diagnostics):
+                if key in rule.positional:
+                    diagnostics.append(f"{path}.{key} is read by position; dropped as a whole {where}")
+                del node[key]
+
+        for key, shape, child in rule.children:
+            value = node.get(key)
+            if value is None:
+                continue
+            child_rule = self.rules[child]
+            if shape == "one":
+                if isinstance(value, dict) and not self._check(value, child_rule, f"{path}.{key}",
+                                                               yaml_file, diagnostics):
+                    del node[key]
+            elif shape == "dict":
+                if isinstance(value, dict):
+                    for k in [k for k, v in value.items()
+                              if isinstance(v, dict)
+                              and not self._check(v, child_rule, f"{path}.{key}.{k}", yaml_file, diagnostics)]:
+                        del value[k]
+            elif not isinstance(value, list):
+                if key in rule.strict_lists:
+                    diagnostics.append(f"{path}.{key} must be a list, not {type(value).__name__}; "
+                                       f"dropped {where}")
+                    del node[key]
+            else:
+                kept = []
+                for i, v in enumerate(value):
+                    if isinstance(v, dict):
+                        if self._check(v, child_rule, f"{path}.{key}[{i}]", yaml_file, diagnostics):
+                            kept.append(v)
+                    elif key in rule.strict_lists:
+                        diagnostics.append(f"{path}.{key}[{i}] must be a mapping, not {type(v).__name__}; "
+                                           f"dropped {where}")
+                    else:
+                        kept.append(v)
+                value[:] = kept
+        return True
+
+    def _check_conditional(self, value: Any, positional: bool, path: str, yaml_file: Path,
+                           diagnostics: List[str]) -> bool:
+        """Check a value that may be, or list, conditional values. A mapping using any
+           conditional_value key is one. An invalid entry of a flag list is dropped from it;
+           in a positional list it invalidates the list. Returns False when `value` has to
+           be dropped."""
+        if isinstance(value, dict) and not self.KEYS["conditional_value"].isdisjoint(value):
+            return self._check(value, self.rules["conditional_value"], path, yaml_file, diagnostics)
+        if isinstance(value, list):
+            kept = []
+            for i, entry in enumerate(value):
+                if self._check_conditional(entry, positional, f"{path}[{i}]", yaml_file, diagnostics):
+                    kept.append(entry)
+                elif positional:
+                    return False
+            value[:] = kept
+        return True
+
+
+# Compiled once at import, shared by every CppGenerator.
+_schema = YamlSchema()
+
+
 class CppGenerator:
     """
     Generates C++23 module (.ixx) files from YAML form definitions: wxWidgets
@@ -52,6 +504,8 @@ class CppGenerator:
     YAML directly at runtime to CREATE TABLE the schema and CREATE VIEW a
     "<table>_detail" joined view per table with relationships. Reads/writes go through
     the generic db::RowSet (Libs/Core/src/RowSet.ixx) -- no per-table generated struct.
+    With --schema they are also compiled into one module of normalized DDL and a digest
+    TableLoader can check instead (see SchemaCompiler).
     """
 
     debugging = False
@@ -65,6 +519,96 @@ class CppGenerator:
     next_PageType: int = 1000
     export_var: str = "GFX_EXPORT"
     impl_dir: Optional[Path] = None
+    yaml_backend: str = "auto"                # see yaml_loader()
+    parse_cache_dir: Optional[Path] = None    # see ParseCache
+    output_digests: Optional["OutputDigests"] = None  # see OutputDigests; None = compare by reading
+    # --reproducible: header comments name the source by content hash and a path relative
+    # to source_root (the scan root in batch mode) instead of by mtime and absolute path.
+    reproducible: bool = False
+    source_root: Optional[Path] = None
+    # Class name -> PageType ID to emit, set per file by batch mode (see _page_types_for()).
+    # Classes not in it (or no map at all) take next_PageType.
+    page_type_ids: Optional[Dict[str, int]] = None
+    # --import-report: list the default imports prune_default_imports() dropped, per module.
+    import_report: bool = False
+    # --fuse file|dir: a YAML file's (or scan directory's) classes share one module; see ModuleFusion.
+    fuse: Optional[str] = None
+    # --compiled-layouts: constructors hand loadLayout() constexpr tables instead of a resource.
+    compiled_layouts: bool = False
+    # --handler-tables: 'handlers:' bound from one table per class; see plan_handler_table().
+    handler_tables: bool = False
+    # --class-args-table: class_args defaults shared and read through; see class_args_table_helpers().
+    class_args_table: bool = False
+    # --param-keys: param() reads name interned key handles instead of string literals; see _param_key().
+    param_keys: bool = False
+    _param_key_names: Optional[Dict[str, str]] = None   # the class being generated: key -> handle
+    # --shared-lookups: alt_data_source controls reading the same lookup share one query; see
+    # plan_shared_lookups(). _shared_lookups holds the class being generated's shared keys.
+    shared_lookups: bool = False
+    _shared_lookups: frozenset = frozenset()
+    # --schema MODULE: tables:/relationships: compiled to DDL plus a digest; see SchemaCompiler.
+    schema: Optional[str] = None
+    # --pagetype-registry FILE: only recorded here, for the manifest; see PageTypeRegistry.
+    pagetype_registry: Optional[Path] = None
+    # --prelude NAME: the shared headers come from one generated module per output
+    # directory instead of every global fragment; see prelude_module().
+    prelude: Optional[str] = None
+
+    # With --prelude, the headers that move out of the generated global fragments into the
+    # prelude's, each with the names generated code takes from it. The prelude re-exports
+    # those of them the generated modules actually use (see prelude_exports()), so the list
+    # follows what the emitters write rather than a fixed guess. Only headers whose
+    # contribution is names can move: Core/Core.h, Gfx/gfx_export.h and Gfx/WidgetsFwd.h
+    # supply macros (ASSERT_MSG, the export macro, wxTAB_TRAVERSAL and the other wx style
+    # flags), and a macro never crosses an import; <unordered_set> is the standard
+    # library's, whose names a module must not redeclare. They stay in every fragment.
+    PRELUDE_HEADERS: Dict[str, Tuple[str, ...]] = {
+        '"Core/CoreData.h"': ("anymap", "nullanymap", "add_to_anymap"),
+        '"Core/Util.h"': ("Util", "UIType"),
+        '"Gfx/Sizes.h"': ("sizeCtrl", "sizeCtrlButton", "sizeCtrlCheckBox", "sizeCtrlComboLike", "sizeCtrlELB",
+                          "sizeCtrlIntComboLike", "sizeCtrlLarge", "sizeCtrlMedium", "sizeCtrlMediumLarge",
+                          "sizeCtrlSmall", "sizeCtrlSpin", "sizeLabel", "sizeLabelLarge", "sizeLabelMedium",
+                          "sizeLabelSmall", "sizeNotes"),
+    }
+
+    # The framework modules a group/page/wizardpage was always given, whether or not it used
+    # them. They are now only candidates: prune_default_imports() keeps the ones the class
+    # needs (see default_imports_needed()).
+    DEFAULT_IMPORTS: Dict[str, Tuple[str, ...]] = {
+        "groups": ("Ctrl", "Database", "DDT", "RecordSetInterface", "Interface", "Group", "StringUtil",
+                   "Validator", "wxTypes", "wxUtil", "Page"),
+        "pages": ("Ctrl", "Database", "DDT", "RecordSetInterface", "Interface", "Group", "Page", "StringUtil",
+                  "wxTypes", "wxUtil"),
+        "wizardpages": ("Ctrl", "Database", "DDT", "RecordSetInterface", "Interface", "Group", "WizardPage",
+                        "StringUtil", "wxTypes", "wxUtil"),
+    }
+
+    # The names hand-written C++ (verbatim, handlers, function bodies, the _impl.cpp unit)
+    # would take from each default module; a module whose pattern matches the class's user
+    # code is kept. None: its names can't be told apart, so any user code keeps it. wxTypes
+    # is not listed: a wx name says nothing about whether it came from there, so it is
+    # always kept.
+    DEFAULT_IMPORT_USES: Dict[str, Optional[re.Pattern]] = {
+        module: re.compile(pattern) if pattern is not None else None for module, pattern in {
+            "Ctrl": r"\bICtrl\b|\bUICreateFlags\b|\baddControl\b|\bcreateLabel\b",
+            "Database": r"\bdb::(?!Row\b)\w+",
+            "DDT": r"\bID::\w+|\bhs_bool\b|\bvalue_t\b|\b(?:null)?anymap\b|\badd_to_anymap\b|\bparam\(|\bParamKey\b",
+            "RecordSetInterface": r"\bRecordSetInterface\b|\bsig::RecordSetEvent\b|\brefreshFromCurrent\b"
+                                  r"|\bbindRecordFields\b|->where\(",
+            "Interface": r"\bInterface\b|\bonSetActive\b|\bonKillActive\b|\bonEvent\b",
+            "Group": r"\bGroup\b|\bgetSBSizer\b",
+            "Page": r"\bPage\b|\bPageType\b|\bGetPageSizer\b",
+            "WizardPage": r"\bWizardPage\b",
+            "StringUtil": None,
+            "Validator": r"\w*Validator\b",
+            "wxUtil": r"\bwx::\w+",
+        }.items()
+    }
+
+    # The class_def keys whose values are hand-written C++ rather than data the generator
+    # emits from.
+    USER_CODE_KEYS: Tuple[str, ...] = ("verbatim", "functions", "variables", "on_set_active", "on_kill_active",
+                                       "on_event", "finally")
 
     @dataclass(frozen=True)
     class SizerProperties:
@@ -399,6 +943,18 @@ class CppGenerator:
             'EVT_MOUSEWHEEL': 'wxEVT_MOUSEWHEEL',
         }
 
+        # Every file the current generate_from_yaml() call wrote (or confirmed unchanged)
+        # -- modules and impl stubs -- and whether any category failed outright. Read back
+        # by scan_and_generate() to keep the GenerationManifest honest.
+        self.written_files: List[Path] = []
+        self.failed = False
+        # --fuse: the module this file's classes go into, and their module texts -- collected
+        # by _write_or_concat() instead of being written, then stored as a fusion fragment.
+        self.fuse_unit: Optional[str] = None
+        self.fused_parts: List[str] = []
+        self.standalone_parts: List[Tuple[str, str]] = []
+        self.dbsource_prefix = ""
+
     def be_quiet(self, _quiet: bool) -> None:
         self.quiet = bool(_quiet)
 
@@ -432,14 +988,43 @@ class CppGenerator:
         else:
             raise ValueError(f"Unknown target '{_targets}'")
 
+    def _display_path(self, path: Path) -> str:
+        """How a path appears inside generated code: as given, or -- in reproducible mode --
+           relative to source_root (just the file name if it lives outside it), so the same
+           tree produces the same bytes wherever it is checked out."""
+        if not self.reproducible:
+            return str(path)
+        root = self.source_root if self.source_root is not None else Path.cwd()
+        try:
+            return Path(path).resolve().relative_to(Path(root).resolve()).as_posix()
+        except ValueError:
+            return Path(path).name
+
+    def _source_comment(self, yaml_file: Path) -> str:
+        """The '// <yaml> (...)' line naming a module's source YAML."""
+        if self.reproducible:
+            try:
+                _h = hashlib.sha256(Path(yaml_file).read_bytes()).hexdigest()[:16]
+            except OSError:
+                _h = 'unknown'
+            return f'// {self._display_path(yaml_file)} (sha256: {_h})'
+
+        # Use YAML file modification time for deterministic headers (prevents needless rebuilds)
+        try:
+            _mt = datetime.datetime.fromtimestamp(yaml_file.stat().st_mtime)
+            _mts = _mt.isoformat(sep=' ', timespec='seconds')
+        except Exception:
+            _mts = 'unknown'
+        return f'// {yaml_file} (mtime: {_mts})'
+
+    @_profiled("emit")
     def generate_ui_module(self, target_name: str, class_def: Dict[str, Any], yaml_file: Path, top_verbatim: str,
                          output_dir: Optional[Path] = None) -> str:
         """Generate the complete C++ group/page/wizardpage module file (list-based schema)."""
         self._dbg(f"generate_ui_module: '{target_name}' -> {self.target_class} "
                   f"(top-level keys: {list(class_def.keys()) if isinstance(class_def, dict) else class_def})")
-        allow = self._allowed_sets()
-        self._warn_unknown_keys(class_def, allow["class_def"], f"control class_def '{target_name}'", yaml_file)
 
+        self._param_key_names = {} if self.param_keys else None
         variables_block = self.extract_variables_block(class_def, yaml_file)
         if variables_block:
             self._dbg(f"'{target_name}': variables block: {list(variables_block.keys())}")
@@ -449,14 +1034,8 @@ class CppGenerator:
         code: List[str] = []
         code.append('module;')
         code.append('//')
-        # Use YAML file modification time for deterministic headers (prevents needless rebuilds)
-        try:
-            _mt = datetime.datetime.fromtimestamp(yaml_file.stat().st_mtime)
-            _mts = _mt.isoformat(sep=' ', timespec='seconds')
-        except Exception:
-            _mts = 'unknown'
         code.append(f'// Auto-generated from')
-        code.append(f'// {yaml_file} (mtime: {_mts})')
+        code.append(self._source_comment(yaml_file))
         code.append('')
         code.append('// Make any changes there. This file will be overwritten.')
         code.append('')
@@ -501,8 +1080,13 @@ class CppGenerator:
 
         cpp_class = class_def.get("class_name") or self.to_pascal_case(target_name) + self.target_class
 
+        # One walk over elements[*].items[*]; every emitter below reads this instead. Fused
+        # classes share a namespace scope, so their DBSource structs are named per class.
+        self.dbsource_prefix = f"{cpp_class}_" if self.fuse_unit is not None else ""
+        ir = self.build_class_ir(target_name, elements, yaml_file)
+
         # Required imports
-        required_imports = self.get_required_imports(elements, yaml_file)
+        required_imports = self.get_required_imports(ir, yaml_file)
         for mod in self.collect_variable_modules(variables_block):
             if mod not in required_imports:
                 required_imports.append(mod)
@@ -565,13 +1149,14 @@ class CppGenerator:
                 self._dbg(f"'{target_name}': import '{module}' DROPPED (same as this module's own export_module)")
 
         self._dbg(f"'{target_name}': resolved imports: {true_imports}")
-        imports_formatted = '\n'.join(f"import {module};" for module in true_imports)
         code.append(f'export module {export_module};')
         code.append('')
-        code.append(f'{imports_formatted}')
+        imports_at = len(code)  # filled in once the body is known; see prune_default_imports()
         code.append('')
+        code.append('')
+        page_type = self.page_type_ids.get(cpp_class) if self.page_type_ids is not None else None
         code.append('export namespace PageType {')
-        code.append(f"const Type {cpp_class}({self.next_PageType});")
+        code.append(f"const Type {cpp_class}({page_type if page_type is not None else self.next_PageType});")
         code.append('}')
         code.append('')
 
@@ -583,6 +1168,13 @@ class CppGenerator:
         else:
             layout_category, layout_class_name = layout_class_name.split(':', 1)
 
+        # --compiled-layouts: a class laid out by its own YAML gets that layout as constexpr
+        # tables (see compile_layout()); one naming another resource ('layout:') still loads it.
+        compiled_layout = self.compile_layout(cpp_class, layout_key, class_def, ir, yaml_file) \
+            if self.compiled_layouts and "layout" not in class_def else None
+        if compiled_layout is not None and "LayoutTable" not in true_imports:
+            true_imports.append("LayoutTable")
+
         code.append(f"namespace {ns} {{")
         code.append("")
         self.next_PageType += 1
@@ -596,8 +1188,8 @@ class CppGenerator:
         # scope, non-exported) before the class that names it as a template argument. Backed
         # by the generic db::Row (DB.RowSet) -- value_field is assumed integer-typed (id/FK),
         # matching every real usage (a lookup table's id, populating an ID::Type-valued control).
-        for var, tag, alt_ds, data_type in self.collect_alt_data_sources(elements, yaml_file):
-            struct_name = f"{tag}DBSource"
+        for var, tag, alt_ds, data_type in self.collect_alt_data_sources(ir, yaml_file):
+            struct_name = f"{self.dbsource_prefix}{tag}DBSource"
             value_get = f'r.get<int>("{alt_ds["value_field"]}")'
             value_expr = f"ID::Type({value_get})" if data_type == "ID::Type" else value_get
             code.append(f"struct {struct_name} {{")
@@ -614,9 +1206,14 @@ class CppGenerator:
             code.append("};")
             code.append("")
 
+        if compiled_layout is not None:
+            code.extend(compiled_layout)
+
         code.append(f"export class {self.export_var} {cpp_class} : public {top_base_class} {{")
-        code.append("   std::filesystem::path layoutPath;")
+        if compiled_layout is None:
+            code.append("   std::filesystem::path layoutPath;")
         code.append("   std::string layoutKey;")
+        param_keys_at = len(code)  # see param_key_table()
 
         # The generated ctor parameter is always named 'args' (see ctor signature
         # emission below), regardless of whether this page/group declares its own
@@ -648,25 +1245,29 @@ class CppGenerator:
                 # regenerated by this same factory function, called fresh at every merge
                 # site below (merge() drains its source, so reusing one instance across
                 # calls would silently empty it out after the first construction).
+                # --class-args-table lifts that: see class_args_table_helpers().
                 page_args_factory = f"{page_args_var}Default"
-                code.append(f"   static auto {page_args_factory}() -> anymap {{")
-                code.append("      anymap m;")
-                code.extend(emplace_lines)
-                code.append("      return m;")
-                code.append("   }")
-                # param calls in the body use 'args' (the ctor parameter); the
-                # factory function above only supplies the ctor's default argument.
-
-                # merge() returns void, so it can't sit inline as the anymap argument to
-                # the base-class constructor call below -- this helper mutates the
-                # caller's own 'args' local in place (by reference) and hands back a
-                # reference to it, so later body code (extract_inside's param() calls)
-                # sees the filled-in class defaults too.
                 merge_helper_name = f"{page_args_var}Merged"
-                code.append(f"   static auto {merge_helper_name}(anymap &a) -> anymap & {{")
-                code.append(f"      a.merge({page_args_factory}());")
-                code.append("      return a;")
-                code.append("   }")
+                if self.class_args_table:
+                    code.extend(self.class_args_table_helpers(page_args_factory, merge_helper_name, emplace_lines))
+                else:
+                    code.append(f"   static auto {page_args_factory}() -> anymap {{")
+                    code.append("      anymap m;")
+                    code.extend(emplace_lines)
+                    code.append("      return m;")
+                    code.append("   }")
+                    # param calls in the body use 'args' (the ctor parameter); the
+                    # factory function above only supplies the ctor's default argument.
+
+                    # merge() returns void, so it can't sit inline as the anymap argument to
+                    # the base-class constructor call below -- this helper mutates the
+                    # caller's own 'args' local in place (by reference) and hands back a
+                    # reference to it, so later body code (extract_inside's param() calls)
+                    # sees the filled-in class defaults too.
+                    code.append(f"   static auto {merge_helper_name}(anymap &a) -> anymap & {{")
+                    code.append(f"      a.merge({page_args_factory}());")
+                    code.append("      return a;")
+                    code.append("   }")
 
         # Impl dir/stub path determined early: both the on_set_active/on_kill_active
         # overrides and 'functions:' entries may need to be stubbed out here.
@@ -677,6 +1278,7 @@ class CppGenerator:
         else:
             impl_dir = yaml_file.parent / "impl"
         stub_path = impl_dir / f"{cpp_class}_impl.cpp"
+        stub_display = self._display_path(stub_path)
 
         kill_declared, on_kill_active = self.extract_group_method_body('on_kill_active', target_name, class_def, yaml_file)
         set_declared, on_set_active = self.extract_group_method_body('on_set_active', target_name, class_def, yaml_file)
@@ -692,23 +1294,23 @@ class CppGenerator:
             code.append("protected:")
             code.append("   // OnKillActive/SetActive/onEvent overrides")
             if kill_declared:
-                note = "" if on_kill_active is not None else f"  // Implemented in {stub_path}"
+                note = "" if on_kill_active is not None else f"  // Implemented in {stub_display}"
                 code.append(f"   auto onKillActive(bool autoDisable) -> void override;{note}")
             if set_declared:
-                note = "" if on_set_active is not None else f"  // Implemented in {stub_path}"
+                note = "" if on_set_active is not None else f"  // Implemented in {stub_display}"
                 code.append(f"   auto onSetActive(bool autoEnable) -> void override;{note}")
             if event_declared:
-                note = "" if on_event is not None else f"  // Implemented in {stub_path}"
+                note = "" if on_event is not None else f"  // Implemented in {stub_display}"
                 code.append(f"   auto onEvent(sig::RecordSetEvent event) -> void override;{note}")
             if refresh_ex_declared:
                 # Pages: overrides RecordSetPage::refreshEx() (virtual, empty default).
                 # Groups: no common base owns a RowSet, so this is a plain (non-overriding)
                 # member function refreshFromCurrent(rec) itself calls directly.
                 refresh_ex_override = " override" if self.target_type == "pages" else ""
-                code.append(f"   auto refreshEx(const db::Row *rec) -> void{refresh_ex_override};  // Implemented in {stub_path}")
+                code.append(f"   auto refreshEx(const db::Row *rec) -> void{refresh_ex_override};  // Implemented in {stub_display}")
 
         # Declarations
-        control_decls = self.generate_control_declarations(elements, yaml_file)
+        control_decls = self.generate_control_declarations(ir, yaml_file)
         self._dbg(f"'{target_name}': {len(control_decls)} member declaration line(s) generated"
                   if control_decls else f"'{target_name}': NO control declarations generated from 'elements'")
         code.append("")
@@ -753,7 +1355,7 @@ class CppGenerator:
                 fn_text = (
                     f"   {static_prefix}auto {fname} ({args})"
                     f"{const_suffix}{noexcept_suffix} -> {ret}{override_suffix};"
-                    f"  // Implemented in {stub_path}"
+                    f"  // Implemented in {stub_display}"
                 )
             else:
                 body = body.replace('\r\n', '\n').replace('\r', '\n')
@@ -778,7 +1380,7 @@ class CppGenerator:
         # (wx::initFromField already handles the optional-empty case by leaving the control
         # untouched).
         if recordset:
-            bound_controls, group_members = self.collect_refresh_targets(elements, yaml_file)
+            bound_controls, group_members = self.collect_refresh_targets(ir, yaml_file)
             if self.target_type == "pages":
                 if bound_controls or group_members:
                     bf: List[str] = ["   auto bindRecordFields (const db::Row *rec) -> void override {"]
@@ -824,6 +1426,30 @@ class CppGenerator:
                 return ""
             return f"\n{access_name}:\n" + '\n'.join(fns)
 
+        handler_table = self.plan_handler_table(cpp_class, ir) if self.handler_tables else None
+        if handler_table is not None:
+            access_groups['private'].append('\n'.join(handler_table[0]))
+
+        # --shared-lookups: the cache the shared lookups load from, emptied by every recordset
+        # event the class sees, so a lookup table edited meanwhile is re-read on the next use.
+        # A hand-written onEvent() gets the clear() prepended; one left to the impl stub can't.
+        self._shared_lookups = self.plan_shared_lookups(ir) if self.shared_lookups else frozenset()
+        lookup_cache = bool(self._shared_lookups)
+        if lookup_cache:
+            access_groups['private'].append("   db::LookupCache m_lookupCache;  // shared alt_data_source lookups (--shared-lookups)")
+            if not event_declared:
+                access_groups['protected'].append('\n'.join([
+                    "   auto onEvent(sig::RecordSetEvent event) -> void override {",
+                    "      m_lookupCache.clear();",
+                    "      Interface::onEvent(event);",
+                    "   }"]))
+            elif on_event is not None:
+                on_event = "   m_lookupCache.clear();\n" + on_event
+            else:
+                print(f"Warning: '{target_name}': on_event is implemented in {stub_display}; call "
+                      f"m_lookupCache.clear() there so --shared-lookups sees lookup table changes {yaml_file}",
+                      file=sys.stderr)
+
         public_access_block = format_access_block('public', access_groups['public'])
         protected_access_block = format_access_block('protected', access_groups['protected'])
         private_access_block = format_access_block('private', access_groups['private'])
@@ -848,7 +1474,9 @@ class CppGenerator:
         # (not const anymap&) so {merge_helper_name}(args) -- which mutates it via
         # unordered_map::merge -- can be called on it; classes without class_args keep
         # the original const-ref parameter unchanged.
-        default_args_expr = f"{page_args_factory}()" if page_args_factory else "nullanymap"
+        # (--class-args-table: the caller's map, filled in from the shared table by
+        # {merge_helper_name}; defaulting to a copy of the table would only fill it twice.)
+        default_args_expr = f"{page_args_factory}()" if page_args_factory and not self.class_args_table else "nullanymap"
         args_param_type = "anymap " if has_class_args else "const anymap &"
         value_default = "PageType::Null" if top_base_class == "Page" else "std::string{}"
         pad1: str = " " * len(f"   explicit {cpp_class} ( ")
@@ -891,6 +1519,7 @@ class CppGenerator:
         # explicitly qualified because Group also inherits mergeWithCreationArgs from
         # Ctrl (via StaticBox), making an unqualified call ambiguous there.
         if has_class_args:
+            # (--class-args-table: the shared table itself, by reference.)
             code.append(f"      this->Interface::mergeWithCreationArgs({page_args_factory}());")
 
         # class_args.extract_inside at ctor top
@@ -899,14 +1528,15 @@ class CppGenerator:
                 lit = self._resolve_default_literal(default, ty, yaml_file,
                                                     f"class_args.extract_inside.'{entry_name}'")
                 prefix = "" if no_auto else "auto "
-                code.append(f'      {prefix}{var_name} = param({map_name}, "{entry_name}", {lit});')
+                code.append(f'      {prefix}{var_name} = param({map_name}, {self._param_key(entry_name)}, {lit});')
             # code.append("")
 
         # Layout boilerplate
-        code.append(
-            f'      layoutPath = Util::getInstance().resourceName(UIType::{layout_category}, "{layout_class_name}", false, nullptr);')
-        code.append(
-            f'      ASSERT_MSG(!layoutPath.empty(), "Couldn\'t find layout resource \'{layout_class_name}\'");')
+        if compiled_layout is None:
+            code.append(
+                f'      layoutPath = Util::getInstance().resourceName(UIType::{layout_category}, "{layout_class_name}", false, nullptr);')
+            code.append(
+                f'      ASSERT_MSG(!layoutPath.empty(), "Couldn\'t find layout resource \'{layout_class_name}\'");')
         code.append(f'      layoutKey = "{layout_key}";')
         code.append("")
 
@@ -940,9 +1570,11 @@ class CppGenerator:
         #         code.append(f'')
 
         # Creation code for list-based elements
-        creation_code, target_parent = self.generate_control_creation(target_name, elements, layout_class_name,
+        creation_code, target_parent = self.generate_control_creation(target_name, ir, layout_class_name,
                                                                       yaml_file,
-                                                                      parent_args_var_for_children)
+                                                                      parent_args_var_for_children,
+                                                                      handler_table)
+        self._shared_lookups = frozenset()
 
         self._dbg(f"'{target_name}': generate_control_creation -> {len(creation_code)} line(s), "
                   f"target_parent='{target_parent}'")
@@ -968,8 +1600,11 @@ class CppGenerator:
             for line in finally_block.rstrip().splitlines():
                 code.append(f"      {line}")
 
-        code.append(
-            '      VERIFY_MSG(this->loadLayout(layoutPath, layoutKey), "Error loading layout resource " + layoutPath.string());')
+        if compiled_layout is not None:
+            code.append(f'      VERIFY_MSG(this->loadLayout({cpp_class}Layout), "Error applying compiled layout " + layoutKey);')
+        else:
+            code.append(
+                '      VERIFY_MSG(this->loadLayout(layoutPath, layoutKey), "Error loading layout resource " + layoutPath.string());')
 
         if self.target_type == 'wizardpages':
             code.append("      GetPageSizer().Add(&grid(), 1, wxALL | wxGROW);")
@@ -1046,7 +1681,35 @@ class CppGenerator:
             }
         if stub_fns:
             self._dbg(f"'{target_name}': writing impl stub(s) for {list(stub_fns.keys())} to {stub_path}")
-            self._write_impl_stub(impl_dir, cpp_class, export_module, ns, stub_fns)
+            self._write_impl_stub(impl_dir, cpp_class, self.fuse_unit or export_module, ns, stub_fns)
+
+        code[param_keys_at:param_keys_at] = self.param_key_table()
+
+        # Hand-written C++ may name a default module the generated code doesn't: keep what
+        # it plausibly uses. That includes the _impl.cpp unit, which sees this interface's
+        # imports; code added to it later imports anything else it needs itself.
+        user_code = [top_verbatim if isinstance(top_verbatim, str) else ""]
+        user_code.extend(self._strings(class_def.get(key)) for key in self.USER_CODE_KEYS)
+        user_code.extend(section.verbatim for section in ir.sections)
+        for ctl in ir.controls:
+            user_code.append(ctl.verbatim)
+            user_code.extend(handler.source for handler in ctl.handlers)
+        if stub_fns and stub_path.exists():
+            user_code.append(stub_path.read_text(encoding="utf-8"))
+        has_book_children = self.target_type == "pages" and isinstance(book_children, list) and bool(book_children)
+        needed = self.default_imports_needed(ir, recordset, kill_declared or set_declared, event_declared,
+                                             has_class_args, has_book_children, lookup_cache)
+        needed |= self.user_code_imports("\n".join(user_code))
+        true_imports, dropped_imports = self.prune_default_imports(true_imports, needed)
+        # --shared-lookups: pruning only ever keeps candidates, and Database -- where
+        # db::LookupCache is declared -- need not be one, so m_lookupCache adds it itself.
+        if lookup_cache and "Database" not in true_imports:
+            true_imports.append("Database")
+        if dropped_imports:
+            self._dbg(f"'{target_name}': unused default imports DROPPED: {dropped_imports}")
+            if self.import_report:
+                print(f"{cpp_class} : dropped imports {', '.join(dropped_imports)} {yaml_file}")
+        code[imports_at] = '\n'.join(f"import {module};" for module in true_imports)
 
         self._dbg(f"'{target_name}': generate_ui_module complete, {len(code)} line(s) of C++ generated")
         return "\n".join(code)
@@ -1061,6 +1724,7 @@ class CppGenerator:
         """Escape a Python string for embedding as a C++ string literal body (no surrounding quotes)."""
         return str(s).replace("\\", "\\\\").replace('"', '\\"')
 
+    @_profiled("emit")
     def generate_wizard_module(self, target_name: str, class_def: Dict[str, Any], yaml_file: Path,
                                output_dir: Optional[Path] = None) -> str:
         """Generate a Wizard-container module: a Wizard subclass (ctor(wxFrame*, std::string,
@@ -1070,10 +1734,13 @@ class CppGenerator:
 
            Unlike groups/pages/wizardpages, a wizard's 'pages:' list describes class
            instantiations to chain together, not physical controls on a sizer grid, so this
-           does not reuse the elements/control schema or generate_ui_module."""
-        allow = self._allowed_sets()
-        self._warn_unknown_keys(class_def, allow["wizard_def"], f"wizard '{target_name}'", yaml_file)
+           does not reuse the elements/control schema or generate_ui_module.
+
+           'look_ahead: true' builds only the first page in the constructor: each page becomes
+           a factory (its if: gating and args lines inside) and the next one is built at idle
+           time while the user is on the page before it -- see _wizard_look_ahead()."""
 
+        self._param_key_names = {} if self.param_keys else None
         pascal_name = self.to_pascal_case(target_name)
         cpp_class = class_def.get("class") or f"{pascal_name}Wizard"
         if not isinstance(cpp_class, str) or not cpp_class.strip():
@@ -1096,7 +1763,7 @@ class CppGenerator:
         # mergeWithCreationArgs()/creationArgs() call to make here -- Wizard::args() (its own
         # stored anymap) is fed straight from the ctor parameter instead.
         # extract_inside/extract_before/extract_after are still not supported: wizard_class_args
-        # only allows arg_name/args_in (see _allowed_sets()["wizard_class_args_def"]) since a
+        # only allows arg_name/args_in (see YamlSchema.KEYS["wizard_class_args_def"]) since a
         # wizard's own body has no per-page scope to extract into -- extraction still belongs on
         # each 'pages:' entry's own 'args:' block. Declared args_in names are also used to
         # validate 'if:'/header 'condition:' keys on page entries below.
@@ -1134,15 +1801,15 @@ class CppGenerator:
         if cancel_message is not None:
             required_imports.add("HtmlDialog")
 
+        look_ahead = class_def.get("look_ahead", False)
+
         pages = class_def.get("pages", [])
-        page_call_lines: List[str] = []
+        wizard_pages: List[WizardPageIR] = []
         for idx, page in enumerate(pages):
             if not isinstance(page, dict):
                 print(f"Warning: wizard '{target_name}'.pages[{idx}] must be a mapping; skipping {yaml_file}",
                       file=sys.stderr)
                 continue
-            self._warn_unknown_keys(page, allow["wizard_page_entry"], f"wizard '{target_name}'.pages[{idx}]",
-                                    yaml_file)
 
             page_class = page.get("class")
             if not isinstance(page_class, str) or not page_class.strip():
@@ -1208,6 +1875,7 @@ class CppGenerator:
             call_line = (f'addPage(new {page_class}({cflags}, "{page_name}", this, '
                         f'{header_expr}, {args_expr}, 0L));')
 
+            cond_expr = None
             if_key = page.get("if")
             if isinstance(if_key, str) and if_key.strip():
                 raw = if_key.strip()
@@ -1216,27 +1884,27 @@ class CppGenerator:
                 if declared_arg_names and key not in declared_arg_names:
                     print(f"Warning: wizard '{target_name}'.pages[{idx}] if: '{key}' is not declared in this "
                           f"wizard's args_in {yaml_file}", file=sys.stderr)
-                cond_expr = f'{"!" if negate else ""}param<bool>(args, "{key}", false)'
-                page_call_lines.append(f"      if ({cond_expr}) {{")
-                page_call_lines.extend(f"   {l}" for l in page_args_lines)
-                page_call_lines.append(f"         {call_line}")
-                page_call_lines.append("      }")
-            else:
-                page_call_lines.extend(page_args_lines)
-                page_call_lines.append(f"      {call_line}")
+                cond_expr = f'{"!" if negate else ""}param<bool>(args, {self._param_key(key)}, false)'
+            # args_lines are derived from 'args'; a header condition resolves against it too.
+            reads_args = cond_expr is not None or bool(page_args_lines) or args_expr == "args" \
+                or isinstance(header, dict)
+            wizard_pages.append(WizardPageIR(cond_expr, page_args_lines, call_line, reads_args))
 
         finally_body = self._extract_finally_begin(class_def)
 
+        look_ahead_members: List[str] = []
+        if look_ahead:
+            page_call_lines, look_ahead_members = self._wizard_look_ahead(cpp_class, wizard_pages)
+        else:
+            page_call_lines = []
+            for wizard_page in wizard_pages:
+                page_call_lines.extend(self._wizard_page_lines(wizard_page))
+
         code: List[str] = []
         code.append('module;')
         code.append('//')
-        try:
-            _mt = datetime.datetime.fromtimestamp(yaml_file.stat().st_mtime)
-            _mts = _mt.isoformat(sep=' ', timespec='seconds')
-        except Exception:
-            _mts = 'unknown'
         code.append(f'// Auto-generated from')
-        code.append(f'// {yaml_file} (mtime: {_mts})')
+        code.append(self._source_comment(yaml_file))
         code.append('')
         code.append('// Make any changes there. This file will be overwritten.')
         code.append('')
@@ -1250,6 +1918,9 @@ class CppGenerator:
         code.append(f'#include "{self.app_target}/GlobalIDs.h"')
         code.append('#include <wx/wizard.h>')
         code.append('#include <utility>')
+        if look_ahead:
+            code.append('#include <functional>')
+            code.append('#include <vector>')
         code.append('')
 
         true_imports = sorted(m for m in required_imports if m != export_module)
@@ -1259,20 +1930,25 @@ class CppGenerator:
         code.append('')
         code.append('namespace wx {')
         code.append(f'export class {self.export_var} {cpp_class} : public Wizard {{')
+        code.extend(self.param_key_table())
 
         has_class_args = bool(wizard_args_var) and bool(wizard_emplace_lines)
         if has_class_args:
             wizard_args_factory = f"{wizard_args_var}Default"
-            code.append(f"   static auto {wizard_args_factory}() -> anymap {{")
-            code.append("      anymap m;")
-            code.extend(wizard_emplace_lines)
-            code.append("      return m;")
-            code.append("   }")
             wizard_merge_helper_name = f"{wizard_args_var}Merged"
-            code.append(f"   static auto {wizard_merge_helper_name}(anymap &a) -> anymap & {{")
-            code.append(f"      a.merge({wizard_args_factory}());")
-            code.append("      return a;")
-            code.append("   }")
+            if self.class_args_table:
+                code.extend(self.class_args_table_helpers(wizard_args_factory, wizard_merge_helper_name,
+                                                          wizard_emplace_lines))
+            else:
+                code.append(f"   static auto {wizard_args_factory}() -> anymap {{")
+                code.append("      anymap m;")
+                code.extend(wizard_emplace_lines)
+                code.append("      return m;")
+                code.append("   }")
+                code.append(f"   static auto {wizard_merge_helper_name}(anymap &a) -> anymap & {{")
+                code.append(f"      a.merge({wizard_args_factory}());")
+                code.append("      return a;")
+                code.append("   }")
             code.append('')
 
         if cancel_message is not None:
@@ -1286,8 +1962,13 @@ class CppGenerator:
             code.append('   [[nodiscard]] auto cancelMessage() const -> std::pair<std::string, std::string> override;')
             code.append('')
 
+        if look_ahead_members:
+            code.append('private:')
+            code.extend(look_ahead_members)
+            code.append('')
+
         code.append(' public:')
-        default_args_expr = f"{wizard_args_factory}()" if has_class_args else "nullanymap"
+        default_args_expr = f"{wizard_args_factory}()" if has_class_args and not self.class_args_table else "nullanymap"
         ctor_args_expr = f"{wizard_merge_helper_name}(args)" if has_class_args else "args"
         code.append(f'   explicit {cpp_class}(wxFrame *frame, std::string title, anymap args = {default_args_expr}) '
                     f': Wizard(frame, title, {ctor_args_expr}) {{')
@@ -1312,6 +1993,80 @@ class CppGenerator:
 
         return "\n".join(code)
 
+    @staticmethod
+    def _wizard_page_lines(page: WizardPageIR, indent: str = "      ") -> List[str]:
+        """An eager wizard constructor's lines for one page: its args lines and addPage() call,
+           inside its if: test when it has one. args_lines come indented for the constructor
+           body (six spaces); a deeper indent shifts them along."""
+        shift = indent[6:]
+        if page.condition is None:
+            return [f"{shift}{line}" for line in page.args_lines] + [f"{indent}{page.call}"]
+        return [f"{indent}if ({page.condition}) {{",
+                *(f"{shift}   {line}" for line in page.args_lines),
+                f"{indent}   {page.call}",
+                f"{indent}}}"]
+
+    def _wizard_look_ahead(self, cpp_class: str, wizard_pages: List[WizardPageIR]) -> Tuple[List[str], List[str]]:
+        """A look_ahead: wizard's constructor lines and private members. Each page (its if:
+           test, args lines and addPage() call, as the eager constructor would run them)
+           becomes a factory returning whether it added a page; buildNextPage() runs factories
+           until one does. The constructor builds the first page only; showing a page (the
+           first included) queues the next one for idle time. A factory that reads 'args'
+           holds its own copy, since it outlives the constructor.
+
+           Two wxWizard details shape the wiring. Next reads GetNext() of the current page
+           after wxEVT_WIZARD_BEFORE_PAGE_CHANGED and before wxEVT_WIZARD_PAGE_CHANGING, so a
+           successor the user beat the idle queue to is built on the spot from the former;
+           by the latter, a null GetNext() has already ended the wizard. And ShowPage()
+           labels the button "Finish" when the shown page has no successor yet, so
+           buildNextPage() relabels it whenever it adds the current page's successor."""
+        lines = ["      // look_ahead: only the first page is built here; each following one is built at",
+                 "      // idle time while the user is on the page before it (see buildNextPage()).",
+                 f"      m_pageFactories.reserve({len(wizard_pages)});"]
+        for page in wizard_pages:
+            capture = "this, args" if page.reads_args else "this"
+            lines.append(f"      m_pageFactories.emplace_back([{capture}]() mutable -> bool {{")
+            if page.condition is None:
+                lines.extend(self._wizard_page_lines(page, "         "))
+                lines.append("         return true;")
+            else:
+                lines.extend(self._wizard_page_lines(page, "         ")[:-1])
+                lines.append("            return true;")
+                lines.append("         }")
+                lines.append("         return false;")
+            lines.append("      });")
+        lines.append("      buildNextPage();")
+        lines.append("      Bind(wxEVT_WIZARD_PAGE_CHANGED, [this](wxWizardEvent &event) {")
+        lines.append("         event.Skip();")
+        lines.append("         CallAfter([this] { buildNextPage(); });")
+        lines.append("      });")
+        lines.append("      Bind(wxEVT_WIZARD_BEFORE_PAGE_CHANGED, [this](wxWizardEvent &event) {")
+        lines.append("         event.Skip();")
+        lines.append("         if (event.GetDirection() && event.GetPage() && !event.GetPage()->GetNext())")
+        lines.append("            buildNextPage();")
+        lines.append("      });")
+
+        members = ["   std::vector<std::function<bool()>> m_pageFactories;",
+                   "   std::size_t m_nextPage = 0;",
+                   "",
+                   "   auto buildNextPage() -> bool {",
+                   "      while (m_nextPage < m_pageFactories.size())",
+                   "         if (m_pageFactories[m_nextPage++]()) {",
+                   "            updateNextButton();",
+                   "            return true;",
+                   "         }",
+                   "      return false;",
+                   "   }",
+                   "",
+                   "   // ShowPage() labelled the button from HasNextPage() before this page's successor existed.",
+                   "   auto updateNextButton() -> void {",
+                   "      if (auto *page = GetCurrentPage())",
+                   "         if (auto *next = FindWindow(wxID_FORWARD))",
+                   "            next->SetLabel(wxGetTranslation(HasNextPage(page) ? \"&Next >\" : \"&Finish\"));",
+                   "   }"]
+        self._dbg(f"_wizard_look_ahead('{cpp_class}'): {len(wizard_pages)} page factor(ies)")
+        return lines, members
+
     def _book_child_arg_expr(self, val: Any, ctx: str, yaml_file: Path) -> str:
         """A single value in a book page-entry's 'args' mapping: either a plain scalar
            literal, or {icon: {type, file, must_exist}} -> a wx::getIcon(...) call."""
@@ -1357,8 +2112,13 @@ class CppGenerator:
            key (arg_name/insert/translate/extract_before/extract_after), the same schema
            args: blocks elsewhere use, remapped from parent_args_var via
            _emit_item_args. The latter requires an anymap actually be in scope at the call
-           site (parent_args_var not None)."""
-        allow = self._allowed_sets()
+           site (parent_args_var not None).
+
+           A child with 'lazy: true' is registered instead of built:
+           '<parent_expr>->addLazyPage(wx::nextID(), "<name>", PageType::<type>, -1, <factory>);'
+           puts a placeholder in its slot, and the factory -- a lambda taking (Book *, id) and
+           returning the new page, with the child's args lines moved inside it -- builds the
+           real page the first time that placeholder is activated."""
         lines: List[str] = []
         for idx, child in enumerate(children):
             if not isinstance(child, dict):
@@ -1366,7 +2126,6 @@ class CppGenerator:
                       file=sys.stderr)
                 continue
             ctx = f"'{ctx_name}'.pages[{idx}]"
-            self._warn_unknown_keys(child, allow["book_page_entry"], ctx, yaml_file)
 
             child_class = child.get("class")
             if not isinstance(child_class, str) or not child_class.strip():
@@ -1394,9 +2153,14 @@ class CppGenerator:
                 continue
             child_type = child_type.strip()
 
+            lazy = child.get("lazy", False)
+            outer_lines = lines
+            if lazy:
+                lines = []
+
             args_expr = None
             args_map = child.get("args")
-            if isinstance(args_map, dict) and any(k in args_map for k in allow["args_def"]):
+            if isinstance(args_map, dict) and any(k in args_map for k in YamlSchema.KEYS["args_def"]):
                 if parent_args_var:
                     arg_lines, local_name, _extract_after = self._emit_item_args(child, parent_args_var, yaml_file,
                                                                                  f"{ctx} args")
@@ -1416,10 +2180,30 @@ class CppGenerator:
             elif args_map is not None:
                 print(f"Warning: {ctx} 'args' must be a mapping; ignoring {yaml_file}", file=sys.stderr)
 
-            ctor_args = f'{parent_expr}, wx::nextID(), "{child_name}", PageType::{child_type}, -1'
+            if not lazy:
+                ctor_args = f'{parent_expr}, wx::nextID(), "{child_name}", PageType::{child_type}, -1'
+                if args_expr:
+                    ctor_args += f', {args_expr}'
+                lines.append(f'      (void) new {child_class}({ctor_args});')
+                continue
+
+            # The factory runs long after this scope has returned. Inside a class (a container
+            # page's constructor) it keeps 'this', for args lines that read members; a child
+            # with args holds its own copy of the enclosing anymap, 'mutable' so the args
+            # lines may extract from it as they would from the original.
+            ctor_args = f'book, id, "{child_name}", PageType::{child_type}, -1'
             if args_expr:
                 ctor_args += f', {args_expr}'
-            lines.append(f'      (void) new {child_class}({ctor_args});')
+            capture = ["this"] if parent_expr.startswith("this") else []
+            if parent_args_var and isinstance(args_map, dict) and args_map:
+                capture.append(parent_args_var)
+            outer_lines.append(f'      {parent_expr}->addLazyPage(wx::nextID(), "{child_name}", '
+                               f'PageType::{child_type}, -1,')
+            outer_lines.append(f'            [{", ".join(capture)}](Book *book, wxWindowIDRef id) mutable -> Page * {{')
+            outer_lines.extend(f"               {line[6:]}" if line.startswith("      ") else line for line in lines)
+            outer_lines.append(f'               return new {child_class}({ctor_args});')
+            outer_lines.append('            });')
+            lines = outer_lines
         return lines
 
     def generate_book_module(self, target_name: str, class_def: Dict[str, Any], yaml_file: Path,
@@ -1437,10 +2221,6 @@ class CppGenerator:
                generator - already owns via CView::initBook()).
         """
         container = class_def.get('container', False)
-        if not isinstance(container, bool):
-            print(f"Warning: book '{target_name}' 'container' must be hs_bool; defaulting to false {yaml_file}",
-                  file=sys.stderr)
-            container = False
 
         if container:
             saved_type, saved_class = self.target_type, self.target_class
@@ -1453,10 +2233,9 @@ class CppGenerator:
 
         return self._generate_book_populate_module(target_name, class_def, yaml_file)
 
+    @_profiled("emit")
     def _generate_book_populate_module(self, target_name: str, class_def: Dict[str, Any],
                                        yaml_file: Path) -> str:
-        allow = self._allowed_sets()
-        self._warn_unknown_keys(class_def, allow["class_def"], f"book '{target_name}'", yaml_file)
 
         pascal_name = self.to_pascal_case(target_name)
         export_module = class_def.get("module") or f"{pascal_name}.Book"
@@ -1472,19 +2251,16 @@ class CppGenerator:
                 mod = child.get("module")
                 if isinstance(mod, str) and mod.strip():
                     required_imports.add(mod.strip())
+                if child.get("lazy") is True:
+                    required_imports.add("Page")  # the factories' return type
 
         call_lines = self._generate_book_child_calls(target_name, children, "book", yaml_file)
 
         code: List[str] = []
         code.append('module;')
         code.append('//')
-        try:
-            _mt = datetime.datetime.fromtimestamp(yaml_file.stat().st_mtime)
-            _mts = _mt.isoformat(sep=' ', timespec='seconds')
-        except Exception:
-            _mts = 'unknown'
         code.append(f'// Auto-generated from')
-        code.append(f'// {yaml_file} (mtime: {_mts})')
+        code.append(self._source_comment(yaml_file))
         code.append('')
         code.append('// Make any changes there. This file will be overwritten.')
         code.append('')
@@ -1509,18 +2285,15 @@ class CppGenerator:
 
         return "\n".join(code)
 
-    def generate_control_creation(self, group_name: str, elements: Any, layout_path: str, yaml_file: Path,
-                                  parent_args_var: Optional[str]) -> Tuple[List[str], str]:
-        """Build creation code from list-based elements[*].items."""
-        creation_code: List[str] = []
-        target_parent: str = ""
-
-        allow = self._allowed_sets()
-
+    @_profiled("elements")
+    def build_class_ir(self, group_name: str, elements: Any, yaml_file: Path) -> ClassIR:
+        """Normalize a class's list-based elements[*].items[*] into a ClassIR -- the one walk
+           over the raw YAML that every emitter in generate_ui_module() shares."""
+        ir = ClassIR(sections=[], controls=[])
         if not isinstance(elements, list):
-            self._dbg(f"generate_control_creation('{group_name}'): 'elements' is a "
-                      f"{type(elements).__name__}, not a list - DROPPED, no creation code")
-            return creation_code, target_parent
+            self._dbg(f"build_class_ir('{group_name}'): 'elements' is a "
+                      f"{type(elements).__name__}, not a list - DROPPED, no controls")
+            return ir
 
         for idx, element in enumerate(elements):
             if not isinstance(element, dict):
@@ -1528,14 +2301,11 @@ class CppGenerator:
                           f"DROPPED")
                 continue
 
-            # Element-level verbatim (Placement: before this element's items)
-            elements_verbatim = self._extract_verbatim_body(element)
-            if elements_verbatim:
-                for line in elements_verbatim.rstrip().splitlines():
-                    creation_code.append(f"      {line}")
-
             identity = element.get('section') or element.get('Section') or ""
-            tool_tip = element.get('tool_tip', '')
+            section = SectionIR(identity=identity, tool_tip=element.get('tool_tip', ''),
+                                verbatim=self._extract_verbatim_body(element), items=None, labels=[],
+                                sizer=element.get('sizer'), placed=[])
+            ir.sections.append(section)
             items = element.get('items', [])
             if not isinstance(items, list):
                 self._dbg(f"'{group_name}': section '{identity}' (elements[{idx}]) 'items' is a "
@@ -1543,15 +2313,7 @@ class CppGenerator:
                 continue
 
             self._dbg(f"'{group_name}': section '{identity}' (elements[{idx}]): {len(items)} item(s)")
-
-            if self.target_type == "groups":
-                target_parent = "getSBSizer()->GetStaticBox();"
-            elif self.target_type == "pages":
-                target_parent = "getForm()"
-            elif self.target_type == "wizardpages":
-                target_parent = "this"
-            else:
-                target_parent = "pParent"
+            section.items = []
 
             for item_idx, item in enumerate(items):
                 if not isinstance(item, dict):
@@ -1559,108 +2321,169 @@ class CppGenerator:
                               f"{type(item).__name__}, not a mapping - DROPPED")
                     continue
 
-                # Controls in groups; groups in pages
-                if self.target_type == "groups" and "control" in item and isinstance(item["control"], dict):
-                    md = item["control"]
-                    var = self.extract_member_variable(md, f"control '{identity}'", yaml_file)
-                    self._dbg(f"'{group_name}': section '{identity}'.items[{item_idx}]: control "
-                              f"'{var}' (class={md.get('class')!r})")
-                    # Per-member verbatim (Placement: before addControl)
-                    controlset_verbatim = self._extract_verbatim_body(md)
-                    creation_code.extend(self._generate_single_control(
-                        member_name=var,
-                        member_def=md,
-                        control_name=identity,
-                        tool_tip=tool_tip,
-                        all_elements=element,  # pass element dict for labels
-                        yaml_file=yaml_file,
-                        parent_args_var=parent_args_var,
-                        controlset_verbatim=controlset_verbatim
-                    ))
-
-                elif ((self.target_type == "pages" or self.target_type == "wizardpages")
-                      and "control" in item and isinstance(item["control"], dict)):
-
-                    md = item["control"]
-                    var = self.extract_member_variable(md, f"control '{identity}'", yaml_file)
-                    is_nested_group = bool(md.get('is_group', False)) or md.get('base_class') == 'Group'
-                    # Per-member verbatim (Placement: before addGroup/addControl)
-                    controlset_verbatim = self._extract_verbatim_body(md)
-                    if is_nested_group:
-                        self._dbg(f"'{group_name}': section '{identity}'.items[{item_idx}]: nested group "
-                                  f"'{var}' (class={md.get('class')!r})")
-                        creation_code.extend(self._generate_single_group(
-                            member_name=var,
-                            member_def=md,
-                            control_name=identity,
-                            tool_tip=tool_tip,
-                            all_elements=element,  # pass element dict for labels (if nested in group later)
-                            yaml_file=yaml_file,
-                            parent_args_var=parent_args_var,
-                            controlset_verbatim=controlset_verbatim
-                        ))
-                    else:
-                        # A plain leaf control placed directly on a Page/WizardPage (not
-                        # wrapped in a Group) - needs the full control-generation path so
-                        # its label/validator/tooltip/dbInfo are actually wired up.
-                        self._dbg(f"'{group_name}': section '{identity}'.items[{item_idx}]: control "
-                                  f"'{var}' (class={md.get('class')!r})")
-                        creation_code.extend(self._generate_single_control(
-                            member_name=var,
-                            member_def=md,
-                            control_name=identity,
-                            tool_tip=tool_tip,
-                            all_elements=element,  # pass element dict for labels
-                            yaml_file=yaml_file,
-                            parent_args_var=parent_args_var,
-                            controlset_verbatim=controlset_verbatim
-                        ))
+                # One item's labels at a time, so section.placed keeps them in YAML order among
+                # the controls and spacers; section.labels is the same list either way.
+                item_labels = self._build_labels(section, [item])
+                section.labels.extend(item_labels)
+                section.placed.extend(item_labels)
+
+                if "control" in item and isinstance(item["control"], dict):
+                    ctl = self._build_control_ir(item["control"], identity, yaml_file)
+                    self._dbg(f"'{group_name}': section '{identity}'.items[{item_idx}]: "
+                              f"{'nested group' if ctl.nested_group else 'control'} "
+                              f"'{ctl.var}' (class={ctl.md.get('class')!r})")
+                    section.items.append(ctl)
+                    section.placed.append(ctl)
+                    ir.controls.append(ctl)
 
                 # Spacers carry no C++ object - just placement, resolved at runtime by
                 # Interface::loadLayout. Only validate the schema and (optionally) trace it.
-                elif "spacer" in item and isinstance(item["spacer"], dict):
-                    self._dbg(f"'{group_name}': section '{identity}'.items[{item_idx}]: spacer")
-                    spacer_def = item["spacer"]
-                    self._warn_unknown_keys(spacer_def, {"sizer"}, f"spacer '{identity}'", yaml_file)
-                    if self.sizer_info and spacer_def.get('sizer'):
-                        sp = self.extract_sizer(spacer_def['sizer'])
-                        creation_code.append(
-                            f'      // Spacer: Position: {sp.position}, Border: {sp.border}')
-
-                elif "expanding_spacer" in item and isinstance(item["expanding_spacer"], dict):
-                    self._dbg(f"'{group_name}': section '{identity}'.items[{item_idx}]: expanding_spacer")
-                    spacer_def = item["expanding_spacer"]
-                    self._warn_unknown_keys(spacer_def, {"sizer"}, f"expanding_spacer '{identity}'", yaml_file)
-                    if self.sizer_info and spacer_def.get('sizer'):
-                        sp = self.extract_sizer(spacer_def['sizer'])
-                        creation_code.append(
-                            f'      // Expanding spacer: Position: {sp.position}, Proportion: {sp.proportion}')
+                elif "spacer" in item and isinstance(item["spacer"], dict) or \
+                        "expanding_spacer" in item and isinstance(item["expanding_spacer"], dict):
+                    kind = "spacer" if "spacer" in item and isinstance(item["spacer"], dict) else "expanding_spacer"
+                    self._dbg(f"'{group_name}': section '{identity}'.items[{item_idx}]: {kind}")
+                    section.items.append(SpacerIR(kind=kind, sizer=item[kind].get('sizer')))
+                    section.placed.append(section.items[-1])
 
                 else:
-                    # No 'control'/'spacer'/'expanding_spacer' key this target_type
-                    # recognizes here (e.g. a label-only item - those are picked up
-                    # separately via _generate_labels()). Not an error, but silent
-                    # unless traced.
+                    # No 'control'/'spacer'/'expanding_spacer' key recognized here (e.g. a
+                    # label-only item - those are gathered into section.labels above). Not an
+                    # error, but silent unless traced.
                     self._dbg(f"'{group_name}': section '{identity}'.items[{item_idx}]: no control/spacer "
                               f"recognized for target_type '{self.target_type}' (keys: {list(item.keys())}) "
                               f"- contributes no creation code here")
 
+        self._dbg(f"build_class_ir('{group_name}'): {len(ir.sections)} section(s), {len(ir.controls)} control(s)")
+        return ir
+
+    def _build_control_ir(self, md: Dict[str, Any], identity: str, yaml_file: Path) -> ControlIR:
+        var = self.extract_member_variable(md, f"control '{identity}'", yaml_file)
+        if "class_args" in md:
+            raise ValueError(
+                f"control '{var}': 'class_args' is not valid inside a control: block "
+                f"(class_args is class-scope only -- page/group/wizardpage/wizard/book); "
+                f"did you mean 'args'? {yaml_file}")
+        name = var or identity
+        nested_group = (self.target_type in ("pages", "wizardpages")
+                        and (bool(md.get('is_group', False)) or md.get('base_class') == 'Group'))
+        control_class, base_class = self.extract_control_class(name, md, yaml_file)
+        alt_ds = self.extract_alt_data_source(name, md, yaml_file)
+        # Only a leaf control (or a DBSource template argument) ever uses 'contains:'.
+        data_type = self.extract_data_type(name, md, yaml_file) \
+            if alt_ds is not None or not nested_group else md.get('contains')
+
+        # The C++ type used for the member declaration and construction: control_class,
+        # unless 'alt_data_source:' is present, in which case it's synthesized as
+        # '{base_class}<{data_type}, {Tag}DBSource>' -- any explicit 'class:' override is
+        # ignored (warned) since a generated DBSource struct can only be attached to the
+        # template itself, not a hand-written subclass.
+        tag = None
+        cpp_type = control_class
+        if alt_ds is not None:
+            if md.get('class'):
+                print(f"Warning: '{name}': 'class' override ignored because 'alt_data_source' "
+                      f"is set {yaml_file}", file=sys.stderr)
+            tag = self.extract_member_tag(md, name, yaml_file)
+            cpp_type = f"{base_class}<{data_type}, {self.dbsource_prefix}{tag}DBSource>"
+
+        cflags_list, cflags, is_group = self.extract_uicreate_flags(name, md, yaml_file)
+
+        modules: List[str] = []
+        module_prop = md.get('module')
+        if isinstance(module_prop, str) and module_prop.strip():
+            modules.append(module_prop.strip())
+        elif isinstance(module_prop, list):
+            modules.extend(m.strip() for m in module_prop if isinstance(m, str) and m.strip())
+
+        validator = md.get('validator', {})
+
+        # A nested group is created through _generate_single_group(), which wires up
+        # neither handlers nor validators -- don't resolve (or warn about) its handlers.
+        handlers = [] if nested_group else [self._build_handler_ir(h) for h in md.get('handlers', [])]
+
+        return ControlIR(md=md, var=var, control_class=control_class, base_class=base_class,
+                         cpp_type=cpp_type, data_type=data_type, alt_data_source=alt_ds, tag=tag,
+                         cflags_list=cflags_list, cflags=cflags, is_group=is_group,
+                         nested_group=nested_group, modules=modules, validator=validator,
+                         handlers=handlers, verbatim=self._extract_verbatim_body(md))
+
+    @_profiled("elements")
+    def generate_control_creation(self, group_name: str, ir: ClassIR, layout_path: str, yaml_file: Path,
+                                  parent_args_var: Optional[str],
+                                  handler_table: Optional[Tuple[List[str], List[str], Dict[int, Tuple[int, int]]]] = None
+                                  ) -> Tuple[List[str], str]:
+        """Build creation code from the class IR's sections, in element/item order. handler_table
+           is plan_handler_table()'s result, if any: its table opens the creation code."""
+        creation_code: List[str] = []
+        target_parent: str = ""
+        handler_slices: Dict[int, Tuple[int, int]] = {}
+        if handler_table is not None:
+            creation_code.extend(handler_table[1])
+            handler_slices = handler_table[2]
+
+        for index, section in enumerate(ir.sections):
+            # Element-level verbatim (Placement: before this element's items)
+            if section.verbatim:
+                for line in section.verbatim.rstrip().splitlines():
+                    creation_code.append(f"      {line}")
+
+            if section.items is None:
+                continue
+
+            label_table = None
+            table_code = self._generate_label_table(section, f"section{index}Labels")
+            if table_code:
+                label_table = f"section{index}Labels"
+                creation_code.extend(table_code)
+
+            if self.target_type == "groups":
+                target_parent = "getSBSizer()->GetStaticBox();"
+            elif self.target_type == "pages":
+                target_parent = "getForm()"
+            elif self.target_type == "wizardpages":
+                target_parent = "this"
+            else:
+                target_parent = "pParent"
+
+            for item in section.items:
+                if isinstance(item, ControlIR):
+                    # Controls in groups; controls and nested groups in pages/wizardpages. A plain
+                    # leaf control placed directly on a Page/WizardPage (not wrapped in a Group)
+                    # needs the full control-generation path so its label/validator/tooltip/dbInfo
+                    # are actually wired up.
+                    if item.nested_group:
+                        creation_code.extend(self._generate_single_group(item, section, yaml_file, parent_args_var))
+                    else:
+                        creation_code.extend(self._generate_single_control(item, section, yaml_file, parent_args_var,
+                                                                           label_table, handler_slices.get(id(item))))
+
+                elif self.sizer_info and item.sizer:
+                    sp = self.extract_sizer(item.sizer)
+                    if item.kind == "spacer":
+                        creation_code.append(f'      // Spacer: Position: {sp.position}, Border: {sp.border}')
+                    else:
+                        creation_code.append(
+                            f'      // Expanding spacer: Position: {sp.position}, Proportion: {sp.proportion}')
+
         self._dbg(f"generate_control_creation('{group_name}'): {len(creation_code)} line(s) total, "
                   f"target_parent='{target_parent}'")
         return creation_code, target_parent
 
-    def _generate_single_control(self, member_name: str, member_def: Dict[str, Any],
-                                 control_name: str, tool_tip: str, all_elements: Dict[str, Any], yaml_file: Path,
-                                 parent_args_var: Optional[str],
-                                 controlset_verbatim: str = "") -> List[str]:
-        """Generate creation code for a single control (new list schema)."""
+    def _generate_single_control(self, ctl: ControlIR, section: SectionIR, yaml_file: Path,
+                                 parent_args_var: Optional[str], label_table: Optional[str] = None,
+                                 handler_slice: Optional[Tuple[int, int]] = None) -> List[str]:
+        """Generate creation code for a single control (new list schema). With label_table
+           (see _generate_label_table()) the section's labels are registered from that table
+           in a loop instead of spelled out on the control's chain; with handler_slice (first
+           entry, count of plan_handler_table()'s table) its handlers are bound from there."""
         code: List[str] = []
 
-        if "class_args" in member_def:
-            raise ValueError(
-                f"control '{member_name}': 'class_args' is not valid inside a control: block "
-                f"(class_args is class-scope only -- page/group/wizardpage/wizard/book); "
-                f"did you mean 'args'? {yaml_file}")
+        # Every local below stays nameable from a custom 'signature:' (see format_map(locals())).
+        member_name = ctl.var
+        member_def = ctl.md
+        control_name = section.identity
+        tool_tip = section.tool_tip
+        controlset_verbatim = ctl.verbatim
 
         # insert:/translate:/extract_before before allocation
         args_lines, local_args_var, extract_after = self._emit_item_args(member_def, parent_args_var, yaml_file,
@@ -1668,15 +2491,14 @@ class CppGenerator:
 
         code.extend(args_lines)
 
-        control_class, base_class = self.extract_control_class(member_name, member_def, yaml_file)
-        cpp_class = self.resolve_member_cpp_type(member_name, member_def, yaml_file)
+        control_class, base_class = ctl.control_class, ctl.base_class
+        cpp_class = ctl.cpp_type
         pos = self.extract_position(member_name, member_def, yaml_file)
         size = self.extract_size(member_name, member_def, control_class, yaml_file)
         style = self.extract_style(member_name, member_def, yaml_file)
-        data_type = self.extract_data_type(member_name, member_def, yaml_file)
+        data_type = ctl.data_type
         value, value_is_literal = self.extract_value(member_name, member_def, control_class, base_class, yaml_file)
-        cflags_list, cflags, is_group = self.extract_uicreate_flags(member_name, member_def, yaml_file)
-
+        cflags_list, cflags, is_group = ctl.cflags_list, ctl.cflags, ctl.is_group
         # Use 'key' for constructor-visible name (fallback to legacy name extractor)
         name = self.extract_member_tag(member_def, control_name, yaml_file)  # adapter you added
         #
@@ -1719,7 +2541,7 @@ class CppGenerator:
         xfer_required = member_def.get('transfer', True)
         xfer_method = "pushToCtrl()"
 
-        validator = member_def.get('validator', {})
+        validator = ctl.validator
         if validator:
             xfer_method = "transferToWindow()"
             validator_code = self._generate_validator(validator, member_name, member_def)
@@ -1727,23 +2549,39 @@ class CppGenerator:
                 code.append(f"         {member_accessor}{validator_code}")
                 member_accessor = '.'
 
-        # Labels from the element dict
-        label_code = self._generate_labels(all_elements, None)
-        if label_code:
-            label_code[0] = label_code[0].replace('.createLabel', f'{member_accessor}createLabel', 1)
-            member_accessor = '.'
-            code.extend(label_code)
+        # Labels from the section. From a table, the chain ends here and picks up again on
+        # the member after the loop, so every call still happens in the same order -- which
+        # takes a member: a control missing its 'variable:' keeps the chained calls.
+        chain_at = None
+        if label_table is not None and member_name:
+            chain_at = self._split_chain(code, chain_at, member_name,
+                                         f"      for (const auto &label : {label_table})",
+                                         f"         {member_name}->createLabel(UICreateFlags::Label, label.tag, "
+                                         f"label.value, label.size, label.flags);")
+            member_accessor = '->'
+        else:
+            label_code = self._generate_labels(section.labels)
+            if label_code:
+                label_code[0] = label_code[0].replace('.createLabel', f'{member_accessor}createLabel', 1)
+                member_accessor = '.'
+                code.extend(label_code)
 
         if tool_tip:
             code.append(f"         {member_accessor}setToolTip(\"{tool_tip}\")")
             member_accessor = '.'
 
-        handlers = member_def.get('handlers', [])
-        for handler in handlers:
-            handler_code = self._generate_event_handler(handler, member_name, member_def)
-            if handler_code:
-                code.append(f"         {member_accessor}{handler_code}")
-                member_accessor = '.'
+        if handler_slice is not None:
+            first, count = handler_slice
+            chain_at = self._split_chain(code, chain_at, member_name,
+                                         f"      bindHandlers({member_name}, handlerTable + {first}, "
+                                         f"handlerTable + {first + count});")
+            member_accessor = '->'
+        else:
+            for handler in ctl.handlers:
+                handler_code = self._generate_event_handler(handler)
+                if handler_code:
+                    code.append(f"         {member_accessor}{handler_code}")
+                    member_accessor = '.'
 
         if style != '0' and signature.find('style') == -1:
             code.append(f"         {member_accessor}setWindowStyleFlags({style})")
@@ -1758,16 +2596,11 @@ class CppGenerator:
             code.append(f"         {member_accessor}{xfer_method}")
             member_accessor = '.'
 
-        # terminate allocation line
-        potential_last_line: str = ''
-        linx: int = -1
-        while abs(linx) < len(code):
-            potential_last_line = code[linx].strip()
-            if not potential_last_line.startswith('//'):
-                break
-            linx -= 1
-
-        code[linx] = code[linx] + ";"
+        # terminate allocation line (or drop the continuation nothing was chained onto)
+        if chain_at is not None and len(code) == chain_at + 1:
+            del code[chain_at]
+        else:
+            self._terminate_chain(code)
 
         # Placement: per-member verbatim before addControl
         if controlset_verbatim:
@@ -1776,8 +2609,14 @@ class CppGenerator:
 
         # alt_data_source: auto-call the generic DB-backed loadFromDB() right where a
         # hand-written 'verbatim: body: member->loadFromDB();' would otherwise go.
-        if self.extract_alt_data_source(member_name, member_def, yaml_file) is not None:
-            code.append(f"      {member_name}->loadFromDB();")
+        if ctl.alt_data_source is not None:
+            lookup = self.lookup_key(ctl.alt_data_source)
+            if lookup in self._shared_lookups:
+                table, value_field, display_field = lookup
+                code.append(f'      {member_name}->loadFromDB(m_lookupCache.rows("{table}", "{value_field}", '
+                            f'"{display_field}"));')
+            else:
+                code.append(f"      {member_name}->loadFromDB();")
 
         # add to map
         if is_group:
@@ -1793,38 +2632,36 @@ class CppGenerator:
                 lit = self._resolve_default_literal(default, ty, yaml_file,
                                                     f"control '{member_name}'.extract_after.'{entry_name}'")
                 prefix = "" if no_auto else "auto "
-                code.append(f'      {prefix}{var_name} = param({map_name}, "{entry_name}", {lit});')
+                code.append(f'      {prefix}{var_name} = param({map_name}, {self._param_key(entry_name)}, {lit});')
 
         code.append("")
 
         return code
 
-    def _generate_single_group(self, member_name: str, member_def: Dict[str, Any],
-                               control_name: str, tool_tip: str, all_elements: Dict[str, Any], yaml_file: Path,
-                               parent_args_var: Optional[str],
-                               controlset_verbatim: str = "") -> List[str]:
+    def _generate_single_group(self, ctl: ControlIR, section: SectionIR, yaml_file: Path,
+                               parent_args_var: Optional[str]) -> List[str]:
         """Generate creation code for a single nested control (used when target is Page/WizardPage)."""
         code: List[str] = []
 
-        if "class_args" in member_def:
-            raise ValueError(
-                f"control '{member_name}': 'class_args' is not valid inside a control: block "
-                f"(class_args is class-scope only -- page/group/wizardpage/wizard/book); "
-                f"did you mean 'args'? {yaml_file}")
+        # Every local below stays nameable from a custom 'signature:' (see format_map(locals())).
+        member_name = ctl.var
+        member_def = ctl.md
+        control_name = section.identity
+        tool_tip = section.tool_tip
+        controlset_verbatim = ctl.verbatim
 
         # insert:/translate:/extract_before before allocation
         args_lines, local_args_var, extract_after = self._emit_item_args(member_def, parent_args_var, yaml_file,
                                                                          f"control '{member_name}'")
         code.extend(args_lines)
 
-        control_class, base_class = self.extract_control_class(member_name, member_def, yaml_file)
+        control_class, base_class = ctl.control_class, ctl.base_class
         cpp_class = control_class
         pos = self.extract_position(member_name, member_def, yaml_file)
         size = self.extract_size(member_name, member_def, control_class, yaml_file)
         style = self.extract_style(member_name, member_def, yaml_file)
         value, value_is_literal = self.extract_value(member_name, member_def, control_class, base_class, yaml_file)
-        cflags_list, cflags, is_group = self.extract_uicreate_flags(member_name, member_def, yaml_file)
-
+        cflags_list, cflags, is_group = ctl.cflags_list, ctl.cflags, ctl.is_group
         name = self.extract_member_tag(member_def, control_name, yaml_file)
         # parent: str = "getForm()"
         # if self.target_class == "Page":
@@ -1863,228 +2700,19 @@ class CppGenerator:
                 lit = self._resolve_default_literal(default, ty, yaml_file,
                                                     f"control '{member_name}'.extract_after.'{entry_name}'")
                 prefix = "" if no_auto else "auto "
-                code.append(f'      {prefix}{var_name} = param({map_name}, "{entry_name}", {lit});')
+                code.append(f'      {prefix}{var_name} = param({map_name}, {self._param_key(entry_name)}, {lit});')
 
         code.append("")
         return code
 
-    def generate_control_declarations(self, elements: Any, yaml_file: Path) -> List[str]:
-        decls: List[str] = []
-        # elements is now a list
-        if not isinstance(elements, list):
-            return decls
-        for element in elements:
-            if not isinstance(element, dict):
-                continue
-            has_group = bool(element.get("has_group"))
-            has_control = bool(element.get("has_control"))
-            items = element.get("items", [])
-            if not isinstance(items, list):
-                continue
-            for item in items:
-                if not isinstance(item, dict):
-                    continue
-                if (
-                        self.target_type == "pages" or self.target_type == "wizardpages") and "control" in item and isinstance(
-                    item["control"], dict):
-                    md = item["control"]
-                    var = self.extract_member_variable(md, "control declaration", yaml_file)
-                    ctrl_class = self.resolve_member_cpp_type(var or "Group", md, yaml_file)
-                    decls.append(f"   {ctrl_class}* {var} {{}};")
-                elif self.target_type == "groups" and "control" in item and isinstance(item["control"], dict):
-                    md = item["control"]
-                    var = self.extract_member_variable(md, "control declaration", yaml_file)
-                    ctrl_class = self.resolve_member_cpp_type(var or "Ctrl", md, yaml_file)
-                    decls.append(f"   {ctrl_class}* {var} {{}};")
-        return decls
-
-    # -------- helpers for debugging unknown keys --------
-    def _warn_unknown_keys(self, obj: Any, allowed: set[str], context: str, yamlfile: Path) -> None:
-        if isinstance(obj, dict):
-            unknown = [k for k in obj.keys() if k not in allowed]
-            if unknown:
-                print(f"Warning: unknown keys {unknown} in {context} {yamlfile}", file=sys.stderr)
+    @_profiled("elements")
+    def generate_control_declarations(self, ir: ClassIR, yaml_file: Path) -> List[str]:
+        return [f"   {ctl.cpp_type}* {ctl.var} {{}};" for ctl in ir.controls]
 
-    def _allowed_sets(self):
-
-        return {
-            "root": {
-                "verbatim",
-            },
-            "class_def": {
-                "class_args",
-                "base_class",
-                "class",
-                "class_name",
-                "container",
-                "elements",
-                "export_module",
-                "finally",
-                "functions",
-                "layout",
-                "module",
-                "modules",
-                "on_event",
-                "on_kill_active",
-                "on_set_active",
-                "pages",
-                "pos",
-                "recordset",
-                "run_generator",
-                "size",
-                "sizer",
-                "style",
-                "title",
-                "value",
-                "variables",
-                "verbatim",
-            },
-            "sizer_def": {
-                "border",
-                "col_widths",
-                "cols",
-                "growable_cols",
-                "growable_rows",
-                "hgap",
-                "kind",
-                "position",
-                "proportion",
-                "row_heights",
-                "rows",
-                "span",
-                "vgap",
-            },
-            "sizer_kinds": {
-                "flex",
-                "grid",
-            },
-            "class_args_def": {                  # page / group / wizardpage / book(container:true)
-                "arg_name",
-                "args_in",
-                "extract_inside",
-            },
-            "wizard_class_args_def": {           # wizard: only -- reduced scope, no extraction
-                "arg_name",
-                "args_in",
-            },
-            "args_def": {                # nested inside control: only
-                "arg_name",
-                "insert",
-                "translate",
-                "extract_before",
-                "extract_after",
-            },
-            "recordset_def": {
-                "table",
-                "order_by",
-                "allow_add"
-            },
-            "alt_data_source_def": {
-                "blank_text",
-                "display_field",
-                "include_blank",
-                "table",
-                "value_field",
-            },
-            "elements_root": {
-                "verbatim",
-            },
-            "control_set": {
-                "section",
-                "items",
-                "size",
-                "sizer",
-                "tool_tip",
-                "verbatim",
-            },
-            "item_entry": {
-                "labels",
-                "control",
-                "spacer",
-                "expanding_spacer",
-            },
-            "control_member_def": {
-                "alt_data_source",
-                "args",
-                "base_class",
-                "class",
-                "contains",
-                "default",
-                "field",
-                "handlers",
-                "is_group",
-                "module",
-                "name",
-                "pos",
-                "signature",
-                "size",
-                "sizer",
-                "style",
-                "table",
-                "uicreateflags",
-                "validator",
-                "value",
-            },
-            "label_entry": {
-                "class",
-                "key",
-                "pos",
-                "size",
-                "sizer",
-                "style",
-                "name",
-                "value",
-            },
-            "handler_entry": {
-                "event",
-                "handler",
-            },
-            "validator_def": {
-                "allow_empty",
-                "class",
-                "tool_tip",
-                "transfer_model",
-            },
-            "variable_def": {
-                "access",
-                "default",
-                "include",
-                "module",
-                "type",
-            },
-            "wizard_def": {
-                "class_args",
-                "cancel_message",
-                "class",
-                "finally",
-                "module",
-                "modules",
-                "pages",
-                "run_generator",
-            },
-            "wizard_page_entry": {
-                "args",
-                "class",
-                "header",
-                "if",
-                "module",
-                "name",
-                "uicreateflags",
-            },
-            "book_page_entry": {
-                "args",
-                "class",
-                "module",
-                "name",
-                "type",
-            },
-            "conditional_value": {
-                "condition",
-                "anymap",
-                "if_true",
-                "if_false",
-            },
-        }
+    # -------- schema validation (see YamlSchema) --------
+    @_profiled("validate")
+    def validate(self, data: Any, yaml_file: Path) -> List[str]:
+        return _schema.validate(data, yaml_file)
 
     # ---------------- verbatim extraction helpers ----------------
     def _extract_verbatim_body(self, node: Any) -> str:
@@ -2179,69 +2807,134 @@ class CppGenerator:
         components = snake_str.split('_')
         return components[0] + ''.join(word.capitalize() for word in components[1:])
 
-    def get_required_imports(self, elements: list[Any], yaml_file: Path) -> List[str]:
+    @_profiled("elements")
+    def get_required_imports(self, ir: ClassIR, yaml_file: Path) -> List[str]:
         """Generate the list of required imports based on elements used (list-based schema)."""
-        used_modules: set[str] = set()
+        used_modules: set[str] = set(self.DEFAULT_IMPORTS.get(self.target_type, ()))
+
+        for ctl in ir.controls:
+            used_modules.update(ctl.modules)
+            # alt_data_source: control-level DB source for loadFromDB(), backed by
+            # the generic db::Row (DB.RowSet) -- no per-table module to add.
+            if ctl.alt_data_source is not None:
+                used_modules.add("DB.RowSet")
+            # validator modules
+            if isinstance(ctl.validator, dict):
+                vclass = ctl.validator.get('class', '')
+                if vclass in self.validator_to_module:
+                    used_modules.add(self.validator_to_module[vclass])
+
+        return sorted(used_modules)
 
+    def default_imports_needed(self, ir: ClassIR, recordset: Optional[Dict[str, Any]], overrides: bool,
+                               event_override: bool, class_args: bool, book_children: bool,
+                               lookup_cache: bool) -> set[str]:
+        """The DEFAULT_IMPORTS modules a class's generated code names, from what the class is
+           made of: its base, its controls and labels, their validators and table/field
+           bindings, its recordset, the Interface overrides it declares (overrides;
+           event_override for onEvent), class_args (merged into Interface's creation args),
+           book children and --shared-lookups' m_lookupCache. Control module:s, validator modules and
+           alt_data_source's DB.RowSet are not defaults, and get_required_imports() always
+           adds them."""
+        # Every constructor takes an anymap, every module declares PageType.
+        needed = {"DDT", "Page", "wxTypes"}
         if self.target_type == "groups":
-            used_modules.update(
-                ['Ctrl', 'Database', 'DDT', 'RecordSetInterface', 'Interface', 'Group', 'StringUtil', 'Validator', 'wxTypes', 'wxUtil',
-                 'Page'])
-        elif self.target_type == "pages":
-            used_modules.update(
-                ['Ctrl', 'Database', 'DDT', 'RecordSetInterface', 'Interface', 'Group', 'Page', 'StringUtil', 'wxTypes', 'wxUtil'])
+            needed.update(("Group", "Ctrl"))       # the base class, getSBSizer(); UICreateFlags cflags
         elif self.target_type == "wizardpages":
-            used_modules.update(
-                ['Ctrl', 'Database', 'DDT', 'RecordSetInterface', 'Interface', 'Group', 'WizardPage', 'StringUtil', 'wxTypes', 'wxUtil'])
-
-        if not isinstance(elements, list):
-            return sorted(used_modules)
+            needed.update(("WizardPage", "Ctrl"))  # UICreateFlags cflags
+        if ir.controls or any(section.labels for section in ir.sections):
+            needed.add("Ctrl")         # addControl(), createLabel(), UICreateFlags::...
+        if book_children:
+            needed.add("wxUtil")       # wx::nextID(), wx::getIcon()
+        if any(ctl.is_group or ctl.nested_group or ctl.base_class == "Group" for ctl in ir.controls):
+            needed.add("Group")
+        if any(ctl.validator and not ctl.nested_group for ctl in ir.controls):
+            needed.add("Validator")    # addValidator(new ...Validator(...))
+        if any(isinstance(ctl.md.get("table"), (str, list)) and ctl.md.get("field") for ctl in ir.controls):
+            needed.add("Database")     # dbInfo(db::TableName {...}, db::FieldName {...})
+        if recordset is not None:
+            needed.add("RecordSetInterface")   # refreshFromCurrent()/bindRecordFields(), ->where()
+            if self.collect_refresh_targets(ir, Path())[0]:
+                needed.add("wxUtil")   # wx::initFromField()
+            if recordset.get("allow_add") is False:
+                needed.add("Database")  # db::RequestResult
+        if overrides or class_args:
+            needed.add("Interface")
+        if event_override:
+            needed.update(("Interface", "RecordSetInterface"))    # onEvent(sig::RecordSetEvent)
+        if lookup_cache:
+            needed.update(("Interface", "RecordSetInterface", "Database"))  # db::LookupCache, onEvent()
+        return needed
+
+    @staticmethod
+    def _strings(value: Any) -> str:
+        """Every string in a parsed YAML value, keys included, one per line."""
+        if isinstance(value, str):
+            return value
+        if isinstance(value, dict):
+            return "\n".join(f"{key}\n{CppGenerator._strings(item)}" for key, item in value.items())
+        if isinstance(value, list):
+            return "\n".join(CppGenerator._strings(item) for item in value)
+        return ""
 
-        allow = self._allowed_sets()
+    def user_code_imports(self, user_code: str) -> set[str]:
+        """The DEFAULT_IMPORTS modules hand-written C++ could name: those whose
+           DEFAULT_IMPORT_USES names it mentions, and those whose names can't be told."""
+        if not user_code.strip():
+            return set()
+        return {module for module, uses in self.DEFAULT_IMPORT_USES.items()
+                if uses is None or uses.search(user_code)}
+
+    def prune_default_imports(self, imports: List[str], needed: set[str]) -> Tuple[List[str], List[str]]:
+        """Split imports into (kept, dropped): a DEFAULT_IMPORTS module is dropped unless it
+           is needed. Every other import was asked for by something the class contains and
+           is always kept."""
+        defaults = self.DEFAULT_IMPORTS.get(self.target_type, ())
+        kept, dropped = [], []
+        for module in imports:
+            (kept if module not in defaults or module in needed else dropped).append(module)
+        return kept, dropped
+
+    def prelude_exports(self, modules: Iterable[str]) -> List[str]:
+        """The PRELUDE_HEADERS names the given generated modules use, in catalogue order."""
+        names = [name for provided in self.PRELUDE_HEADERS.values() for name in provided]
+        used = set()
+        pattern = re.compile(r"\b(?:" + "|".join(map(re.escape, names)) + r")\b")
+        for text in modules:
+            used.update(pattern.findall(text))
+        return [name for name in names if name in used]
+
+    def prelude_module(self, modules: Iterable[str]) -> str:
+        """The --prelude module: PRELUDE_HEADERS parsed once, in its global fragment, and
+           the names of theirs the given generated modules use re-exported to them."""
+        code = ['module;', '//', '// Auto-generated by yaml2code.py -- the headers every generated module shares.',
+                '// This file will be overwritten.', '', '#include "Core/Core.h"']
+        code.extend(f'#include {header}' for header in self.PRELUDE_HEADERS)
+        code.extend(['', f'export module {self.prelude};', ''])
+        code.extend(f'export using ::{name};' for name in self.prelude_exports(modules))
+        code.append('')
+        return "\n".join(code)
 
-        for element in elements:
-            if not isinstance(element, dict):
+    def use_prelude(self, text: str) -> str:
+        """A generated module with the PRELUDE_HEADERS dropped from its global fragment and
+           `import <prelude>;` ahead of its other imports. A size token the prelude cannot
+           export (a YAML 'size:' naming one of its own) keeps Gfx/Sizes.h in that module."""
+        lines = text.split("\n")
+        at = next((i for i, line in enumerate(lines) if line.startswith("export module ")), None)
+        if at is None:
+            return text
+        moved = set(self.PRELUDE_HEADERS)
+        exported = set(self.PRELUDE_HEADERS['"Gfx/Sizes.h"'])
+        if any(name not in exported for name in re.findall(r"\bsize[A-Z]\w*", "\n".join(lines[at:]))):
+            moved.discard('"Gfx/Sizes.h"')
+        fragment: List[str] = []
+        for line in lines[:at]:
+            if line.startswith("#include ") and line[len("#include "):].strip() in moved:
                 continue
-            items = element.get('items', [])
-            if not isinstance(items, list):
+            if not line.strip() and fragment and not fragment[-1].strip():
                 continue
-
-            for item in items:
-                if not isinstance(item, dict):
-                    continue
-
-                control_map_key = "control"
-                if control_map_key in item and isinstance(item[control_map_key], dict):
-                    md = item[control_map_key]
-
-                    # modules
-                    module_prop = md.get('module')
-                    if isinstance(module_prop, str) and module_prop.strip():
-                        used_modules.add(module_prop.strip())
-                    elif isinstance(module_prop, list):
-                        for m in module_prop:
-                            if isinstance(m, str) and m.strip():
-                                used_modules.add(m.strip())
-
-                    # alt_data_source: control-level DB source for loadFromDB(), backed by
-                    # the generic db::Row (DB.RowSet) -- no per-table module to add.
-                    if control_map_key == "control":
-                        alt_ds = self.extract_alt_data_source(md.get('variable', ''), md, yaml_file)
-                        if alt_ds is not None:
-                            used_modules.add("DB.RowSet")
-
-                    # validator modules (controls only)
-                    if control_map_key == "control":
-                        validator = md.get('validator', {})
-                        if isinstance(validator, dict):
-                            self._warn_unknown_keys(validator, allow["validator_def"],
-                                                    f"validator for control '{md.get('variable', '')}' {{validator_def}}",
-                                                    yaml_file)
-                            vclass = validator.get('class', '')
-                            if vclass in self.validator_to_module:
-                                used_modules.add(self.validator_to_module[vclass])
-
-        return sorted(used_modules)
+            fragment.append(line)
+        return "\n".join(fragment + lines[at:at + 2] + [f"import {self.prelude};"] + lines[at + 2:])
 
     def extract_control_class(self, element_name: str, elements: Dict[str, Any], yaml_file: Path) -> Tuple[str, str]:
         """
@@ -2318,8 +3011,6 @@ class CppGenerator:
         if not isinstance(rs, dict):
             print(f"Error: '{element_name}': 'recordset' must be a mapping {yaml_file}", file=sys.stderr)
             return None
-        self._warn_unknown_keys(rs, self._allowed_sets()["recordset_def"],
-                                f"recordset for '{element_name}' {{recordset_def}}", yaml_file)
         tbl = rs.get('table')
         if not (tbl is None or (isinstance(tbl, str) and tbl.strip())):
             print(f"Error: '{element_name}': 'recordset' 'table' must be a non-empty string {yaml_file}",
@@ -2329,9 +3020,6 @@ class CppGenerator:
             print(f"Warning: '{element_name}': reloadTable() generation skipped (no 'table') {yaml_file}")
         order_by = rs.get('order_by', 'id')
         allow_add = rs.get('allow_add', True)
-        if not isinstance(allow_add, bool):
-            print(f"Error: '{element_name}': 'recordset' 'allow_add' must be a bool {yaml_file}", file=sys.stderr)
-            allow_add = True
         return {'table': tbl.strip() if isinstance(tbl, str) else None, 'order_by': order_by, 'allow_add': allow_add}
 
     def extract_alt_data_source(self, element_name: str, member_def: Dict[str, Any],
@@ -2345,8 +3033,6 @@ class CppGenerator:
             print(f"Error: control '{element_name}': 'alt_data_source' must be a mapping {yaml_file}",
                   file=sys.stderr)
             return None
-        self._warn_unknown_keys(ads, self._allowed_sets()["alt_data_source_def"],
-                                f"alt_data_source for control '{element_name}' {{alt_data_source_def}}", yaml_file)
         table = ads.get('table')
         display_field = ads.get('display_field')
         value_field = ads.get('value_field')
@@ -2361,104 +3047,64 @@ class CppGenerator:
         display_field = display_field.strip()
         value_field = value_field.strip()
         include_blank = ads.get('include_blank', True)
-        if not isinstance(include_blank, bool):
-            print(f"Warning: control '{element_name}': 'include_blank' must be a bool; "
-                  f"defaulting to true {yaml_file}", file=sys.stderr)
-            include_blank = True
         blank_text = ads.get('blank_text', '')
-        if not isinstance(blank_text, str):
-            print(f"Warning: control '{element_name}': 'blank_text' must be a string; "
-                  f"defaulting to '' {yaml_file}", file=sys.stderr)
-            blank_text = ''
         return {
             'table': table, 'display_field': display_field, 'value_field': value_field,
             'include_blank': include_blank, 'blank_text': blank_text,
         }
 
-    def resolve_member_cpp_type(self, default_name: str, member_def: Dict[str, Any], yaml_file: Path) -> str:
-        """Returns the C++ type used for a control's member declaration and construction.
-        Identical to extract_control_class()'s control_class unless 'alt_data_source:' is
-        present, in which case it's synthesized as '{base_class}<{data_type}, {Tag}DBSource>'
-        -- any explicit 'class:' override is ignored (warned) since a generated DBSource
-        struct can only be attached to the template itself, not a hand-written subclass."""
-        control_class, base_class = self.extract_control_class(default_name, member_def, yaml_file)
-        alt_ds = self.extract_alt_data_source(default_name, member_def, yaml_file)
-        if alt_ds is None:
-            return control_class
-        if member_def.get('class'):
-            print(f"Warning: '{default_name}': 'class' override ignored because 'alt_data_source' "
-                  f"is set {yaml_file}", file=sys.stderr)
-        data_type = self.extract_data_type(default_name, member_def, yaml_file)
-        tag = self.extract_member_tag(member_def, default_name, yaml_file)
-        return f"{base_class}<{data_type}, {tag}DBSource>"
-
-    def collect_alt_data_sources(self, elements: Any, yaml_file: Path) -> List[Tuple[str, str, Dict[str, Any], str]]:
-        """Walk elements (same shape as generate_control_declarations) and collect
-        (var, tag, alt_data_source, data_type) for every control with an 'alt_data_source:'
+    @_profiled("elements")
+    def collect_alt_data_sources(self, ir: ClassIR, yaml_file: Path) -> List[Tuple[str, str, Dict[str, Any], str]]:
+        """(var, tag, alt_data_source, data_type) for every control with an 'alt_data_source:'
         block, so generate_module can emit the corresponding DBSource policy structs
         before the class body."""
-        results: List[Tuple[str, str, Dict[str, Any], str]] = []
-        if not isinstance(elements, list):
-            return results
-        for element in elements:
-            if not isinstance(element, dict):
-                continue
-            items = element.get("items", [])
-            if not isinstance(items, list):
-                continue
-            for item in items:
-                if not isinstance(item, dict) or "control" not in item or not isinstance(item["control"], dict):
-                    continue
-                md = item["control"]
-                var = self.extract_member_variable(md, "alt_data_source scan", yaml_file)
-                if not var:
-                    continue
-                alt_ds = self.extract_alt_data_source(var, md, yaml_file)
-                if alt_ds is None:
-                    continue
-                tag = self.extract_member_tag(md, var, yaml_file)
-                data_type = self.extract_data_type(var, md, yaml_file)
-                results.append((var, tag, alt_ds, data_type))
-        return results
-
-    def collect_refresh_targets(self, elements: Any, yaml_file: Path) -> Tuple[List[Tuple[str, str, str]], List[str]]:
-        """Walk elements (same shape as generate_control_declarations) and collect
-        (bound_controls [(member, field, cpp_type)], group_members [member]) for
+        return [(ctl.var, ctl.tag, ctl.alt_data_source, ctl.data_type) for ctl in ir.controls
+                if ctl.var and ctl.alt_data_source is not None]
+
+    @staticmethod
+    def lookup_key(alt_ds: Dict[str, Any]) -> Tuple[str, str, str]:
+        return alt_ds["table"], alt_ds["value_field"], alt_ds["display_field"]
+
+    def plan_shared_lookups(self, ir: ClassIR) -> frozenset:
+        """--shared-lookups: the (table, value_field, display_field) lookups two or more of the
+           class's alt_data_source controls read. Those controls load from the class's
+           m_lookupCache -- one query per lookup per page build -- instead of each querying
+           for itself in loadFromDB(); include_blank/blank_text stay per control, in its
+           DBSource. A lookup only one control reads keeps the plain loadFromDB()."""
+        counts: Dict[Tuple[str, str, str], int] = {}
+        for ctl in ir.controls:
+            if ctl.var and ctl.alt_data_source is not None:
+                key = self.lookup_key(ctl.alt_data_source)
+                counts[key] = counts.get(key, 0) + 1
+        shared = frozenset(key for key, n in counts.items() if n > 1)
+        if shared:
+            self._dbg(f"plan_shared_lookups(): {len(shared)} shared lookup(s): {sorted(shared)}")
+        return shared
+
+    @_profiled("elements")
+    def collect_refresh_targets(self, ir: ClassIR, yaml_file: Path) -> Tuple[List[Tuple[str, str, str]], List[str]]:
+        """(bound_controls [(member, field, cpp_type)], group_members [member]) for
         refreshFromCurrent(). cpp_type is the control's 'contains:' type, used to read the
         field back out of a db::Row as rec->get<optional<cpp_type>>(field)."""
         bound_controls: List[Tuple[str, str, str]] = []
         group_members: List[str] = []
-        if not isinstance(elements, list):
-            return bound_controls, group_members
-        for element in elements:
-            if not isinstance(element, dict):
+        for ctl in ir.controls:
+            if not ctl.var:
                 continue
-            items = element.get("items", [])
-            if not isinstance(items, list):
+            if ctl.is_group or "Group" in ctl.cflags_list or ctl.md.get('base_class') == 'Group':
+                group_members.append(ctl.var)
                 continue
-            for item in items:
-                if not isinstance(item, dict) or "control" not in item or not isinstance(item["control"], dict):
-                    continue
-                md = item["control"]
-                var = self.extract_member_variable(md, "refresh target", yaml_file)
-                if not var:
-                    continue
-                cflags_list, _, is_group = self.extract_uicreate_flags(var, md, yaml_file)
-                if is_group or "Group" in cflags_list or md.get('base_class') == 'Group':
-                    group_members.append(var)
-                    continue
-                tbl = md.get('table')
-                fld = md.get('field')
-                if not (isinstance(tbl, str) and tbl.strip() and isinstance(fld, str) and fld.strip()):
-                    continue
-                control_class, _ = self.extract_control_class(var, md, yaml_file)
-                if control_class.split('<', 1)[0].strip() in self.multi_row_control_classes:
-                    # A multi-row control's "value" (if any) is a selection, not a field
-                    # value, and it shows the whole table rather than one row. Skip
-                    # initFromField()/where() for it - see multi_row_control_classes.
-                    continue
-                cpp_type = md.get('contains', 'std::string')
-                bound_controls.append((var, fld.strip(), cpp_type))
+            tbl = ctl.md.get('table')
+            fld = ctl.md.get('field')
+            if not (isinstance(tbl, str) and tbl.strip() and isinstance(fld, str) and fld.strip()):
+                continue
+            if ctl.control_class.split('<', 1)[0].strip() in self.multi_row_control_classes:
+                # A multi-row control's "value" (if any) is a selection, not a field
+                # value, and it shows the whole table rather than one row. Skip
+                # initFromField()/where() for it - see multi_row_control_classes.
+                continue
+            cpp_type = ctl.md.get('contains', 'std::string')
+            bound_controls.append((ctl.var, fld.strip(), cpp_type))
         return bound_controls, group_members
 
     def extract_export_module(self, element_name: str, elements: Dict[str, Any], control_name: str,
@@ -2596,7 +3242,6 @@ class CppGenerator:
             print(f"Warning: 'variables' must be a mapping; ignoring {yaml_file}", file=sys.stderr)
             return {}
 
-        allow = self._allowed_sets()
         result: Dict[str, Dict[str, Any]] = {}
         for var_name, var_def in raw.items():
             if not self._is_identifier(var_name):
@@ -2606,7 +3251,6 @@ class CppGenerator:
             if not isinstance(var_def, dict):
                 print(f"Warning: variables.'{var_name}' must be a mapping; skipping {yaml_file}", file=sys.stderr)
                 continue
-            self._warn_unknown_keys(var_def, allow["variable_def"], f"variables.'{var_name}'", yaml_file)
 
             cpp_type = var_def.get('type')
             if not isinstance(cpp_type, str) or not cpp_type.strip():
@@ -2715,11 +3359,6 @@ class CppGenerator:
         size_node = elements.get('size')
         ctx = f"'{element_name}'.size"
         if isinstance(size_node, dict) and 'condition' in size_node:
-            self._warn_unknown_keys(size_node, self._allowed_sets()["conditional_value"], ctx, yaml_file)
-            if "if_true" not in size_node or "if_false" not in size_node:
-                print(f"Warning: {ctx} conditional entry must have 'condition', 'if_true' and "
-                      f"'if_false' {yaml_file}", file=sys.stderr)
-                return size
             anymap_raw = size_node.get("anymap")
             anymap_name = anymap_raw.strip() if isinstance(anymap_raw, str) and anymap_raw.strip() else None
             cond_expr = self._resolve_condition_expr(size_node.get("condition"), anymap_name, yaml_file, ctx)
@@ -2789,6 +3428,98 @@ class CppGenerator:
 
         return layout
 
+    # --compiled-layouts: what a 'sizer:' mapping contributes to the item it sits on, and
+    # what makes it a sizer of its own (the rest of sizer_def).
+    _LAYOUT_PLACEMENT_KEYS = ("position", "span", "proportion", "border")
+    _LAYOUT_SIZER_LISTS = ("growable_rows", "growable_cols", "col_widths", "row_heights")
+
+    def compile_layout(self, cpp_class: str, layout_key: str, class_def: Dict[str, Any], ir: ClassIR,
+                       yaml_file: Path) -> Optional[List[str]]:
+        """The namespace-scope constexpr tables --compiled-layouts hands loadLayout() in place
+           of the layout resource: one layout::Item per placed thing -- the class, each
+           section, then its labels, controls and spacers in YAML order -- with its explicit
+           placement (-1 where the YAML leaves it to loadLayout), and one layout::Sizer per
+           'sizer:' that configures a grid, its list values pooled into one int array.
+
+           None (with a warning) when a value isn't a plain integer: that class keeps
+           loading its layout resource at runtime."""
+        ctx = f"'{layout_key}' sizer"
+        items: List[str] = []
+        sizers: List[str] = []
+        pool: List[int] = []
+
+        def integer(value: Any, what: str) -> int:
+            if isinstance(value, bool) or not isinstance(value, int):
+                raise ValueError(f"{ctx} '{what}' is not an integer ({value!r})")
+            return value
+
+        def pair(value: Any, what: str) -> Tuple[int, int]:
+            if not isinstance(value, list) or len(value) != 2:
+                raise ValueError(f"{ctx} '{what}' must be a [row, col] pair ({value!r})")
+            return integer(value[0], what), integer(value[1], what)
+
+        def add(kind: str, name: str, sizer: Any) -> None:
+            if sizer is not None and not isinstance(sizer, dict):
+                raise ValueError(f"{ctx} of '{name or kind}' is not a mapping")
+            sizer = sizer or {}
+            index = -1
+            if any(key not in self._LAYOUT_PLACEMENT_KEYS for key in sizer):
+                grid_kind = sizer.get("kind", "flex")
+                if grid_kind not in YamlSchema.KEYS["sizer_kinds"]:
+                    raise ValueError(f"{ctx} 'kind' must be one of {sorted(YamlSchema.KEYS['sizer_kinds'])} "
+                                     f"({grid_kind!r})")
+                slices = []
+                for key in self._LAYOUT_SIZER_LISTS:
+                    values = sizer.get(key, [])
+                    if not isinstance(values, list):
+                        raise ValueError(f"{ctx} '{key}' must be a list ({values!r})")
+                    slices.append(f"{{ {len(pool)}, {len(values)} }}")
+                    pool.extend(integer(v, key) for v in values)
+                index = len(sizers)
+                scalars = ", ".join(str(integer(sizer.get(key, -1), key)) for key in ("rows", "cols", "hgap", "vgap"))
+                sizers.append(f"   {{ layout::SizerKind::{grid_kind.capitalize()}, {scalars}, {', '.join(slices)} }},")
+            row, col = pair(sizer["position"], "position") if "position" in sizer else (-1, -1)
+            row_span, col_span = pair(sizer["span"], "span") if "span" in sizer else (-1, -1)
+            proportion = integer(sizer.get("proportion", -1), "proportion")
+            border = integer(sizer.get("border", -1), "border")
+            items.append(f'   {{ layout::ItemKind::{kind}, "{self._cpp_string_literal(name)}", {index}, '
+                         f'{row}, {col}, {row_span}, {col_span}, {proportion}, {border} }},')
+
+        try:
+            add("Class", layout_key, class_def.get("sizer"))
+            for section in ir.sections:
+                add("Section", section.identity, section.sizer)
+                for placed in section.placed:
+                    if isinstance(placed, SpacerIR):
+                        add("Spacer" if placed.kind == "spacer" else "ExpandingSpacer", "", placed.sizer)
+                    elif isinstance(placed, LabelIR):
+                        add("Label", placed.tag, placed.sizer)
+                    else:
+                        add("Control", placed.md.get("name") or placed.var or "", placed.md.get("sizer"))
+        except ValueError as e:
+            print(f"Warning: {e}; '{cpp_class}' keeps loading its layout resource at runtime {yaml_file}",
+                  file=sys.stderr)
+            return None
+
+        table = f"{cpp_class}Layout"
+        code = [f"// {layout_key}'s layout, compiled by yaml2code (--compiled-layouts): "
+                f"{{kind, name, sizer, row, col, rowSpan, colSpan, proportion, border}}."]
+        if pool:
+            code.append(f"constexpr int {table}Lists[] = {{ {', '.join(map(str, pool))} }};")
+        if sizers:
+            code.append("// {kind, rows, cols, hgap, vgap, growableRows, growableCols, colWidths, rowHeights}, "
+                        f"each list an {{offset, count}} into {table}Lists.")
+            code.append(f"constexpr layout::Sizer {table}Sizers[] = {{")
+            code.extend(sizers)
+            code.append("};")
+        code.append(f"constexpr layout::Item {table}Items[] = {{")
+        code.extend(items)
+        code.append("};")
+        code.append(f'constexpr layout::Table {table} {{ "{self._cpp_string_literal(layout_key)}", {table}Items, '
+                    f'{f"{table}Sizers" if sizers else "{}"}, {f"{table}Lists" if pool else "{}"} }};')
+        code.append("")
+        return code
+
     def _resolve_style_flag_list(self, items: List[Any], yaml_file: Path, ctx: str) -> str:
         """Resolve a YAML list of style entries -- bare flag names, integers, or nested
            {condition, if_true, if_false} mappings (each possibly OR-list-valued in turn)
@@ -2828,11 +3559,6 @@ class CppGenerator:
            flag names to OR together. Returns None if `raw` isn't such a mapping."""
         if not isinstance(raw, dict) or "condition" not in raw:
             return None
-        self._warn_unknown_keys(raw, self._allowed_sets()["conditional_value"], ctx, yaml_file)
-        if "if_true" not in raw or "if_false" not in raw:
-            print(f"Warning: {ctx} conditional value must have 'condition', 'if_true' and 'if_false' "
-                  f"{yaml_file}", file=sys.stderr)
-            return None
         anymap_raw = raw.get("anymap")
         anymap_name = anymap_raw.strip() if isinstance(anymap_raw, str) and anymap_raw.strip() else None
         cond_expr = self._resolve_condition_expr(raw.get("condition"), anymap_name, yaml_file, ctx)
@@ -2911,11 +3637,6 @@ class CppGenerator:
                 if isinstance(f, dict) and "condition" in f:
                     anymap_raw = f.get("anymap")
                     anymap_name = anymap_raw.strip() if isinstance(anymap_raw, str) and anymap_raw.strip() else None
-                    self._warn_unknown_keys(f, self._allowed_sets()["conditional_value"], ctx, yaml_file)
-                    if "if_true" not in f or "if_false" not in f:
-                        print(f"Warning: {ctx} conditional entry must have 'condition', 'if_true' and "
-                              f"'if_false' {yaml_file}", file=sys.stderr)
-                        continue
                     cond_expr = self._resolve_condition_expr(f.get("condition"), anymap_name, yaml_file, ctx)
                     true_expr = self._resolve_uicf_branch(f.get("if_true"), yaml_file, ctx)
                     false_expr = self._resolve_uicf_branch(f.get("if_false"), yaml_file, ctx)
@@ -2929,10 +3650,6 @@ class CppGenerator:
 
         # Extract is_group: if true, ensure Group flag is included
         is_group = elements.get('is_group', False)
-        if not isinstance(is_group, bool):
-            print(f"Warning: 'is_group' for '{element_name}' must be hs_bool {yaml_file}",
-                  file=sys.stderr)
-            is_group = False
 
         if is_group and "Group" not in cflags_list:
             cflags_list.append("Group")
@@ -3004,6 +3721,31 @@ class CppGenerator:
 
         return value, value_is_literal
 
+    @staticmethod
+    def class_args_table_helpers(factory: str, merge_helper: str, emplace_lines: List[str]) -> List[str]:
+        """--class-args-table: class_args' defaults as one immutable map per process instead of
+           a fresh anymap per call, so a construction never builds or copies a whole map of
+           them. factory() hands out the table by const reference: mergeWithCreationArgs()
+           reads it in place, and the ctor's args defaults to the empty nullanymap rather
+           than a copy. merge_helper() reads through it, copying a default into the caller's
+           map only for a key the caller left out -- the one copy each default still needs,
+           as args is what the base class, the children and param() read. The table is still
+           filled by sequential statements inside an immediately-invoked lambda, never one
+           brace-init list, so the Clang workaround noted in generate_ui_module() holds."""
+        return ([f"   static auto {factory}() -> const anymap & {{",
+                 "      static const anymap defaults = [] {",
+                 "         anymap m;"]
+                + [f"         {line.strip()}" for line in emplace_lines]
+                + ["         return m;",
+                   "      }();",
+                   "      return defaults;",
+                   "   }",
+                   f"   static auto {merge_helper}(anymap &a) -> anymap & {{",
+                   f"      for (const auto &[key, value] : {factory}())",
+                   "         a.try_emplace(key, value);",
+                   "      return a;",
+                   "   }"])
+
     def _emit_page_scope_args(self, page_key: str, page_def: Dict[str, Any], yaml_file: Path
                               ) -> Optional[Tuple[List[str], str, List[Tuple[str, str, bool, str, str, Any]]]]:
         """
@@ -3035,11 +3777,23 @@ class CppGenerator:
 
         return emplace_lines, arg_name, inside_entries
 
+    @_profiled("parse")
     def parse_yaml_file(self, yaml_file: Path) -> Dict[str, Any]:
-        """Parse the YAML file and return the group definitions."""
+        """Parse the YAML file and return the group definitions.
+
+           Goes through the yaml_backend loader, and -- with a parse_cache_dir -- through
+           ParseCache, so a file that has not changed since it was last parsed is unpickled
+           instead of being run through YAML at all."""
+        cache = ParseCache(self.parse_cache_dir) if self.parse_cache_dir is not None else None
+        if cache is not None:
+            hit, data = cache.load(yaml_file)
+            if hit:
+                return data
+
+        loader, _ = yaml_loader(self.yaml_backend)
         try:
-            with open(yaml_file, 'r', encoding='utf-8') as file:
-                return yaml.safe_load(file)
+            raw = Path(yaml_file).read_bytes()
+            data = yaml.load(raw.decode('utf-8'), Loader=loader)
         except yaml.YAMLError as e:
             # Try to provide more helpful error information
             if hasattr(e, 'problem_mark'):
@@ -3050,31 +3804,89 @@ class CppGenerator:
                     print(f"  Context: {e.context}", file=sys.stderr)
             raise ValueError(f"Invalid YAML format in {yaml_file}: {e}")
 
-    def _generate_event_handler(self, handler: Dict[str, Any], member_name: str, member_def: Dict[str, Any]) -> str:
-        """Generate event handler code."""
+        if cache is not None:
+            cache.store(yaml_file, raw, data)
+        return data
+
+    def _build_handler_ir(self, handler: Dict[str, Any]) -> HandlerIR:
         event = handler.get('event', 'EVT_TEXT')
-        type = handler.get('type', 'wxEvent')
+        event_type = handler.get('type', 'wxEvent')
         handler_code = handler.get('handler', 'event.Skip();')
+        source = str(handler_code)
 
         # Normalize handler code - handle both \n escapes and actual newlines
         if isinstance(handler_code, str):
             handler_code = handler_code.replace('\\n', '\n')
+            source = handler_code
             lines = [line.strip() for line in handler_code.split('\n')]
             handler_code = '\n         '.join(lines)
 
         # Support a single event or a list of events
         events = event if isinstance(event, (list, tuple)) else [event]
-        wx_events = [self._normalize_event_name(e) for e in events]
+        return HandlerIR(events=[self._normalize_event_name(e) for e in events], event_type=event_type,
+                         body=handler_code, source=source)
 
+    def _generate_event_handler(self, handler: HandlerIR) -> str:
+        """Generate event handler code."""
         # Generate one hook per event; caller decides whether to prefix with '->' or '.'
         hooks = [
-            f"hookAndHandle({wx_evt}, [this]({type} &event) {{\n            {handler_code}}})"
-            for wx_evt in wx_events
+            f"hookAndHandle({wx_evt}, [this]({handler.event_type} &event) {{\n            {handler.body}}})"
+            for wx_evt in handler.events
         ]
 
         # If multiple, chain them with leading '.' for subsequent hooks (the first will be prefixed by caller)
         return ("\n         .").join(hooks)
 
+    # --handler-tables: fewer hooks than this in a class aren't worth the table.
+    HANDLER_TABLE_MIN = 2
+
+    def plan_handler_table(self, cpp_class: str, ir: ClassIR) -> Optional[Tuple[List[str], List[str], Dict[int, Tuple[int, int]]]]:
+        """--handler-tables: every hook of the class's named leaf controls as one entry of a
+           function-local table -- (wx event type, member function) -- bound by a single
+           bindHandlers() loop, instead of one hookAndHandle() instantiation per handler lambda.
+           Each 'handlers:' body becomes a private member function taking wxEvent &, cast back
+           to its declared 'type:' on entry. Returns (class members, constructor table lines,
+           {id(control): (first entry, entry count)}), or None when the class has fewer than
+           HANDLER_TABLE_MIN such hooks; anonymous controls always keep their chained lambdas,
+           there being nothing to name them by once the chain ends."""
+        controls = [ctl for ctl in ir.controls if ctl.var and ctl.handlers and not ctl.nested_group]
+        if sum(len(handler.events) for ctl in controls for handler in ctl.handlers) < self.HANDLER_TABLE_MIN:
+            return None
+
+        members = ["   // 'handlers:' entries, bound from the constructor's handlerTable (see bindHandlers())",
+                   f"   struct HandlerBinding {{ wxEventType event; void ({cpp_class}::*handler)(wxEvent &); }};",
+                   "",
+                   "   template <typename Control>",
+                   "   auto bindHandlers(Control *control, const HandlerBinding *first, const HandlerBinding *last) -> void {",
+                   "      for (; first != last; ++first)",
+                   "         control->hookAndHandle(first->event, "
+                   "[this, handler = first->handler](wxEvent &event) { (this->*handler)(event); });",
+                   "   }"]
+        table = [f"      static const HandlerBinding handlerTable[] = {{"]
+        slices: Dict[int, Tuple[int, int]] = {}
+        count = 0
+        for ctl in controls:
+            first = len(table) - 1
+            for handler in ctl.handlers:
+                method = f"handler{count}"
+                count += 1
+                members.append("")
+                if handler.event_type == "wxEvent":
+                    members.append(f"   auto {method}(wxEvent &event) -> void {{")
+                else:
+                    members.append(f"   auto {method}(wxEvent &base) -> void {{")
+                    members.append(f"      auto &event = static_cast<{handler.event_type} &>(base);")
+                # Re-indented as a block, not line by line: relative indentation -- and the
+                # contents of a multi-line raw string literal -- stay as written.
+                members.append(textwrap.indent(textwrap.dedent(handler.source).strip('\n'), "      "))
+                members.append("   }")
+                table.extend(f"         {{ {wx_evt}, &{cpp_class}::{method} }},  // {ctl.var}" for wx_evt in handler.events)
+            slices[id(ctl)] = (first, len(table) - 1 - first)
+        table.append("      };")
+        table.append("")
+        self._dbg(f"plan_handler_table('{cpp_class}'): {len(table) - 3} binding(s) for {len(controls)} control(s)")
+        return members, table, slices
+
     def _emit_item_args(self, member_def: Dict[str, Any], parent_args_var: Optional[str], yaml_file: Path,
                         ctx: str) -> tuple[list[str], Optional[str], list[tuple[str, str, bool, str, str, Any]]]:
         """If the item has an args: block, generate local anymap lines -- first insert:
@@ -3126,7 +3938,7 @@ class CppGenerator:
                     for n, ty, src_map, src_key, default in translate:
                         lit = self._resolve_default_literal(default, ty, yaml_file, f"{ctx}.args.translate.'{n}'",
                                                              string_style="literal")
-                        lines.append(f'      add_to_anymap({local_name}["{n}"], param<{ty}>({src_map}, "{src_key}", {lit}));')
+                        lines.append(f'      add_to_anymap({local_name}["{n}"], param<{ty}>({src_map}, {self._param_key(src_key)}, {lit}));')
             elif arg_name:
                 print(f"Warning: {ctx}.args 'arg_name' is set but there are no insert/translate "
                       f"entries; ignoring it {yaml_file}", file=sys.stderr)
@@ -3136,7 +3948,7 @@ class CppGenerator:
             for var_name, ty, no_auto, map_name, entry_name, default in extracts.get("before", []):
                 lit = self._resolve_default_literal(default, ty, yaml_file, f"{ctx}.extract_before.'{entry_name}'")
                 prefix = "" if no_auto else "auto "
-                lines.append(f'      {prefix}{var_name} = param({map_name}, "{entry_name}", {lit});')
+                lines.append(f'      {prefix}{var_name} = param({map_name}, {self._param_key(entry_name)}, {lit});')
 
         return lines, local_name, extract_after
 
@@ -3201,40 +4013,14 @@ class CppGenerator:
             # All other types/controls: ignore transfer_model, keep original 2-arg form
             return f"addValidator(new {validator_class}({str(allow_empty).lower()}, {member_name}->liveAddr()))"
 
-    def _generate_labels(self, control_identity_or_element: Any, all_elements: Any) -> List[str]:
-        """Generate label creation code for the new list-based schema.
-           Accepts either:
-             - control_identity_or_element: identity string, with all_elements as the full elements list, or
-             - control_identity_or_element: the single element dict for this control (recommended), all_elements unused.
-        """
-        code: List[str] = []
-
-        # Resolve element dict
-        element = None
-        if isinstance(control_identity_or_element, dict):
-            element = control_identity_or_element
-        elif isinstance(control_identity_or_element, str) and isinstance(all_elements, list):
-            ident = control_identity_or_element
-            for el in all_elements:
-                if isinstance(el, dict) and (el.get("section") == ident or el.get("Section") == ident):
-                    element = el
-                    break
-
-        if not isinstance(element, dict):
-            self._dbg("_generate_labels: no element dict resolved (identity not found, or bad arg) - "
-                      "DROPPED, no labels generated")
-            return code
-
-        items = element.get('items', [])
-        if not isinstance(items, list):
-            self._dbg(f"_generate_labels: section '{element.get('section') or element.get('Section')}' "
-                      f"'items' is a {type(items).__name__}, not a list - DROPPED")
-            return code
-
+    def _build_labels(self, section: SectionIR, items: List[Any]) -> List[LabelIR]:
+        """Resolve a section's 'labels:' items (list-based schema) into LabelIRs, once per
+           section -- every control in the section registers the same labels."""
+        labels: List[LabelIR] = []
         for item in items:
             if not isinstance(item, dict) or 'labels' not in item:
                 continue
-            self._dbg(f"_generate_labels: section '{element.get('section') or element.get('Section')}': "
+            self._dbg(f"_build_labels: section '{section.identity}': "
                       f"found 'labels' item with {len(item['labels']) if isinstance(item['labels'], list) else 0} entr(y/ies)")
 
             labels_seq = item['labels']
@@ -3252,9 +4038,6 @@ class CppGenerator:
                 if not isinstance(label_tag, str) or not label_tag:
                     label_tag = label_key
 
-                if not isinstance(label_tag, str) or not label_tag:
-                    label_tag = label_key
-
                 label_value = entry.get('value', "")
 
                 flags = entry.get('style', [])
@@ -3279,24 +4062,79 @@ class CppGenerator:
 
                 # Size added by adding extra default parameter to createLabel GH 21/7/2026
 
+                quoted = True
                 if isinstance(label_value, list):
                     # A label 'value:' given as a one-item list (e.g. `value: [ GT ]`) names a
                     # variable/expression to emit unquoted, rather than a literal string.
                     label_value = str(label_value[0]).strip()
-                    Q = ''
-                else:
-                    Q = '"'
+                    quoted = False
+
+                labels.append(LabelIR(tag=label_tag, value=label_value, quoted=quoted, size=size_str,
+                                      flags=flags_str, sizer=entry.get('sizer')))
+
+        return labels
 
+    @staticmethod
+    def _terminate_chain(code: List[str]) -> None:
+        """End the statement on the last line of code that isn't a // comment."""
+        linx: int = -1
+        while abs(linx) < len(code):
+            if not code[linx].strip().startswith('//'):
+                break
+            linx -= 1
+        code[linx] = code[linx] + ";"
+
+    def _split_chain(self, code: List[str], chain_at: Optional[int], member_name: str, *statements: str) -> int:
+        """End the control's creation chain, emit statements, and continue the chain on the
+           member; returns the continuation line's index. A continuation nothing was chained
+           onto yet (chain_at, from an earlier split) is dropped rather than terminated."""
+        if chain_at is not None and len(code) == chain_at + 1:
+            del code[chain_at]
+        else:
+            self._terminate_chain(code)
+        code.extend(statements)
+        code.append(f"      {member_name}")
+        return len(code) - 1
+
+    def _generate_label_table(self, section: SectionIR, table: str) -> List[str]:
+        """A section's labels as one local table, for every control of the section to register
+           in a loop -- instead of each control's chain repeating every createLabel() call,
+           which grows with controls x labels. Only worth it (and only used) for two or more
+           controls; a label whose value is an expression ('value: [ expr ]') keeps the
+           per-control chain, its type being unknown here. The table is a plain (non-static)
+           local: a label's size and flags are C++ expressions that may read members or
+           arguments, so they are evaluated on every construction, as the chain did. Only
+           controls with a member ('variable:') loop over it; the others keep their chains."""
+        controls = sum(1 for item in section.items
+                       if isinstance(item, ControlIR) and not item.nested_group and item.var)
+        if controls < 2 or not section.labels or not all(label.quoted for label in section.labels):
+            return []
+        code = [f"      // Section '{section.identity}' labels, registered on each of its {controls} controls",
+                "      const struct { const char *tag; const char *value; wxSize size; long flags; } "
+                f"{table}[] = {{"]
+        for label in section.labels:
+            code.append(f'         {{ "{label.tag}", "{label.value}", {label.size}, {label.flags} }},')
+            if self.sizer_info and label.sizer:
+                sizer_properties: CppGenerator.SizerProperties = self.extract_sizer(label.sizer)
                 code.append(
-                    f"         .createLabel(UICreateFlags::Label, \"{label_tag}\", {Q}{label_value}{Q}, {size_str}, {flags_str})")
+                    f'         // Sizer information: Position: {sizer_properties.position}, Proportion: {sizer_properties.proportion}, Border: {sizer_properties.border}, Flags: {sizer_properties.flag}')
+        code.append("      };")
+        return code
 
-                if self.sizer_info:
-                    # Get sizer information
-                    sizer_def = entry.get('sizer')
-                    if sizer_def:
-                        sizer_properties: CppGenerator.SizerProperties = self.extract_sizer(sizer_def)
-                        code.append(
-                            f'         // Sizer information: Position: {sizer_properties.position}, Proportion: {sizer_properties.proportion}, Border: {sizer_properties.border}, Flags: {sizer_properties.flag}')
+    def _generate_labels(self, labels: List[LabelIR]) -> List[str]:
+        """Generate the createLabel() chain lines for a section's labels."""
+        code: List[str] = []
+        for label in labels:
+            Q = '"' if label.quoted else ''
+            code.append(
+                f"         .createLabel(UICreateFlags::Label, \"{label.tag}\", {Q}{label.value}{Q}, {label.size}, {label.flags})")
+
+            if self.sizer_info:
+                # Get sizer information
+                if label.sizer:
+                    sizer_properties: CppGenerator.SizerProperties = self.extract_sizer(label.sizer)
+                    code.append(
+                        f'         // Sizer information: Position: {sizer_properties.position}, Proportion: {sizer_properties.proportion}, Border: {sizer_properties.border}, Flags: {sizer_properties.flag}')
 
         return code
 
@@ -3384,6 +4222,39 @@ class CppGenerator:
             return raw[0].strip(), False
         return self._format_cpp_literal(raw, ty, string_style=string_style), True
 
+    def _param_key(self, key: str) -> str:
+        """The key argument of a generated param() read: a string literal, or with --param-keys
+           the class's ParamKey handle for it, recorded for param_key_table() to declare. Handles
+           live in the class's own nested 'struct ParamKeys', so they can't meet a member, a
+           'variables:' entry or layoutKey, and carry a 'k_' prefix so a key that is a C++
+           keyword or starts with a digit still names a valid identifier."""
+        if self._param_key_names is None:
+            return f'"{key}"'
+        handle = self._param_key_names.get(key)
+        if handle is None:
+            base = "k_" + re.sub(r"\W", "_", key)
+            handle = base
+            taken = set(self._param_key_names.values())
+            n = 2
+            while handle in taken:
+                handle, n = f"{base}_{n}", n + 1
+            self._param_key_names[key] = handle
+        return f"ParamKeys::{handle}"
+
+    def param_key_table(self) -> List[str]:
+        """--param-keys: the class-scope ParamKey handles the class's param() reads used, in
+           first-use order. ParamKey (DDT, beside param()) hashes its name at compile time, so
+           the matching param() overload looks the key up without hashing a literal per call.
+           Ends the class's recording."""
+        names, self._param_key_names = self._param_key_names or {}, None
+        if not names:
+            return []
+        return (["   // param() keys, hashed at compile time (--param-keys)",
+                 "   struct ParamKeys {"]
+                + [f'      static constexpr ParamKey {handle}{{"{self._cpp_string_literal(key)}"}};'
+                   for key, handle in names.items()]
+                + ["   };", ""])
+
     def _resolve_condition_expr(self, cond_raw: Any, anymap_name: Optional[str], yaml_file: Path, ctx: str) -> str:
         """Resolve a conditional's `condition:` field to a C++ bool expression.
            - `[ rvalue ]` form: used verbatim as the boolean expression; `anymap:` is ignored
@@ -3402,7 +4273,7 @@ class CppGenerator:
             return cond_raw[0].strip()
         if isinstance(cond_raw, str) and cond_raw.strip():
             key = cond_raw.strip()
-            return f'param<bool>({anymap_name}, "{key}", false)' if anymap_name else key
+            return f'param<bool>({anymap_name}, {self._param_key(key)}, false)' if anymap_name else key
         print(f"Warning: {ctx} 'condition:' must be a non-empty string or '[ rvalue ]'; defaulting to "
               f"'false' {yaml_file}", file=sys.stderr)
         return "false"
@@ -3425,11 +4296,6 @@ class CppGenerator:
            a ternary between two string branches has std::string as its common type."""
         if not isinstance(raw, dict) or "condition" not in raw:
             return None
-        self._warn_unknown_keys(raw, self._allowed_sets()["conditional_value"], ctx, yaml_file)
-        if "if_true" not in raw or "if_false" not in raw:
-            print(f"Warning: {ctx} conditional value must have 'condition', 'if_true' and 'if_false' "
-                  f"{yaml_file}", file=sys.stderr)
-            return None
 
         anymap_name = raw.get("anymap", default_anymap)
         if anymap_name is not None and (not isinstance(anymap_name, str) or not anymap_name.strip()):
@@ -3702,7 +4568,7 @@ class CppGenerator:
            plus extract_inside|extract_before|extract_after: [var_type[:no_auto], var_name, anymap_name,
            anymap_entry_name, default_value, ...] -- the exact set of keys read/allowed depends on
            'schema' (one of "class_args", "wizard_class_args", "args" -- see
-           _TIMING_KEYS_BY_SCHEMA and _allowed_sets()). Validates keys, structure, duplicates, and
+           _TIMING_KEYS_BY_SCHEMA and YamlSchema). Validates keys, structure, duplicates, and
            type/name tokens. Returns (arg_name, ins, translate, extracts) where extracts is a dict
            keyed by "before"/"inside"/"after", containing only the timings valid for this schema.
            arg_name is optional for args (only meaningful when insert/translate entries are
@@ -3712,8 +4578,6 @@ class CppGenerator:
             print(f"Warning: {ctx}.{schema} must be a mapping {yaml_file}", file=sys.stderr)
             return None, [], [], {}
 
-        allow = self._allowed_sets()
-        self._warn_unknown_keys(node, allow[f"{schema}_def"], f"{schema} block of '{ctx}'", yaml_file)
 
         # arg_name names the local anymap that insert:/translate: build (args)
         # or the class-scope factory var (class_args/wizard_class_args). It is not
@@ -3828,6 +4692,7 @@ class CppGenerator:
             "",
         ]
 
+    @_profiled("impl_stub")
     def _write_impl_stub(self, impl_dir: Path, class_name: str, module_name: str,
                          ns: str, stub_fns: Dict[str, Dict[str, Any]]) -> None:
         """Write (or incrementally extend) a module implementation unit stub.
@@ -3840,6 +4705,7 @@ class CppGenerator:
         """
         impl_dir.mkdir(parents=True, exist_ok=True)
         stub_path = impl_dir / f"{class_name}_impl.cpp"
+        self.written_files.append(stub_path)
 
         if not stub_path.exists():
             lines = [
@@ -3863,6 +4729,13 @@ class CppGenerator:
             return
 
         existing = stub_path.read_text(encoding="utf-8")
+        # The one generated line that may go stale: the module the class lives in (it
+        # changes with --fuse). Everything else in the file belongs to its author.
+        declared = re.search(r"^module\s+([\w.:]+)\s*;", existing, re.MULTILINE)
+        if declared is not None and declared.group(1) != module_name:
+            existing = existing[:declared.start(1)] + module_name + existing[declared.end(1):]
+            stub_path.write_text(existing, encoding="utf-8")
+            print(f"{stub_path} : Updated (module {declared.group(1)} -> {module_name})")
         missing_fns = {
             fname: fdef for fname, fdef in stub_fns.items()
             if not re.search(rf"{re.escape(class_name)}\s*::\s*{re.escape(fname)}\s*\(", existing)
@@ -3905,20 +4778,72 @@ class CppGenerator:
             return f" noexcept({spec.strip()})"
         return ""
 
-    def generate_from_yaml(self, yaml_file: Path, rel_path: Path, output_file: Path = None) -> str:
+    def page_type_names(self, data: Any) -> List[str]:
+        """The classes generating this parsed document will declare a PageType ID for, in
+           generation order -- one per item that reaches generate_ui_module() (groups/pages/
+           wizardpages entries with an 'elements' key, and book: container:true entries).
+           Mirrors the skip rules in generate_from_yaml()/_process_category()/
+           _generate_category_item() without generating anything, so batch mode can hand
+           out every file's IDs up front (see scan_and_generate()) instead of depending on
+           processing order."""
+        if not isinstance(data, dict) or bool(data.get('no_scan', False)):
+            return []
+
+        def runs(item_def: Dict[str, Any]) -> bool:
+            run_gen = item_def.get('run_generator', True)
+            return run_gen if isinstance(run_gen, bool) else True
+
+        suffixes = {"groups": "Group", "pages": "Page", "wizardpages": "WizardPage", "book": "Page"}
+        names = []
+        for category in ("groups", "pages", "wizardpages", "book"):
+            items = data.get(category)
+            if not isinstance(items, dict):
+                continue
+            for name, item_def in items.items():
+                if name == "verbatim" or not isinstance(item_def, dict) or not runs(item_def):
+                    continue
+                if category != "book":
+                    if 'elements' not in item_def:
+                        continue
+                elif not (item_def.get('container', False) is True
+                          and isinstance(item_def.get('pages'), list) and item_def['pages']):
+                    continue
+                names.append(item_def.get("class_name") or self.to_pascal_case(name) + suffixes[category])
+        return names
+
+    def generate_from_yaml(self, yaml_file: Path, rel_path: Path, output_file: Path = None,
+                           data: Any = None) -> str:
         """
         Single entry point: parses yaml_file exactly once and, in that one pass, checks it
         for 'groups', 'pages', 'wizardpages', 'wizard', and 'book' sections, generating
         whichever are present. Output goes under <output_file>/user_interface/ (matching the
-        layout generateClasses() expects).
+        layout generateClasses() expects). An already-parsed document may be passed as
+        `data` (batch mode parses up front to number PageTypes) to skip the parse here.
 
         A `tables:` section, if present, is ignored here -- it is no longer a C++ generation
         input at all. db::TableLoader (Libs/Core/src/Table.cpp) parses `tables:`/`relationships:`
         directly at runtime instead, to CREATE TABLE the schema and CREATE VIEW a joined
-        "<table>_detail" view per table with relationships.
+        "<table>_detail" view per table with relationships. With --schema it is collected
+        into a fragment for SchemaCompiler.
         """
 
-        data = self.parse_yaml_file(yaml_file)
+        self.written_files = []
+        self.failed = False
+        self.fused_parts, self.standalone_parts = [], []
+        self.fuse_unit = ModuleFusion.unit_name(self.fuse, yaml_file, self.source_root) \
+            if self.fuse and output_file is not None else None
+
+        result = self._generate_from_yaml(yaml_file, rel_path, output_file, data)
+        if self.fuse_unit is not None:
+            fragment = ModuleFusion.write_fragment(output_file, yaml_file, self.fuse_unit, self.fused_parts,
+                                                   self.standalone_parts)
+            self.written_files.append(fragment)
+        return result
+
+    def _generate_from_yaml(self, yaml_file: Path, rel_path: Path, output_file: Optional[Path],
+                            data: Any) -> str:
+        if data is None:
+            data = self.parse_yaml_file(yaml_file)
 
         # 'no_scan: true' is a topmost key. If present, the entire file is skipped.
         no_scan = bool(data.get('no_scan', False)) if isinstance(data, dict) else false
@@ -3934,6 +4859,12 @@ class CppGenerator:
         if self.debugging:
             self._dbg(f"==== generate_from_yaml: {yaml_file} (debugging=on) ====")
 
+        # --schema: this file's tables:/relationships:, normalized, for SchemaCompiler.assemble().
+        # Written for every file, tables or not, so one that loses its tables stops contributing.
+        if self.schema and output_file is not None:
+            self.written_files.append(
+                SchemaCompiler.write_fragment(output_file, yaml_file, SchemaCompiler.collect(data, yaml_file)))
+
         category_targets = {"groups": "Group", "pages": "Page", "wizardpages": "WizardPage", "wizard": "Wizard",
                             "book": "Book"}
         results: List[str] = []
@@ -3956,6 +4887,12 @@ class CppGenerator:
                 print(f"{yaml_file} has no useful content")
             return ""
 
+        # Key sets, document shape, scalar types and conditional values are checked once,
+        # here, for the whole file, and whatever fails is dropped from `data`; the emitters
+        # below only check the values they act on.
+        for diagnostic in self.validate(data, yaml_file):
+            print(f"Warning: {diagnostic}", file=sys.stderr)
+
         for category in ("groups", "pages", "wizardpages", "wizard", "book"):
             try:
                 if category in category_targets:
@@ -3973,9 +4910,11 @@ class CppGenerator:
                 self._dbg(f"category '{category}' raised {type(e).__name__}: {e} - "
                           f"rest of this category is DROPPED for {yaml_file}")
                 print(f"Error reading {yaml_file}: {e}", file=sys.stderr)
+                self.failed = True
 
         return ("\n\n").join(results)
 
+    @_profiled("category", lambda self, category, *a, **k: category)
     def _process_category(self, category: str, data: Dict[str, Any], yaml_file: Path, rel_path: Path,
                           output_file: Optional[Path]) -> str:
         """
@@ -3999,10 +4938,9 @@ class CppGenerator:
         if "verbatim" in items:
             top_verbatim = self._extract_verbatim_body(items)
             self._dbg(f"'{category}': root-level 'verbatim' block found ({len(top_verbatim)} chars)")
-            self._warn_unknown_keys(items, self._allowed_sets()["root"] | set(items.keys()),
-                                    f"{category} root", yaml_file)
 
         generated: List[Tuple[str, str]] = []  # (name, module_content)
+        standalone: set = set()  # --fuse: book populate() modules, which can't share a module
         for name, item_def in items.items():
             if name == "verbatim":
                 continue  # handled above
@@ -4023,6 +4961,12 @@ class CppGenerator:
             if content is not None:
                 generated.append((name, content))
                 self._dbg(f"'{category}.{name}': generated ({len(content)} chars)")
+                if self.fuse_unit is not None:
+                    # One namespace scope for the whole fused module: the category's
+                    # verbatim block goes in front of its first class only.
+                    top_verbatim = ""
+                    if category == "book" and item_def.get('container', False) is not True:
+                        standalone.add(name)
             else:
                 self._dbg(f"'{category}.{name}': DROPPED (see warning above, or run_generator: false)")
 
@@ -4032,17 +4976,14 @@ class CppGenerator:
 
         self._dbg(f"'{category}': {len(generated)}/{len(items)} entries generated: "
                   f"{[n for n, _ in generated]}")
-        return self._write_or_concat(generated, suffix, rel_path, output_file, category)
+        return self._write_or_concat(generated, suffix, rel_path, output_file, category, standalone)
 
+    @_profiled("item", lambda self, category, name, *a, **k: f"{category}.{name}")
     def _generate_category_item(self, category: str, name: str, item_def: Dict[str, Any], yaml_file: Path,
                                 top_verbatim: str, output_file: Optional[Path]) -> Optional[str]:
         """Per-item validation + generation. Returns None to skip an item."""
         if category == "wizard":
             run_gen = item_def.get('run_generator', True)
-            if not isinstance(run_gen, bool):
-                print(f"Warning: wizard '{name}': 'run_generator' must be hs_bool; defaulting to true",
-                      file=sys.stderr)
-                run_gen = True
             if not run_gen:
                 self._dbg(f"wizard '{name}': run_generator is false - DROPPED")
                 return None
@@ -4057,10 +4998,6 @@ class CppGenerator:
 
         if category == "book":
             run_gen = item_def.get('run_generator', True)
-            if not isinstance(run_gen, bool):
-                print(f"Warning: book '{name}': 'run_generator' must be hs_bool; defaulting to true",
-                      file=sys.stderr)
-                run_gen = True
             if not run_gen:
                 self._dbg(f"book '{name}': run_generator is false - DROPPED")
                 return None
@@ -4075,9 +5012,6 @@ class CppGenerator:
 
         # groups / pages / wizardpages
         run_gen = item_def.get('run_generator', True)
-        if not isinstance(run_gen, bool):
-            print(f"Warning: target '{name}': 'run_generator' must be hs_bool; defaulting to true", file=sys.stderr)
-            run_gen = True
         if not run_gen:
             self._dbg(f"{self.target_class} '{name}': run_generator is false - DROPPED")
             return None
@@ -4099,10 +5033,15 @@ class CppGenerator:
 
         return self.generate_ui_module(name, item_def, yaml_file, top_verbatim, output_file)
 
+    @_profiled("write")
     def _write_or_concat(self, generated: List[Tuple[str, str]], suffix: str, rel_path: Path,
-                         output_file: Optional[Path], category: str) -> str:
+                         output_file: Optional[Path], category: str, standalone: Any = ()) -> str:
         """Write (name, module_content) pairs to disk - only touching files whose content
-           actually changed, to avoid unnecessary rebuilds - or return them concatenated."""
+           actually changed, to avoid unnecessary rebuilds - or return them concatenated.
+           Whether a module changed is decided by its digest against output_digests.
+           With --fuse the modules are collected for ModuleFusion instead of written."""
+        if self.prelude:
+            generated = [(name, self.use_prelude(module)) for name, module in generated]
         if not output_file:
             return ("\n\n").join(module for _, module in generated)
 
@@ -4111,32 +5050,1169 @@ class CppGenerator:
 
         label = self.target_class
 
+        digests = self.output_digests if self.output_digests is not None else OutputDigests(None, {})
         for name, module_content in generated:
             base_name = name[:-6] if name.endswith('_table') else name
             pascal = self.to_pascal_case(base_name)
             out_path = dest_dir / f"{pascal}{suffix}.ixx"
 
+            if self.fuse_unit is not None:
+                if name in standalone:
+                    self.standalone_parts.append((out_path.name, module_content))
+                else:
+                    self.fused_parts.append(module_content)
+                    # Left over from an unfused run, it would define the class a second time.
+                    if out_path.exists():
+                        out_path.unlink()
+                        print(f"{out_path} : {label} removed (now part of {self.fuse_unit})")
+                continue
+
+            self.written_files.append(out_path)
+            state = _commit_output(out_path, module_content, digests)
+            print(f"{out_path} : {label} OK ({state})")
+
+        return generated[-1][1]
+
+
+def _generator_digest() -> str:
+    """Digest of what generates: this script's own source and the PyYAML version it parses
+       with (it imports nothing else outside the standard library). Any edit to the
+       generator, or a PyYAML upgrade, invalidates the manifest."""
+    digest = hashlib.sha256(Path(__file__).read_bytes())
+    digest.update(f"\0PyYAML {getattr(yaml, '__version__', '?')}".encode("utf-8"))
+    return digest.hexdigest()
+
+
+class ParseCache:
+    """
+    On-disk cache of parsed YAML documents, one pickle per source file (named after a
+    hash of its resolved path): a small header -- format version, path, size, mtime and
+    content digest -- followed by the parsed tree. A header whose size and mtime match
+    the file is trusted as-is; one where only the mtime moved (checkout, touch) is still
+    used if the content digest matches. Anything unreadable is simply a miss.
+    """
+
+    VERSION = 2                 # 2: mappings load as YamlMap (line numbers)
+
+    def __init__(self, directory: Path):
+        self.directory = Path(directory)
+
+    def _entry_path(self, yaml_file: Path) -> Path:
+        key = hashlib.sha256(str(Path(yaml_file).resolve()).encode("utf-8")).hexdigest()[:32]
+        return self.directory / f"{key}.pickle"
+
+    def load(self, yaml_file: Path) -> Tuple[bool, Any]:
+        """(True, data) on a hit, (False, None) otherwise."""
+        try:
+            st = os.stat(yaml_file)
+            with open(self._entry_path(yaml_file), "rb") as fh:
+                header = pickle.load(fh)
+                if header.get("version") != self.VERSION or header.get("path") != str(Path(yaml_file).resolve()) \
+                        or header.get("size") != st.st_size:
+                    return False, None
+                if header.get("mtime_ns") == st.st_mtime_ns:
+                    return True, pickle.load(fh)
+                raw = Path(yaml_file).read_bytes()
+                if header.get("digest") != hashlib.sha256(raw).hexdigest():
+                    return False, None
+                data = pickle.load(fh)
+        except Exception:
+            return False, None
+        self.store(yaml_file, raw, data)  # refresh the mtime so the next hit is stat-only
+        return True, data
+
+    def store(self, yaml_file: Path, raw: bytes, data: Any) -> None:
+        try:
+            st = os.stat(yaml_file)
+            header = {
+                "version": self.VERSION,
+                "path": str(Path(yaml_file).resolve()),
+                "size": st.st_size,
+                "mtime_ns": st.st_mtime_ns,
+                "digest": hashlib.sha256(raw).hexdigest(),
+            }
+            if header["size"] != len(raw):
+                return  # changed while we were parsing it
+            self.directory.mkdir(parents=True, exist_ok=True)
+            entry = self._entry_path(yaml_file)
+            tmp = entry.with_name(f"{entry.name}.{os.getpid()}.tmp")
+            with open(tmp, "wb") as fh:
+                pickle.dump(header, fh, pickle.HIGHEST_PROTOCOL)
+                pickle.dump(data, fh, pickle.HIGHEST_PROTOCOL)
+            os.replace(tmp, entry)
+        except (OSError, pickle.PicklingError):
+            pass  # the cache is an optimization; never fail generation over it
+
+
+class GenerationManifest:
+    """
+    Per-output-directory record of what each scanned YAML file last generated:
+    {yaml path: {digest, page_types: [[class, id], ...], outputs}}, alongside the generator
+    source digest and the CLI options that shape output (--export-var, --app-target,
+    --first-pagetype, --sizer-info, --impl-dir, --reproducible, --fuse, --prelude,
+    --compiled-layouts, --handler-tables, --class-args-table, --param-keys, --shared-lookups,
+    --schema, --pagetype-registry). The registry's content needs no key of its own: each
+    entry records the IDs it was generated with, compared against what the registry
+    assigns now. A file whose content digest still matches
+    is never parsed just to list its PageTypes, and one whose assigned PageType IDs are
+    also unchanged -- with every recorded output still on disk -- is skipped outright (see
+    scan_and_generate()). A generator or option mismatch discards every entry.
+
+    Modules assembled from all scanned files -- the --prelude and --schema modules and the
+    --fuse units -- belong to no single file's entry: they are listed apart, as `shared`,
+    and written by full and --shared-only runs only (see write_depfile()).
+    """
+
+    FILE_NAME = ".yaml2code.manifest.json"
+    FORMAT = 3
+
+    def __init__(self, path: Path, header: Dict[str, Any], entries: Dict[str, Dict[str, Any]], dirty: bool,
+                 previous: Optional[Dict[str, Any]] = None):
+        self.path = path
+        self.header = header
+        self.entries = entries
+        self.dirty = dirty
+        # The options the directory was last generated with, when they differ from
+        # header's; see retired_modules().
+        self.previous = previous or {}
+        self.shared: List[str] = []
+
+    @staticmethod
+    def header_for(generator: CppGenerator) -> Dict[str, Any]:
+        return {
+            "format": GenerationManifest.FORMAT,
+            "generator": _generator_digest(),
+            "options": {
+                "export_var": generator.export_var,
+                "app_target": generator.app_target,
+                "first_pagetype": generator.next_PageType,
+                "sizer_info": generator.sizer_info,
+                "impl_dir": str(generator.impl_dir) if generator.impl_dir is not None else None,
+                "reproducible": generator.reproducible,
+                "source_root": str(generator.source_root) if generator.reproducible or generator.fuse else None,
+                "fuse": generator.fuse,
+                "prelude": generator.prelude,
+                "compiled_layouts": generator.compiled_layouts,
+                "handler_tables": generator.handler_tables,
+                "class_args_table": generator.class_args_table,
+                "param_keys": generator.param_keys,
+                "shared_lookups": generator.shared_lookups,
+                "schema": generator.schema,
+                "pagetype_registry": str(generator.pagetype_registry)
+                if generator.pagetype_registry is not None else None,
+            },
+        }
+
+    @classmethod
+    def load(cls, output_dir: Path, generator: CppGenerator) -> "GenerationManifest":
+        path = output_dir / cls.FILE_NAME
+        header = cls.header_for(generator)
+        if _resident is not None:
+            # A resident process keeps the manifest it last saved; only another writer
+            # touching the file (a run without the server) forces a re-read.
+            cached = _resident.manifests.get(str(path))
+            if cached is not None and cached[0] == _ResidentCache.signature(path) and cached[1].header == header:
+                return cached[1]
+        try:
+            raw = json.loads(path.read_text(encoding="utf-8"))
+        except (OSError, ValueError):
+            return cls(path, header, {}, dirty=True)
+        if not isinstance(raw, dict) or {k: raw.get(k) for k in header} != header \
+                or not isinstance(raw.get("files"), dict):
+            previous = raw.get("options") if isinstance(raw, dict) else None
+            return cls(path, header, {}, dirty=True, previous=previous if isinstance(previous, dict) else None)
+        manifest = cls(path, header, raw["files"], dirty=False)
+        if isinstance(raw.get("shared"), list):
+            manifest.shared = [p for p in raw["shared"] if isinstance(p, str)]
+        if _resident is not None:
+            _resident.manifests[str(path)] = (_ResidentCache.signature(path), manifest)
+        return manifest
+
+    def retired_modules(self, output_dir: Path) -> List[Path]:
+        """The --prelude/--schema modules the previous run wrote into output_dir that this one
+           won't: the option was dropped or names another module now. Left in place, a build
+           that globs the directory would keep compiling them."""
+        return [output_dir / f"{old}.ixx" for key in ("prelude", "schema")
+                if isinstance(old := self.previous.get(key), str) and old != self.header["options"][key]]
+
+    @staticmethod
+    def digest(yaml_file: Path) -> str:
+        if _resident is not None:
+            return _resident.digest(yaml_file)
+        return hashlib.sha256(Path(yaml_file).read_bytes()).hexdigest()
+
+    def lookup(self, yaml_file: Path, digest: str) -> Optional[Dict[str, Any]]:
+        """The recorded entry for yaml_file, or None if there isn't one for this exact content."""
+        entry = self.entries.get(str(yaml_file))
+        if isinstance(entry, dict) and entry.get("digest") == digest:
+            return entry
+        return None
+
+    @staticmethod
+    def page_type_names(entry: Dict[str, Any]) -> List[str]:
+        return [name for name, _ in entry["page_types"]]
+
+    def is_current(self, entry: Dict[str, Any], page_types: List[Tuple[str, int]]) -> bool:
+        """True when the entry's outputs can be trusted as-is for these PageType IDs."""
+        return entry.get("page_types") == [list(pt) for pt in page_types] and \
+            all(Path(p).exists() for p in entry.get("outputs", []))
+
+    def record(self, yaml_file: Path, digest: str, page_types: List[Tuple[str, int]],
+               outputs: List[Path]) -> None:
+        self.entries[str(yaml_file)] = {
+            "digest": digest,
+            "page_types": [list(pt) for pt in page_types],
+            "outputs": [str(p) for p in outputs],
+        }
+        self.dirty = True
+
+    def add_output(self, yaml_file: Path, output: Path) -> None:
+        """Attribute an output written after the file's own generation (see ModuleFusion)."""
+        entry = self.entries.get(str(yaml_file))
+        if isinstance(entry, dict) and str(output) not in entry.setdefault("outputs", []):
+            entry["outputs"].append(str(output))
+            self.dirty = True
+
+    def set_shared(self, outputs: List[Path]) -> None:
+        shared = [str(p) for p in outputs]
+        if shared != self.shared:
+            self.shared = shared
+            self.dirty = True
+
+    def shared_missing(self) -> bool:
+        return not all(Path(p).exists() for p in self.shared)
+
+    def forget(self, yaml_file: Path) -> None:
+        if self.entries.pop(str(yaml_file), None) is not None:
+            self.dirty = True
+
+    def prune(self, yaml_files: List[Path]) -> None:
+        """Drop entries for YAML files no longer part of the scan."""
+        keep = {str(yf) for yf in yaml_files}
+        for key in [k for k in self.entries if k not in keep]:
+            del self.entries[key]
+            self.dirty = True
+
+    def save(self) -> None:
+        if not self.dirty:
+            return
+        content = json.dumps({**self.header, "files": self.entries, "shared": self.shared}, indent=1, sort_keys=True)
+        tmp = self.path.with_name(self.path.name + ".tmp")
+        tmp.write_text(content, encoding="utf-8")
+        os.replace(tmp, self.path)
+        self.dirty = False
+        if _resident is not None:
+            _resident.manifests[str(self.path)] = (_ResidentCache.signature(self.path), self)
+
+    # Heads the depfile's one rule for the shared modules; see write_depfile().
+    DEPFILE_SHARED_MARKER = "# shared: written by --shared-only"
+
+    def write_depfile(self, depfile: Path, yaml_files: List[Path]) -> bool:
+        """Write a Make-syntax dependency file, one '<generated .ixx ...>: <yaml>' rule per
+           scanned YAML file that produced modules of its own, then -- after a
+           DEPFILE_SHARED_MARKER comment line -- one '<shared .ixx ...>: <every yaml>' rule for
+           the shared modules. generateClasses() reads it back at configure time to declare
+           each per-YAML rule's BYPRODUCTS (and the shared rule's), and lists it in
+           CMAKE_CONFIGURE_DEPENDS -- so it is only rewritten when that mapping changes.
+           Ninja never reads it (it is no DEPFILE: it names outputs, not extra inputs).
+           Returns whether the content changed."""
+        def esc(p: Any) -> str:
+            return Path(p).as_posix().replace("$", "$$").replace("#", "\\#").replace(" ", "\\ ")
+
+        lines: List[str] = []
+        for yf in yaml_files:
+            entry = self.entries.get(str(yf))
+            outputs = [p for p in (entry or {}).get("outputs", []) if p.endswith(".ixx")]
+            if outputs:
+                lines.append(f"{' '.join(esc(p) for p in outputs)}: {esc(yf)}")
+        if self.shared:
+            lines.append(self.DEPFILE_SHARED_MARKER)
+            lines.append(f"{' '.join(esc(p) for p in self.shared)}: {' '.join(esc(yf) for yf in yaml_files)}")
+        content = "\n".join(lines) + "\n" if lines else ""
+        try:
+            if depfile.read_text(encoding="utf-8") == content:
+                return False
+        except OSError:
+            pass
+        depfile.parent.mkdir(parents=True, exist_ok=True)
+        depfile.write_text(content, encoding="utf-8")
+        return True
+
+
+def _commit_output(out_path: Path, content: str, digests: "OutputDigests") -> str:
+    """Bring out_path up to date with content, deciding from the sidecar digest and a stat()
+       -- the file is only read back when the sidecar has no record of it (first run, or
+       no sidecar). Returns 'created', 'updated' or 'unchanged'; an unchanged file keeps
+       its timestamp."""
+    digest = hashlib.sha256(content.encode("utf-8")).hexdigest()
+    state = digests.state(out_path, digest)
+    if state == "unknown":
+        try:
+            state = "unchanged" if out_path.read_text(encoding='utf-8') == content else "changed"
+        except Exception:
+            state = "changed"
+        if state == "unchanged":
+            digests.record(out_path, digest)
+    if state == "unchanged":
+        return state
+    _replace_file(out_path, content)
+    digests.record(out_path, digest)
+    return "created" if state == "missing" else "updated"
+
+
+def _replace_file(path: Path, content: str) -> None:
+    """Write content to path via a temporary file and rename, so a build that reads the
+       file (or a run that is interrupted) never sees it half-written."""
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = path.with_name(f".{path.name}.{os.getpid()}.tmp")
+    try:
+        with open(tmp, 'w', encoding='utf-8') as f:
+            f.write(content)
+        os.replace(tmp, path)
+    except BaseException:
+        with contextlib.suppress(OSError):
+            tmp.unlink()
+        raise
+
+
+class OutputDigests:
+    """
+    Sidecar record of the modules _write_or_concat() has written into an output
+    directory: {path: [sha256 of the content, size, mtime_ns]}. A module whose new
+    content hashes to the recorded digest, and whose file still has the recorded size
+    and mtime, is known to be unchanged without reading it; anything else (edited,
+    deleted or never recorded) falls back to a write, or a one-off read-back when there
+    is no record at all. Worker processes collect their changes in `updates`, which the
+    parent merge()s before saving.
+    """
+
+    FILE_NAME = ".yaml2code.outputs.json"
+
+    def __init__(self, path: Optional[Path], entries: Dict[str, List[Any]]):
+        self.path = path
+        self.entries = entries
+        self.updates: Dict[str, List[Any]] = {}
+
+    @classmethod
+    def load(cls, output_dir: Path) -> "OutputDigests":
+        path = output_dir / cls.FILE_NAME
+        try:
+            entries = json.loads(path.read_text(encoding="utf-8"))
+        except (OSError, ValueError):
+            entries = {}
+        if not isinstance(entries, dict):
+            entries = {}
+        return cls(path, entries)
+
+    def state(self, out_path: Path, digest: str) -> str:
+        """'missing', 'unchanged', 'changed', or 'unknown' (on disk, but never recorded)."""
+        try:
+            st = os.stat(out_path)
+        except OSError:
+            return "missing"
+        recorded = self.entries.get(str(out_path))
+        if not isinstance(recorded, list) or len(recorded) != 3:
+            return "unknown"
+        if recorded[1:] != [st.st_size, st.st_mtime_ns]:
+            return "unknown"  # touched behind our back; the digest says nothing about it
+        return "unchanged" if recorded[0] == digest else "changed"
+
+    def record(self, out_path: Path, digest: str) -> None:
+        try:
+            st = os.stat(out_path)
+        except OSError:
+            return
+        self.entries[str(out_path)] = self.updates[str(out_path)] = [digest, st.st_size, st.st_mtime_ns]
+
+    def drain(self) -> Dict[str, List[Any]]:
+        updates, self.updates = self.updates, {}
+        return updates
+
+    def merge(self, updates: Dict[str, List[Any]]) -> None:
+        self.entries.update(updates)
+        self.updates.update(updates)
+
+    def save(self) -> None:
+        if self.path is None or not self.updates:
+            return
+        self.updates = {}
+        with contextlib.suppress(OSError):
+            _replace_file(self.path, json.dumps(self.entries, indent=1, sort_keys=True))
+
+
+class ModuleFusion:
+    """
+    --fuse file|dir: instead of one named module per group/page/wizardpage/wizard -- each
+    with its own global module fragment of Core/Gfx headers, parsed again into every BMI
+    -- the classes of one YAML file (file) or of one scan directory (dir) are emitted into
+    a single module interface unit, '<Root>.<Dir...>[.<File>].UI', with one shared global
+    fragment. (Not C++ partitions: every partition is a translation unit and BMI of its
+    own, with its own global fragment, which is exactly the cost being avoided.)
+
+    Generation is unchanged up to the module text. Each YAML file's texts are stored as
+    a fragment under <output>/.yaml2code.fuse/, and assemble() -- run once per batch,
+    after every file has been generated -- merges the fragments of each unit: #includes
+    and imports are unioned, and an import of a class module that is now fused names the
+    unit instead (or is dropped, inside its own unit). Book populate() modules all export
+    the same function, so they stay separate modules, written by assemble() with the same
+    import rewriting.
+    """
+
+    FRAGMENT_DIR = ".yaml2code.fuse"
+    FORMAT = 1
+    _BOILERPLATE = {"//", "// Auto-generated from", "// Make any changes there. This file will be overwritten."}
+
+    @staticmethod
+    def unit_name(mode: str, yaml_file: Path, source_root: Optional[Path]) -> str:
+        root = Path(source_root if source_root is not None else Path(yaml_file).parent).resolve()
+        try:
+            rel = Path(yaml_file).resolve().relative_to(root)
+        except ValueError:
+            rel = Path(Path(yaml_file).name)
+        parts = [root.name, *rel.parent.parts] + ([rel.stem] if mode == "file" else [])
+
+        def ident(part: str) -> str:
+            words = [w for w in re.split(r"[^0-9A-Za-z]+", part) if w]
+            name = "".join(w[0].upper() + w[1:] for w in words) or "Root"
+            return name if not name[0].isdigit() else f"M{name}"
+
+        return ".".join(ident(p) for p in parts if p) + ".UI"
+
+    @classmethod
+    def fragment_path(cls, output_dir: Path, yaml_file: Path) -> Path:
+        key = hashlib.sha256(str(Path(yaml_file).resolve()).encode("utf-8")).hexdigest()[:32]
+        return Path(output_dir) / cls.FRAGMENT_DIR / f"{key}.json"
+
+    @classmethod
+    def write_fragment(cls, output_dir: Path, yaml_file: Path, unit: str, modules: List[str],
+                       standalone: List[Tuple[str, str]]) -> Path:
+        path = cls.fragment_path(output_dir, yaml_file)
+        content = json.dumps({"format": cls.FORMAT, "yaml": str(yaml_file), "unit": unit,
+                              "modules": modules, "standalone": standalone})
+        _replace_file(path, content)
+        return path
+
+    @classmethod
+    def load_fragment(cls, output_dir: Path, yaml_file: Path) -> Optional[Dict[str, Any]]:
+        try:
+            fragment = json.loads(cls.fragment_path(output_dir, yaml_file).read_text(encoding="utf-8"))
+        except (OSError, ValueError):
+            return None
+        return fragment if isinstance(fragment, dict) and fragment.get("format") == cls.FORMAT else None
+
+    @classmethod
+    def split(cls, text: str) -> Tuple[str, List[str], List[str], List[str], str]:
+        """(module name, global-fragment lines, source comments, imports, body) of a module
+           text as the emitters produce it."""
+        lines = text.split("\n")
+        at = next(i for i, line in enumerate(lines) if line.startswith("export module "))
+        name = lines[at][len("export module "):].rstrip().rstrip(";").strip()
+        fragment = [line for line in lines[1:at] if line.strip() and not line.startswith("//")]
+        sources = [line for line in lines[1:at] if line.startswith("//") and line not in cls._BOILERPLATE]
+        imports = []
+        i = at + 1
+        while i < len(lines) and (not lines[i].strip() or lines[i].startswith("import ")):
+            if lines[i].startswith("import "):
+                imports.append(lines[i][len("import "):].rstrip().rstrip(";").strip())
+            i += 1
+        return name, fragment, sources, imports, "\n".join(lines[i:])
+
+    @staticmethod
+    def _imports(imports: List[str], unit: Optional[str], unit_of: Dict[str, str]) -> List[str]:
+        out: List[str] = []
+        for module in imports:
+            module = unit_of.get(module, module)
+            if module != unit and module not in out:
+                out.append(module)
+        return out
+
+    @classmethod
+    def fuse(cls, unit: str, parts: List[Tuple[str, List[str], List[str], List[str], str]],
+             unit_of: Dict[str, str]) -> str:
+        fragment: List[str] = []
+        sources: List[str] = []
+        imports: List[str] = []
+        for _, part_fragment, part_sources, part_imports, _ in parts:
+            for line in part_fragment:
+                if not (line.startswith("#include") and line in fragment):
+                    fragment.append(line)
+            for line in part_sources:
+                if line not in sources:
+                    sources.append(line)
+            imports.extend(part_imports)
+        code = ["module;", "//", "// Auto-generated from", *sources, "",
+                "// Make any changes there. This file will be overwritten.", "", *fragment, "",
+                f"export module {unit};", ""]
+        code.extend(f"import {module};" for module in sorted(cls._imports(imports, unit, unit_of)))
+        for part in parts:
+            code.append("")
+            code.append(part[4].strip("\n"))
+        return "\n".join(code) + "\n"
+
+    @classmethod
+    def rewrite_imports(cls, text: str, unit_of: Dict[str, str]) -> str:
+        """A standalone module with its imports of fused class modules redirected."""
+        lines = text.split("\n")
+        out, seen = [], set()
+        for line in lines:
+            if line.startswith("import "):
+                module = line[len("import "):].rstrip().rstrip(";").strip()
+                module = unit_of.get(module, module)
+                if module in seen:
+                    continue
+                seen.add(module)
+                line = f"import {module};"
+            out.append(line)
+        return "\n".join(out)
+
+    @classmethod
+    def assemble(cls, output_dir: Path, yaml_files: List[Path],
+                 digests: Optional["OutputDigests"]) -> List[Tuple[Path, Path]]:
+        """Write every unit (and standalone module) the fragments of yaml_files describe.
+           Returns (yaml file, output) pairs: each unit belongs to the first YAML file, in
+           scan order, that contributes to it."""
+        if digests is None:
+            digests = OutputDigests(None, {})
+        units: Dict[str, List[Tuple[str, List[str], List[str], List[str], str]]] = {}
+        owners: Dict[str, Path] = {}
+        standalone: List[Tuple[Path, str, str]] = []
+        for yf in yaml_files:
+            fragment = cls.load_fragment(output_dir, yf)
+            if fragment is None:
+                continue
+            if fragment["modules"]:
+                units.setdefault(fragment["unit"], []).extend(cls.split(text) for text in fragment["modules"])
+                owners.setdefault(fragment["unit"], yf)
+            standalone.extend((yf, file_name, text) for file_name, text in fragment["standalone"])
+
+        unit_of = {part[0]: unit for unit, parts in units.items() for part in parts}
+        outputs: List[Tuple[Path, Path]] = []
+        ui_dir = Path(output_dir) / "ui"
+        for unit, parts in units.items():
+            path = ui_dir / f"{unit}.ixx"
+            print(f"{path} : Module OK ({_commit_output(path, cls.fuse(unit, parts, unit_of), digests)})")
+            outputs.append((owners[unit], path))
+        for yf, file_name, text in standalone:
+            path = ui_dir / file_name
+            print(f"{path} : Book OK ({_commit_output(path, cls.rewrite_imports(text, unit_of), digests)})")
+            outputs.append((yf, path))
+        return outputs
+
+    @classmethod
+    def unfuse(cls, output_dir: Path) -> None:
+        """Fusion was turned off: remove the units and fragments a fused run left behind,
+           which would otherwise define every class a second time."""
+        fragment_dir = Path(output_dir) / cls.FRAGMENT_DIR
+        if not fragment_dir.is_dir():
+            return
+        for fragment in fragment_dir.glob("*.json"):
             try:
-                existing = out_path.read_text(encoding='utf-8') if out_path.exists() else None
-            except Exception:
-                existing = None
+                unit = json.loads(fragment.read_text(encoding="utf-8")).get("unit")
+            except (OSError, ValueError, AttributeError):
+                unit = None
+            if isinstance(unit, str):
+                with contextlib.suppress(OSError):
+                    (Path(output_dir) / "ui" / f"{unit}.ixx").unlink()
+            with contextlib.suppress(OSError):
+                fragment.unlink()
+        with contextlib.suppress(OSError):
+            fragment_dir.rmdir()
+
+
+class SchemaCompiler:
+    """
+    --schema MODULE: the `tables:`/`relationships:` sections of every scanned YAML file,
+    compiled into one module, <output>/MODULE.ixx, exporting db::schema::statements --
+    normalized DDL: DROP VIEW of each "<table>_detail" view, CREATE TABLE IF NOT EXISTS
+    per table, then CREATE VIEW of each view again -- db::schema::digest, a sha256 of
+    those statements, and db::schema::tables, each table's definition and columns.
+
+    It replaces one runtime path: db::TableLoader reading these sections out of the YAML
+    resources at start-up and issuing their DDL. TableLoader lives in the Core library, not
+    here, so nothing is derived from its code: the DDL is this compiler's own, and once an
+    app builds the module it is the only DDL -- TableLoader compares the digest with the
+    one it stored in the database and, only when they differ, runs these statements (not
+    its own) and stores the new digest. The mapping from table specs to statements is
+    pinned by the golden files under tests/fixtures/schema; a change to the shapes
+    TableLoader accepts has to be made in both places.
+
+    CREATE TABLE IF NOT EXISTS leaves a table that already exists alone, so a changed
+    column would change the digest without ever reaching an existing database. Each
+    table's definition is therefore its CREATE TABLE exactly as SQLite records it in
+    sqlite_master.sql, and the module spells out what TableLoader has to do with a table
+    whose recorded sql differs: rebuild it -- SQLite's own procedure for the changes ALTER
+    TABLE cannot make -- keeping the columns it still has, once the views that name it
+    are dropped (statements[0, rebuild_at)) and before the rest run (see render()).
+
+    The shapes read are the ones TableLoader reads:
+
+        tables:
+          customer:
+            columns:                       # or the column mapping directly
+              id: { type: integer, primary_key: true }
+              name: { type: string, not_null: true, default: "" }
+              kind_id: integer
+        relationships:
+          - { table: customer, field: kind_id, references: kinds, key: id, display: name }
+
+    A relationship LEFT JOINs `references` on `key` (default id) into its table's _detail
+    view, adding each `display` column (default name) as "<field>_<display>".
+
+    Like ModuleFusion, each YAML file's normalized sections are stored as a fragment under
+    <output>/.yaml2code.schema/ when it is generated, and assemble() merges the fragments
+    of all scanned files in scan order, so a file that is skipped as unchanged still
+    contributes its tables.
+    """
+
+    FRAGMENT_DIR = ".yaml2code.schema"
+    FORMAT = 2
+    REBUILD_SUFFIX = "__rebuild"
+    TABLE_KEYS = frozenset(("columns", "fields", "primary_key"))
+    COLUMN_KEYS = frozenset(("type", "primary_key", "autoincrement", "not_null", "unique", "default", "references"))
+    RELATIONSHIP_KEYS = frozenset(("table", "field", "references", "key", "display"))
+    # YAML/C++ spellings of a column type -> SQLite type; anything else that looks like an
+    # SQL type name is passed through upper-cased.
+    TYPES = {
+        "int": "INTEGER", "integer": "INTEGER", "long": "INTEGER", "bool": "INTEGER", "boolean": "INTEGER",
+        "hs_bool": "INTEGER", "id": "INTEGER", "id::type": "INTEGER",
+        "string": "TEXT", "std::string": "TEXT", "text": "TEXT", "date": "TEXT", "datetime": "TEXT",
+        "double": "REAL", "float": "REAL", "real": "REAL", "blob": "BLOB",
+    }
 
-            if existing != module_content:
-                out_path.parent.mkdir(parents=True, exist_ok=True)
-                with open(out_path, 'w', encoding='utf-8') as f:
-                    f.write(module_content)
-                print(f"{out_path} : {label} OK ({'created' if existing is None else 'updated'})")
+    @staticmethod
+    def quote(name: str) -> str:
+        return '"' + name.replace('"', '""') + '"'
+
+    @staticmethod
+    def literal(value: Any) -> str:
+        if value is None:
+            return "NULL"
+        if isinstance(value, bool):
+            return "1" if value else "0"
+        if isinstance(value, (int, float)):
+            return repr(value)
+        return "'" + str(value).replace("'", "''") + "'"
+
+    @classmethod
+    def collect(cls, data: Any, yaml_file: Path) -> Dict[str, Any]:
+        """This file's tables (name -> {columns: [name], sql: [column and table constraint
+           SQL]}) and relationships, normalized; whatever cannot be is reported and left out."""
+        tables: Dict[str, Dict[str, List[str]]] = {}
+        relationships: List[Dict[str, Any]] = []
+        raw_tables = data.get("tables") if isinstance(data, dict) else None
+        if raw_tables is not None and not isinstance(raw_tables, dict):
+            print(f"Warning: 'tables' must be a mapping of table name -> columns; ignoring {yaml_file}",
+                  file=sys.stderr)
+            raw_tables = None
+        for table, table_def in (raw_tables or {}).items():
+            columns = table_def.get("columns", table_def.get("fields", table_def)) \
+                if isinstance(table_def, dict) else None
+            if not isinstance(columns, dict) or not columns:
+                print(f"Warning: table '{table}' has no column mapping; ignoring {yaml_file}", file=sys.stderr)
+                continue
+            if columns is not table_def:
+                unknown = sorted(k for k in table_def if k not in cls.TABLE_KEYS)
+                if unknown:
+                    print(f"Warning: unknown keys {unknown} in table '{table}' {yaml_file}", file=sys.stderr)
+            sql = [cls._column(str(table), str(name), column_def, yaml_file) for name, column_def in columns.items()]
+            primary_key = table_def.get("primary_key") if columns is not table_def else None
+            if isinstance(primary_key, list) and primary_key:
+                sql.append(f"PRIMARY KEY ({', '.join(cls.quote(str(c)) for c in primary_key)})")
+            tables[str(table)] = {"columns": [str(name) for name in columns], "sql": sql}
+
+        raw_relationships = data.get("relationships") if isinstance(data, dict) else None
+        if raw_relationships is not None and not isinstance(raw_relationships, list):
+            print(f"Warning: 'relationships' must be a list; ignoring {yaml_file}", file=sys.stderr)
+            raw_relationships = None
+        for rel in raw_relationships or []:
+            if not isinstance(rel, dict) or not all(isinstance(rel.get(k), str) and rel.get(k)
+                                                    for k in ("table", "field", "references")):
+                print(f"Warning: relationship {rel!r} needs 'table', 'field' and 'references'; ignoring "
+                      f"{yaml_file}", file=sys.stderr)
+                continue
+            unknown = sorted(k for k in rel if k not in cls.RELATIONSHIP_KEYS)
+            if unknown:
+                print(f"Warning: unknown keys {unknown} in relationship '{rel['table']}.{rel['field']}' "
+                      f"{yaml_file}", file=sys.stderr)
+            display = rel.get("display", "name")
+            relationships.append({"table": rel["table"], "field": rel["field"], "references": rel["references"],
+                                  "key": str(rel.get("key", "id")),
+                                  "display": [str(d) for d in (display if isinstance(display, list) else [display])],
+                                  "yaml": str(yaml_file)})
+        return {"tables": tables, "relationships": relationships}
+
+    @classmethod
+    def _column(cls, table: str, name: str, column_def: Any, yaml_file: Path) -> str:
+        if not isinstance(column_def, dict):
+            column_def = {"type": column_def}
+        unknown = sorted(k for k in column_def if k not in cls.COLUMN_KEYS)
+        if unknown:
+            print(f"Warning: unknown keys {unknown} in column '{table}.{name}' {yaml_file}", file=sys.stderr)
+        raw_type = str(column_def.get("type", "text")).strip()
+        sql_type = cls.TYPES.get(raw_type.lower())
+        if sql_type is None:
+            if re.fullmatch(r"[A-Za-z][A-Za-z0-9_ ]*(\(\s*\d+\s*(,\s*\d+\s*)?\))?", raw_type):
+                sql_type = raw_type.upper()
             else:
-                # Keep timestamp untouched when no changes
-                print(f"{out_path} : {label} OK (unchanged)")
+                print(f"Warning: column '{table}.{name}' type {raw_type!r} is not a column type; using TEXT "
+                      f"{yaml_file}", file=sys.stderr)
+                sql_type = "TEXT"
+        sql = [cls.quote(name), sql_type]
+        if column_def.get("primary_key"):
+            sql.append("PRIMARY KEY")
+            if column_def.get("autoincrement"):
+                sql.append("AUTOINCREMENT")
+        if column_def.get("not_null"):
+            sql.append("NOT NULL")
+        if column_def.get("unique"):
+            sql.append("UNIQUE")
+        if "default" in column_def:
+            sql.append(f"DEFAULT {cls.literal(column_def['default'])}")
+        references = column_def.get("references")
+        if isinstance(references, str) and references:
+            ref_table, _, ref_column = references.partition(".")
+            sql.append(f"REFERENCES {cls.quote(ref_table)}({cls.quote(ref_column or 'id')})")
+        return " ".join(sql)
+
+    @classmethod
+    def fragment_path(cls, output_dir: Path, yaml_file: Path) -> Path:
+        key = hashlib.sha256(str(Path(yaml_file).resolve()).encode("utf-8")).hexdigest()[:32]
+        return Path(output_dir) / cls.FRAGMENT_DIR / f"{key}.json"
+
+    @classmethod
+    def write_fragment(cls, output_dir: Path, yaml_file: Path, schema: Dict[str, Any]) -> Path:
+        path = cls.fragment_path(output_dir, yaml_file)
+        _replace_file(path, json.dumps({"format": cls.FORMAT, "yaml": str(yaml_file), **schema}))
+        return path
+
+    @classmethod
+    def load_fragment(cls, output_dir: Path, yaml_file: Path) -> Optional[Dict[str, Any]]:
+        try:
+            fragment = json.loads(cls.fragment_path(output_dir, yaml_file).read_text(encoding="utf-8"))
+        except (OSError, ValueError):
+            return None
+        return fragment if isinstance(fragment, dict) and fragment.get("format") == cls.FORMAT else None
+
+    @classmethod
+    def merge(cls, fragments: List[Dict[str, Any]]
+              ) -> Tuple[Dict[str, Dict[str, List[str]]], Dict[str, List[Dict[str, Any]]]]:
+        """Every fragment's tables (the first definition of a name wins) and, per table, the
+           relationships whose tables are all defined."""
+        tables: Dict[str, Dict[str, List[str]]] = {}
+        owner: Dict[str, str] = {}
+        joins: Dict[str, List[Dict[str, Any]]] = {}
+        for fragment in fragments:
+            for table, spec in fragment["tables"].items():
+                if table in tables:
+                    print(f"Warning: table '{table}' is already defined in {owner[table]}; ignoring "
+                          f"{fragment['yaml']}", file=sys.stderr)
+                    continue
+                tables[table] = spec
+                owner[table] = fragment["yaml"]
+        for fragment in fragments:
+            for rel in fragment["relationships"]:
+                missing = [t for t in (rel["table"], rel["references"]) if t not in tables]
+                if missing:
+                    print(f"Warning: relationship '{rel['table']}.{rel['field']}' names undefined table "
+                          f"'{missing[0]}'; ignoring {rel['yaml']}", file=sys.stderr)
+                    continue
+                joins.setdefault(rel["table"], []).append(rel)
+        return tables, joins
+
+    @classmethod
+    def definition(cls, table: str, spec: Dict[str, List[str]]) -> str:
+        """The table's CREATE TABLE as sqlite_master.sql records it (which drops IF NOT EXISTS)."""
+        return f"CREATE TABLE {cls.quote(table)} ({', '.join(spec['sql'])})"
+
+    @classmethod
+    def statements(cls, tables: Dict[str, Dict[str, List[str]]],
+                   joins: Dict[str, List[Dict[str, Any]]]) -> List[str]:
+        # The views go first: SQLite will not rename a rebuilt table into place while a view
+        # names it, so render()'s rebuild runs between the DROP VIEWs and the rest.
+        out = [f"DROP VIEW IF EXISTS {cls.quote(f'{table}_detail')}" for table in joins]
+        out.extend(cls.definition(table, spec).replace("CREATE TABLE", "CREATE TABLE IF NOT EXISTS", 1)
+                   for table, spec in tables.items())
+        for table, rels in joins.items():
+            select = [f"{cls.quote(table)}.*"]
+            joined = []
+            for i, rel in enumerate(rels):
+                alias = cls.quote(f"r{i}")
+                select.extend(f"{alias}.{cls.quote(d)} AS {cls.quote(rel['field'] + '_' + d)}" for d in rel["display"])
+                joined.append(f"LEFT JOIN {cls.quote(rel['references'])} {alias} "
+                              f"ON {alias}.{cls.quote(rel['key'])} = {cls.quote(table)}.{cls.quote(rel['field'])}")
+            view = cls.quote(f"{table}_detail")
+            out.append(f"CREATE VIEW {view} AS SELECT {', '.join(select)} FROM {cls.quote(table)} {' '.join(joined)}")
+        return out
+
+    @staticmethod
+    def cpp_string(text: str) -> str:
+        return '"' + text.replace("\\", "\\\\").replace('"', '\\"') + '"'
+
+    @classmethod
+    def render(cls, module: str, tables: Dict[str, Dict[str, List[str]]], statements: List[str],
+               rebuild_at: int) -> str:
+        digest = hashlib.sha256("\n".join(statements).encode("utf-8")).hexdigest()
+        rebuilt = cls.quote("<name>" + cls.REBUILD_SUFFIX)
+        code = ["module;", "//", "// Auto-generated from the tables:/relationships: sections of the scanned YAML files.",
+                "", "// Make any changes there. This file will be overwritten.", "", "#include <array>",
+                "#include <cstddef>", "#include <span>", "#include <string_view>", "",
+                f"export module {module};", "", "export namespace db::schema {", "",
+                "// Replaces db::TableLoader's start-up YAML -> DDL step. sha256 of the statements:",
+                "// run them only when it differs from the digest stored in the database, then store it.",
+                f'constexpr std::string_view digest = "{digest}";', "",
+                "// CREATE TABLE IF NOT EXISTS leaves an existing table as it is. So when the digest",
+                "// differs: run statements[0, rebuild_at), which drop the views; rebuild every table",
+                "// in `tables` whose sqlite_master.sql is not its definition; then run the rest.",
+                "//",
+                "//    PRAGMA foreign_keys = OFF;  BEGIN;",
+                f"//    CREATE TABLE {rebuilt} (...);  -- the definition, under this name",
+                f'//    INSERT INTO {rebuilt} (<kept>) SELECT <kept> FROM "<name>";',
+                f'//    DROP TABLE "<name>";  ALTER TABLE {rebuilt} RENAME TO "<name>";',
+                "//    PRAGMA foreign_key_check;  COMMIT;  PRAGMA foreign_keys = ON;",
+                "//",
+                "// <kept> is the columns the table has both before (PRAGMA table_info) and after; the",
+                "// data of a dropped column is lost. A table no YAML file defines any more is left alone.",
+                f"constexpr std::size_t rebuild_at = {rebuild_at};", "",
+                f"constexpr std::array<std::string_view, {len(statements)}> statements {{"]
+        code.extend(f'   R"sql({statement})sql",' for statement in statements)
+        code.extend(["};", "",
+                     "struct Table {",
+                     "   std::string_view name;",
+                     "   std::string_view definition;   // CREATE TABLE, as sqlite_master.sql records it",
+                     "   std::span<const std::string_view> columns;",
+                     "};", "",
+                     "namespace detail {"])
+        code.extend(f"inline constexpr std::array<std::string_view, {len(spec['columns'])}> columns{i} "
+                    f"{{ {', '.join(cls.cpp_string(c) for c in spec['columns'])} }};"
+                    for i, spec in enumerate(tables.values()))
+        code.extend(["} // namespace detail", "",
+                     f"constexpr std::array<Table, {len(tables)}> tables {{{{"])
+        code.extend(f'   {{ {cls.cpp_string(table)}, R"sql({cls.definition(table, spec)})sql", detail::columns{i} }},'
+                    for i, (table, spec) in enumerate(tables.items()))
+        code.extend(["}};", "", "} // namespace db::schema", ""])
+        return "\n".join(code)
+
+    @classmethod
+    def assemble(cls, output_dir: Path, yaml_files: List[Path], module: str,
+                 digests: Optional["OutputDigests"]) -> Path:
+        if digests is None:
+            digests = OutputDigests(None, {})
+        fragments = [f for f in (cls.load_fragment(output_dir, yf) for yf in yaml_files) if f is not None]
+        path = Path(output_dir) / f"{module}.ixx"
+        tables, joins = cls.merge(fragments)
+        state = _commit_output(path, cls.render(module, tables, cls.statements(tables, joins), len(joins)), digests)
+        print(f"{path} : Schema OK ({state})")
+        return path
+
+    @classmethod
+    def remove(cls, output_dir: Path) -> None:
+        """--schema was turned off: drop the fragments (the module is simply no longer built)."""
+        fragment_dir = Path(output_dir) / cls.FRAGMENT_DIR
+        if not fragment_dir.is_dir():
+            return
+        for fragment in fragment_dir.glob("*.json"):
+            with contextlib.suppress(OSError):
+                fragment.unlink()
+        with contextlib.suppress(OSError):
+            fragment_dir.rmdir()
+
+
+class PageTypeRegistry:
+    """
+    Committed, append-only class name -> PageType ID map (--pagetype-registry). Without
+    one, IDs are handed out in scan order, so adding, removing or renaming a YAML file
+    shifts the 'const Type X(N)' of every later page and the whole module graph rebuilds.
+    With one, a class keeps the ID it was first given for good -- IDs of classes that no
+    longer exist stay reserved -- and a new class takes the next ID after the highest one
+    ever assigned. Seeding an empty registry reproduces the scan-order numbering exactly.
+    The file is only rewritten when a class is added.
+    """
+
+    def __init__(self, path: Path, first_page_type: int, ids: Dict[str, int], dirty: bool):
+        self.path = path
+        self.first_page_type = first_page_type
+        self.ids = ids
+        self.dirty = dirty
+
+    @classmethod
+    def load(cls, path: Path, first_page_type: int) -> "PageTypeRegistry":
+        """Load the registry, or start an empty one if the file doesn't exist yet. A file
+           that exists but can't be read is an error, never silently renumbered."""
+        try:
+            text = path.read_text(encoding="utf-8")
+        except FileNotFoundError:
+            return cls(path, first_page_type, {}, dirty=True)
+        try:
+            raw = json.loads(text)
+            ids = raw["page_types"]
+            if not isinstance(ids, dict) or not all(isinstance(v, int) for v in ids.values()):
+                raise ValueError("'page_types' must map class names to integer IDs")
+            first = int(raw.get("first_pagetype", first_page_type))
+        except (ValueError, KeyError, TypeError) as e:
+            raise ValueError(f"Invalid PageType registry {path}: {e}")
+        if len(set(ids.values())) != len(ids):
+            raise ValueError(f"Invalid PageType registry {path}: duplicate IDs")
+        return cls(path, first, dict(ids), dirty=False)
+
+    def assign(self, names: List[str]) -> List[Tuple[str, int]]:
+        """The IDs for these classes, registering any that are new."""
+        for name in names:
+            if name not in self.ids:
+                self.ids[name] = max(self.ids.values(), default=self.first_page_type - 1) + 1
+                self.dirty = True
+        return [(name, self.ids[name]) for name in names]
+
+    def save(self) -> None:
+        if not self.dirty:
+            return
+        ordered = dict(sorted(self.ids.items(), key=lambda kv: kv[1]))
+        content = json.dumps({"first_pagetype": self.first_page_type, "page_types": ordered}, indent=1) + "\n"
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = self.path.with_name(self.path.name + ".tmp")
+        tmp.write_text(content, encoding="utf-8")
+        os.replace(tmp, self.path)
+        self.dirty = False
+
+
+def _page_types_for(names: List[str], first_page_type: int,
+                    registry: Optional[PageTypeRegistry]) -> List[Tuple[str, int]]:
+    """(class, ID) for each PageType a file declares: from the registry when there is one,
+       otherwise consecutive IDs from first_page_type (scan-order numbering)."""
+    if registry is not None:
+        return registry.assign(names)
+    return [(name, first_page_type + i) for i, name in enumerate(names)]
+
+
+@contextlib.contextmanager
+def _output_dir_lock(output_dir: Path):
+    """Serialize batch runs against one output directory: generateClasses() declares a
+       build rule per YAML file, and Ninja/Make may schedule several at once, all sharing
+       the manifest and (through PageType numbering) each other's outputs."""
+    with open(output_dir / ".yaml2code.lock", "a+") as fh:
+        try:
+            import fcntl
+        except ImportError:  # Windows
+            import msvcrt
+            while True:
+                try:
+                    fh.seek(0)
+                    msvcrt.locking(fh.fileno(), msvcrt.LK_LOCK, 1)
+                    break
+                except OSError:
+                    continue  # LK_LOCK gives up after ~10s; keep waiting
+            try:
+                yield
+            finally:
+                fh.seek(0)
+                msvcrt.locking(fh.fileno(), msvcrt.LK_UNLCK, 1)
+        else:
+            fcntl.flock(fh, fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                fcntl.flock(fh, fcntl.LOCK_UN)
 
-        return generated[-1][1]
+
+class _ResidentCache:
+    """
+    What a long-running --serve / --watch process keeps between requests: parsed YAML
+    (pickled, so every run still gets a private copy to work on), content digests, loaded
+    manifests and one CppGenerator per option set. Entries are keyed by the file's stat
+    signature, so an edited file is simply a cache miss.
+    """
+
+    def __init__(self):
+        self.parsed: Dict[str, Tuple[Any, bytes]] = {}
+        self.digests: Dict[str, Tuple[Any, str]] = {}
+        self.manifests: Dict[str, Tuple[Any, "GenerationManifest"]] = {}
+        self.generators: Dict[Tuple[Any, ...], CppGenerator] = {}
+
+    @staticmethod
+    def signature(path: Path) -> Optional[Tuple[int, int, int]]:
+        try:
+            st = os.stat(path)
+        except OSError:
+            return None
+        return st.st_mtime_ns, st.st_size, st.st_ino
+
+    def parse(self, generator: CppGenerator, yaml_file: Path) -> Any:
+        sig = self.signature(yaml_file)
+        cached = self.parsed.get(str(yaml_file))
+        if cached is not None and cached[0] == sig:
+            return pickle.loads(cached[1])
+        data = generator.parse_yaml_file(yaml_file)
+        self.parsed[str(yaml_file)] = (sig, pickle.dumps(data, pickle.HIGHEST_PROTOCOL))
+        return data
+
+    def digest(self, yaml_file: Path) -> str:
+        sig = self.signature(yaml_file)
+        cached = self.digests.get(str(yaml_file))
+        if cached is not None and cached[0] == sig:
+            return cached[1]
+        digest = hashlib.sha256(Path(yaml_file).read_bytes()).hexdigest()
+        self.digests[str(yaml_file)] = (sig, digest)
+        return digest
+
+    def generator_for(self, args: Any) -> CppGenerator:
+        key = (args.quiet, args.sizer_info, args.export_var, args.app_target,
+               str(args.impl_dir) if args.impl_dir is not None else None)
+        if key not in self.generators:
+            self.generators[key] = CppGenerator()
+        return self.generators[key]
+
+
+# Set only in --serve / --watch mode; see _ResidentCache.
+_resident: Optional[_ResidentCache] = None
+
+
+# Batch-mode worker state: each pool process gets its own copy of the configured
+# generator once (via the pool initializer) instead of re-pickling it per file.
+_pool_generator: Optional[CppGenerator] = None
+
+
+def _file_span(yaml_file: Path):
+    """--profile span covering everything done for one YAML file (in this process)."""
+    return _profiler.span(str(yaml_file), "file") if _profiler is not None else contextlib.nullcontext()
+
+
+def _init_pool_worker(generator: CppGenerator, profiling: bool = False) -> None:
+    global _pool_generator, _profiler
+    _pool_generator = generator
+    _profiler = _Profiler() if profiling else None
+
+
+def _pool_parse(yaml_file: Path) -> Tuple[Any, List[str], str, str, Optional[str], List[Dict[str, Any]]]:
+    """Worker: parse one YAML file and list the classes it will declare PageTypes for.
+       Returns (data, page_type_names, stdout, stderr, error, profile_events)."""
+    out, err = io.StringIO(), io.StringIO()
+    data, names, error = None, [], None
+    with contextlib.redirect_stdout(out), contextlib.redirect_stderr(err), _file_span(yaml_file):
+        try:
+            data = _pool_generator.parse_yaml_file(yaml_file)
+            names = _pool_generator.page_type_names(data)
+        except Exception as e:
+            error = str(e)
+    return data, names, out.getvalue(), err.getvalue(), error, _profiler.drain() if _profiler else []
+
+
+def _pool_generate(yaml_file: Path, rel_path: Path, output_dir: Optional[Path], data: Any,
+                   first_page_type: int, page_types: List[Tuple[str, int]]
+                   ) -> Tuple[str, str, Optional[str], List[Path], bool, List[Dict[str, Any]], Dict[str, Any]]:
+    """Worker: generate one YAML file (parsing it here if data is None) with the given
+       PageType IDs. Console output is captured and handed back so the parent can replay
+       it in scan order. Returns (stdout, stderr, error, written_files, failed, profile_events,
+       output_digest_updates)."""
+    out, err = io.StringIO(), io.StringIO()
+    error = None
+    with contextlib.redirect_stdout(out), contextlib.redirect_stderr(err), _file_span(yaml_file):
+        try:
+            _pool_generator.next_PageType = first_page_type
+            _pool_generator.page_type_ids = dict(page_types)
+            _pool_generator.generate_from_yaml(yaml_file, rel_path, output_dir, data=data)
+        except Exception as e:
+            error = str(e)
+    digests = _pool_generator.output_digests
+    return (out.getvalue(), err.getvalue(), error, _pool_generator.written_files, _pool_generator.failed,
+            _profiler.drain() if _profiler else [], digests.drain() if digests is not None else {})
+
+
+def _generate_parallel(generator: CppGenerator, tasks: List[Tuple[Path, Path]], output_dir: Optional[Path],
+                       jobs: int, manifest: Optional[GenerationManifest],
+                       registry: Optional[PageTypeRegistry]) -> int:
+    """--jobs N: parse (in a process pool) every file the manifest can't vouch for, assign
+       each file its PageType IDs serially in scan order (see _page_types_for()), then
+       generate every file that isn't already current in the pool. Output is
+       byte-identical to a serial run, and console output is replayed in scan order. The
+       pool is only started if there is actually work to do."""
+    digests = [GenerationManifest.digest(yf) if manifest else None for yf, _ in tasks]
+    entries = [manifest.lookup(yf, d) if manifest else None for (yf, _), d in zip(tasks, digests)]
+
+    with contextlib.ExitStack() as stack:
+        pool: Optional[concurrent.futures.ProcessPoolExecutor] = None
+
+        def get_pool() -> concurrent.futures.ProcessPoolExecutor:
+            nonlocal pool
+            if pool is None:
+                pool = stack.enter_context(concurrent.futures.ProcessPoolExecutor(
+                    max_workers=jobs, initializer=_init_pool_worker, initargs=(generator, _profiler is not None)))
+            return pool
+
+        to_parse = [idx for idx, entry in enumerate(entries) if entry is None]
+        parsed: Dict[int, Tuple[Any, List[str], str, str, Optional[str], List[Dict[str, Any]]]] = {}
+        if to_parse:
+            parsed = dict(zip(to_parse, get_pool().map(_pool_parse, [tasks[idx][0] for idx in to_parse])))
+            if _profiler is not None:
+                for result in parsed.values():
+                    _profiler.events.extend(result[5])
+
+        # A parse failure stops the batch at that file, exactly as the serial loop does.
+        runnable = next((idx for idx in to_parse if parsed[idx][4] is not None), len(tasks))
+
+        first_page_types: List[int] = []
+        page_types: List[List[Tuple[str, int]]] = []
+        next_page_type = generator.next_PageType
+        for idx in range(runnable):
+            names = GenerationManifest.page_type_names(entries[idx]) if entries[idx] is not None else parsed[idx][1]
+            first_page_types.append(next_page_type)
+            page_types.append(_page_types_for(names, next_page_type, registry))
+            next_page_type += len(names)
+
+        futures: Dict[int, concurrent.futures.Future] = {}
+        for idx in range(runnable):
+            if entries[idx] is not None and manifest.is_current(entries[idx], page_types[idx]):
+                continue
+            yf, rel_path = tasks[idx]
+            data = parsed[idx][0] if idx in parsed else None
+            futures[idx] = get_pool().submit(_pool_generate, yf, rel_path, output_dir, data,
+                                             first_page_types[idx], page_types[idx])
+
+        for idx in range(runnable):
+            yf = tasks[idx][0]
+            if idx in parsed:
+                sys.stdout.write(parsed[idx][2])
+                sys.stderr.write(parsed[idx][3])
+            if idx not in futures:
+                if not generator.quiet:
+                    print(f"{yf} : unchanged (skipped)")
+                continue
+            out, err, error, written_files, failed, events, digest_updates = futures[idx].result()
+            if _profiler is not None:
+                _profiler.events.extend(events)
+            if generator.output_digests is not None:
+                generator.output_digests.merge(digest_updates)
+            sys.stdout.write(out)
+            sys.stderr.write(err)
+            if error is not None:
+                print(f"Error reading {yf}: {error}", file=sys.stderr)
+                if manifest:
+                    manifest.forget(yf)
+                return 1
+            if manifest:
+                if failed:
+                    manifest.forget(yf)
+                else:
+                    manifest.record(yf, digests[idx], page_types[idx], written_files)
+
+    if runnable < len(tasks):
+        yf = tasks[runnable][0]
+        _, _, parse_out, parse_err, error, _ = parsed[runnable]
+        sys.stdout.write(parse_out)
+        sys.stderr.write(parse_err)
+        print(f"Error reading {yf}: {error}", file=sys.stderr)
+        return 1
+    return 0
 
 
 def scan_and_generate(generator,
                       args: any,
                       output_dir: Path | None) -> int:
-    """Scan for *.yaml files, generate corresponding Group/Page/WizardPage .ixx files."""
+    """Scan for *.yaml files, generate corresponding Group/Page/WizardPage .ixx files.
+
+       Each file's PageType IDs start where the previous file's (per page_type_names())
+       end -- or, with --pagetype-registry, come from a PageTypeRegistry -- so numbering
+       never depends on which process generated which file, and --jobs N can fan
+       generation out over a process pool. With an output directory, a GenerationManifest
+       there lets unchanged files skip parsing and emission entirely."""
 
     # Collect YAML files from all root directories
     yaml_files = []
@@ -4175,11 +6251,23 @@ def scan_and_generate(generator,
         uidir = Path(output_dir / "ui")
         uidir.mkdir(parents=True, exist_ok=True)
 
-    if len(roots) == 1:
-        print(f"Processing classes in {len(yaml_files)} YAML files from one directory...")
-    else:
-        print(f"Processing classes in {len(yaml_files)} YAML files from {len(roots)} directories...")
+    if not generator.quiet:
+        if len(roots) == 1:
+            print(f"Processing classes in {len(yaml_files)} YAML files from one directory...")
+        else:
+            print(f"Processing classes in {len(yaml_files)} YAML files from {len(roots)} directories...")
+
+    if generator.parse_cache_dir is None and output_dir is not None and not getattr(args, 'no_parse_cache', False):
+        generator.parse_cache_dir = output_dir / ".yaml2code.cache"
+    _, backend = yaml_loader(generator.yaml_backend)
+    if not generator.quiet:
+        print(f"YAML loader: {backend}" +
+              (f", parse cache: {generator.parse_cache_dir}" if generator.parse_cache_dir is not None else ""))
 
+    if generator.source_root is None:
+        generator.source_root = Path(args.scan[0])
+
+    tasks: List[Tuple[Path, Path]] = []
     for yf in yaml_files:
 
         full = Path(yf)
@@ -4188,33 +6276,235 @@ def scan_and_generate(generator,
 
         rel_path = full.relative_to(base)
         rel_path = rel_path.parent
+        tasks.append((yf, rel_path))
+
+    # --only / --shared-only: a generateClasses() build rule's share of a batch. The scan,
+    # manifest and PageType numbering are the whole batch's either way; --only then writes
+    # nothing but that file's own modules and stubs, --shared-only nothing but the shared
+    # modules (prelude, schema, fused units), so no build rule touches another's outputs.
+    only = getattr(args, 'only', None)
+    shared_only = getattr(args, 'shared_only', False)
+    if only is not None:
+        only = next((yf for yf in yaml_files if yf.resolve() == Path(only).resolve()), None)
+        if only is None:
+            print(f"Error: --only {args.only} is not one of the scanned YAML files", file=sys.stderr)
+            return 1
+    if (only is not None or shared_only) and output_dir is None:
+        print("Error: --only and --shared-only need --output", file=sys.stderr)
+        return 1
 
+    jobs = getattr(args, 'jobs', 1) or 1
+    depfile = getattr(args, 'depfile', None)
+    with _output_dir_lock(output_dir) if output_dir is not None else contextlib.nullcontext():
+        registry: Optional[PageTypeRegistry] = None
+        if getattr(args, 'pagetype_registry', None) is not None and not shared_only:
+            try:
+                registry = PageTypeRegistry.load(args.pagetype_registry, generator.next_PageType)
+            except ValueError as e:
+                print(f"Error: {e}", file=sys.stderr)
+                return 1
+
+        manifest: Optional[GenerationManifest] = None
+        if output_dir is not None:
+            manifest = GenerationManifest.load(output_dir, generator)
+            if only is None:
+                manifest.prune(yaml_files)
+            generator.output_digests = OutputDigests.load(output_dir)
+
+        shifted: List[Path] = []
+        if shared_only:
+            result = 0
+        elif only is not None:
+            result = _generate_serial(generator, tasks, output_dir, manifest, registry, only, shifted)
+        elif jobs > 1 and len(tasks) > 1:
+            result = _generate_parallel(generator, tasks, output_dir, min(jobs, len(tasks)), manifest, registry)
+        else:
+            result = _generate_serial(generator, tasks, output_dir, manifest, registry)
+
+        if output_dir is not None and only is None:
+            _write_shared_modules(generator, output_dir, yaml_files, manifest, rebuild=shared_only)
+
+        if registry and only is None:
+            # Never from --only: build rules leave the registry to the configure-time run.
+            registry.save()
+        if generator.output_digests is not None:
+            generator.output_digests.save()
+        if manifest:
+            manifest.save()
+            changed = manifest.write_depfile(depfile, yaml_files) if depfile is not None else False
+            if only is not None and result == 0 and (changed or shifted):
+                # Only a full run can catch up: a module appeared or vanished (the build must
+                # be re-configured to compile it), or other files' PageType IDs moved and
+                # their modules are not this rule's to rewrite. Make sure the depfile is
+                # newer, so the next build re-runs CMake and with it the full generation.
+                if depfile is not None and not changed:
+                    os.utime(depfile)
+                reason = f"the PageType IDs of {len(shifted)} other file(s) moved" if shifted \
+                    else "its set of generated modules changed"
+                print(f"Error: {only}: {reason}; CMake has to re-run the full generation -- build again",
+                      file=sys.stderr)
+                result = 1
+    return result
+
+
+def _write_shared_modules(generator: CppGenerator, output_dir: Path, yaml_files: List[Path],
+                          manifest: GenerationManifest, rebuild: bool) -> None:
+    """The modules assembled from every scanned file: --fuse units (from the fragments),
+       the --schema module and the --prelude, recorded as the manifest's shared outputs.
+       Rewritten when rebuild (--shared-only: per-file rules may have changed fragments),
+       when something was (re)generated or dropped, or when one went missing; a run that
+       generated nothing leaves them -- and the fragments -- alone. Whatever an option that
+       was turned off left behind is removed either way."""
+    if not generator.fuse:
+        ModuleFusion.unfuse(output_dir)
+    if not generator.schema:
+        SchemaCompiler.remove(output_dir)
+    for retired in manifest.retired_modules(output_dir):
+        with contextlib.suppress(OSError):
+            retired.unlink()
+            print(f"{retired} : Removed")
+
+    if not (rebuild or manifest.dirty or manifest.shared_missing()):
+        return
+    shared: List[Path] = []
+    if generator.fuse:
+        with _profiler.span("ModuleFusion.assemble", "write") if _profiler is not None else contextlib.nullcontext():
+            shared.extend(path for _, path in ModuleFusion.assemble(output_dir, yaml_files, generator.output_digests))
+    if generator.schema:
+        shared.append(SchemaCompiler.assemble(output_dir, yaml_files, generator.schema, generator.output_digests))
+    if generator.prelude:
+        prelude_path = output_dir / f"{generator.prelude}.ixx"
+        # Every module that imports it: each file's own, and the fused units just assembled.
+        paths = [Path(p) for entry in manifest.entries.values() for p in entry.get("outputs", [])] + shared
+        modules = (p.read_text(encoding="utf-8") for p in paths if p.suffix == ".ixx" and p.exists())
+        state = _commit_output(prelude_path, generator.prelude_module(modules), generator.output_digests)
+        print(f"{prelude_path} : Prelude OK ({state})")
+        shared.append(prelude_path)
+    manifest.set_shared(shared)
+
+
+def _generate_serial(generator: CppGenerator, tasks: List[Tuple[Path, Path]], output_dir: Optional[Path],
+                     manifest: Optional[GenerationManifest], registry: Optional[PageTypeRegistry],
+                     only: Optional[Path] = None, shifted: Optional[List[Path]] = None) -> int:
+    """One file at a time, in scan order; see _generate_parallel() for the --jobs N path.
+
+       With only (--only), every other file just takes up its PageType IDs -- as its
+       manifest entry recorded them, whatever the file holds now, since an edit to it is
+       its own rule's business -- and one whose recorded IDs no longer match what it is
+       assigned now goes into shifted instead of being regenerated."""
+    next_page_type = generator.next_PageType
+    for yf, rel_path in tasks:
         try:
-            generator.generate_from_yaml(yf, rel_path, output_dir)
+            with _file_span(yf):
+                if only is not None and yf != only:
+                    entry = manifest.entries.get(str(yf))
+                    if isinstance(entry, dict) and isinstance(entry.get("page_types"), list):
+                        names = GenerationManifest.page_type_names(entry)
+                    else:
+                        data = _resident.parse(generator, yf) if _resident is not None else generator.parse_yaml_file(yf)
+                        names = generator.page_type_names(data)
+                    page_types = _page_types_for(names, next_page_type, registry)
+                    if isinstance(entry, dict) and entry.get("page_types") != [list(pt) for pt in page_types]:
+                        shifted.append(yf)
+                    next_page_type += len(names)
+                    continue
+
+                digest = GenerationManifest.digest(yf) if manifest else None
+                entry = manifest.lookup(yf, digest) if manifest else None
+                data = None
+                if entry is not None:
+                    names = GenerationManifest.page_type_names(entry)
+                else:
+                    data = _resident.parse(generator, yf) if _resident is not None else generator.parse_yaml_file(yf)
+                    names = generator.page_type_names(data)
+                page_types = _page_types_for(names, next_page_type, registry)
+
+                if entry is not None and manifest.is_current(entry, page_types):
+                    if not generator.quiet:
+                        print(f"{yf} : unchanged (skipped)")
+                    next_page_type += len(names)
+                    continue
+
+                if data is None:
+                    data = _resident.parse(generator, yf) if _resident is not None else generator.parse_yaml_file(yf)
+                generator.next_PageType = next_page_type
+                generator.page_type_ids = dict(page_types)
+                generator.generate_from_yaml(yf, rel_path, output_dir, data=data)
+                if manifest:
+                    if generator.failed:
+                        manifest.forget(yf)
+                    else:
+                        manifest.record(yf, digest, page_types, generator.written_files)
+                next_page_type += len(names)
         except Exception as e:
             print(f"Error reading {yf}: {e}", file=sys.stderr)
+            if manifest:
+                manifest.forget(yf)
             return 1
 
     return 0
 
-def main():
-    """Main entry point for the script."""
+
+def _build_parser() -> argparse.ArgumentParser:
     parser = argparse.ArgumentParser(
         description='Generate C++ Group/Page/WizardPage modules from YAML form definitions')
     parser.add_argument('--impl-dir', type=Path, help='Directory to write hand-editable _impl.cpp stubs to (default: alongside --output, or next to the source YAML)')
     parser.add_argument('--scan', type=Path, action='append', help='Scan this directory recursively for *.yaml (can be used multiple times)')
+    parser.add_argument('--serve', type=Path, metavar='SOCKET', help='Stay resident and answer yaml2code_client.py requests on this Unix socket')
+    parser.add_argument('--idle-timeout', type=float, default=1800, help='--serve: exit after this many seconds without a request (0 = never)')
+    parser.add_argument('--watch', action='store_true', help='Stay resident and regenerate whenever a scanned YAML file changes')
+    parser.add_argument('--yaml-backend', choices=['auto', 'libyaml', 'python'], default='auto', help='YAML parser: libyaml C loader, pure Python, or libyaml when available (default)')
+    parser.add_argument('--parse-cache', type=Path, metavar='DIR', help='Cache parsed YAML here (batch mode default: <output>/.yaml2code.cache)')
+    parser.add_argument('--no-parse-cache', action='store_true', help='Always parse YAML, never use or write the parse cache')
+    parser.add_argument('--reproducible', action='store_true', help='Name the source YAML by content hash and source-root-relative path in generated headers, not mtime and absolute path')
+    parser.add_argument('--source-root', type=Path, help='--reproducible: paths in generated code are relative to this (default: the --scan root, or the current directory)')
+    parser.add_argument('--profile', type=Path, metavar='OUT.json', help='Write per-file/phase timings as a Chrome trace and print the slowest files and phases')
+    parser.add_argument('--fuse', choices=['file', 'dir'], help='Emit the classes of each YAML file (or scan directory) as one module with one global module fragment')
+    parser.add_argument('--compiled-layouts', action='store_true', help='Compile each class\'s sizer/placement data into constexpr tables for loadLayout() instead of loading its layout resource at runtime')
+    parser.add_argument('--handler-tables', action='store_true', help='Bind each class\'s control handlers from one table of (event, member function) entries through a single bind loop instead of one lambda per hook')
+    parser.add_argument('--class-args-table', action='store_true', help='Keep each class\'s class_args defaults in one immutable map filled in on first use, and fill callers\' args from it key by key instead of merging a freshly built map on every construction')
+    parser.add_argument('--param-keys', action='store_true', help='Look up generated param() keys through per-class ParamKey handles hashed at compile time instead of string literals')
+    parser.add_argument('--shared-lookups', action='store_true', help='Populate alt_data_source controls that read the same (table, value_field, display_field) from one per-page query, cleared on the page\'s recordset events')
+    parser.add_argument('--schema', metavar='MODULE', help='Compile the tables:/relationships: sections into <output>/MODULE.ixx: normalized DDL plus a schema digest')
+    parser.add_argument('--prelude', metavar='MODULE', help='Write <output>/MODULE.ixx with the headers shared by all generated modules, and import it instead of including them')
+    parser.add_argument('--import-report', action='store_true', help='Print the unused default imports dropped from each generated group/page/wizardpage')
+    parser.add_argument('--pagetype-registry', type=Path, metavar='FILE', help='Committed JSON class -> PageType ID map; keeps IDs stable, new classes are appended')
+    parser.add_argument('--only', type=Path, metavar='YAML', help='Batch mode: write only this scanned file\'s own modules and stubs (a per-file build rule); fails, asking for a full run, if that changes the set of modules or other files\' PageType IDs')
+    parser.add_argument('--shared-only', action='store_true', help='Batch mode: write only the modules assembled from every scanned file (--prelude, --schema, --fuse units)')
     parser.add_argument('-a', '--app-target', action='store', help='The CMake target name of the application')
     parser.add_argument('-c', '--cmake', type=Path, help='Update CMakeLists.txt file with generated modules')
-    parser.add_argument('-f', '--first-pagetype', action='store', help='First page type to generate')
+    parser.add_argument('-d', '--depfile', type=Path, help='Batch mode: write a Make-syntax file mapping each generated module to its YAML file (read by generateClasses() at configure time; not a Ninja depfile)')
+    parser.add_argument('-f', '--first-pagetype', type=int, action='store', help='First page type to generate')
+    parser.add_argument('-j', '--jobs', type=int, default=1, help='Generate batch-mode (--scan) files in N parallel processes (0 = one per CPU)')
     parser.add_argument('-o', '--output', type=Path, help='Output directory or file path')
     parser.add_argument('-q', '--quiet', action="store_true", help='Only report important information')
     parser.add_argument('-s', '--sizer-info', action='store_true', help='Show sizer info in the generated UI classes')
     parser.add_argument('-v', '--verbose', action='store_true', help='Enable verbose output')
     parser.add_argument('-x', '--export-var', action='store', help='The name of the generated export variable like GFX_EXPORT')
     parser.add_argument('input_yaml', type=Path, nargs='?', help='Single input YAML file')
+    return parser
 
-    args = parser.parse_args()
-    generator = CppGenerator()
+
+def _run(args: Any) -> int:
+    """One generator invocation, batch or single-file, as described by the parsed CLI args."""
+    global _profiler
+    if args.profile is None:
+        return _run_generator(args)
+
+    _profiler = _Profiler()
+    try:
+        with _profiler.span("yaml2code", "run"):
+            rc = _run_generator(args)
+        _profiler.write(args.profile)
+        print(_profiler.summary())
+        print(f"Profile written to {args.profile}")
+    finally:
+        _profiler = None
+    return rc
+
+
+def _run_generator(args: Any) -> int:
+    generator = _resident.generator_for(args) if _resident is not None else CppGenerator()
     generator.be_quiet(args.quiet)
     generator.show_sizer_info(args.sizer_info)
     generator.export_var = args.export_var
@@ -4222,8 +6512,43 @@ def main():
     if args.impl_dir is not None:
         generator.impl_dir = args.impl_dir
 
-    if not args.first_pagetype is None:
-        generator.next_PageType = args.first_pagetype
+    try:
+        yaml_loader(args.yaml_backend)
+    except ValueError as e:
+        print(f"Error: {e}", file=sys.stderr)
+        return 1
+    generator.yaml_backend = args.yaml_backend
+    generator.parse_cache_dir = None if args.no_parse_cache else args.parse_cache
+
+    # Always (re)set: a resident generator still carries the previous run's counter.
+    generator.next_PageType = args.first_pagetype if args.first_pagetype is not None else CppGenerator.next_PageType
+    generator.page_type_ids = None
+    generator.reproducible = args.reproducible
+    generator.source_root = args.source_root
+    generator.output_digests = None
+    generator.import_report = args.import_report
+    generator.fuse = args.fuse
+    generator.compiled_layouts = args.compiled_layouts
+    generator.handler_tables = args.handler_tables
+    generator.class_args_table = args.class_args_table
+    generator.param_keys = args.param_keys
+    generator.shared_lookups = args.shared_lookups
+    if args.prelude is not None and not re.fullmatch(r"[A-Za-z_]\w*(\.[A-Za-z_]\w*)*", args.prelude):
+        print(f"Error: --prelude must be a module name (got '{args.prelude}')", file=sys.stderr)
+        return 1
+    generator.prelude = args.prelude
+    if args.schema is not None and not re.fullmatch(r"[A-Za-z_]\w*(\.[A-Za-z_]\w*)*", args.schema):
+        print(f"Error: --schema must be a module name (got '{args.schema}')", file=sys.stderr)
+        return 1
+    generator.schema = args.schema
+    generator.pagetype_registry = args.pagetype_registry
+
+    if args.jobs == 0:
+        args.jobs = os.cpu_count() or 1
+    if _resident is not None:
+        # Worker processes would start cold and parse around the in-memory cache; with
+        # it, the serial path only ever parses the files that actually changed.
+        args.jobs = 1
 
     if not args.app_target is None:
         generator.app_target = args.app_target
@@ -4231,19 +6556,41 @@ def main():
     # Scan mode (batch)
     if args.scan:
         output_dir = args.output if args.output is not None else None
-        sys.exit(scan_and_generate(generator, args, output_dir))
+        return scan_and_generate(generator, args, output_dir)
 
     # Single-file mode
     if not args.input_yaml:
         print("Error: input_yaml is required unless --scan is provided", file=sys.stderr)
-        sys.exit(1)
+        return 1
 
     if not args.input_yaml.exists():
         print(f"Error: Input file '{args.input_yaml}' does not exist", file=sys.stderr)
-        sys.exit(1)
+        return 1
 
     try:
-        result = generator.generate_from_yaml(args.input_yaml, Path("."), args.output)
+        data = None
+        registry = None
+        if args.pagetype_registry is not None:
+            registry = PageTypeRegistry.load(args.pagetype_registry, generator.next_PageType)
+            data = generator.parse_yaml_file(args.input_yaml)
+            generator.page_type_ids = dict(registry.assign(generator.page_type_names(data)))
+
+        if args.output:
+            generator.output_digests = OutputDigests.load(args.output)
+        result = generator.generate_from_yaml(args.input_yaml, Path("."), args.output, data=data)
+        if generator.fuse and args.output:
+            ModuleFusion.assemble(args.output, [args.input_yaml], generator.output_digests)
+        if generator.schema and args.output:
+            SchemaCompiler.assemble(args.output, [args.input_yaml], generator.schema, generator.output_digests)
+        if generator.prelude and args.output and args.output.is_dir():
+            prelude_path = args.output / f"{generator.prelude}.ixx"
+            modules = (p.read_text(encoding="utf-8") for p in args.output.rglob("*.ixx") if p != prelude_path)
+            state = _commit_output(prelude_path, generator.prelude_module(modules), generator.output_digests)
+            print(f"{prelude_path} : Prelude OK ({state})")
+        if registry is not None and not generator.failed:
+            registry.save()
+        if generator.output_digests is not None:
+            generator.output_digests.save()
 
         if not args.output:
             print(result)
@@ -4258,5 +6605,207 @@ def main():
         return 1
 
 
+def _run_request(argv: List[str], cwd: str) -> Tuple[int, str, str]:
+    """Run one forwarded command line in-process, as if started from cwd, capturing its output."""
+    out, err = io.StringIO(), io.StringIO()
+    previous = os.getcwd()
+    try:
+        os.chdir(cwd)
+        with contextlib.redirect_stdout(out), contextlib.redirect_stderr(err):
+            try:
+                rc = _run(_build_parser().parse_args(argv))
+            except SystemExit as e:  # argparse errors
+                rc = e.code if isinstance(e.code, int) else 1
+            except Exception:
+                import traceback
+                traceback.print_exc()
+                rc = 1
+    finally:
+        os.chdir(previous)
+    return rc, out.getvalue(), err.getvalue()
+
+
+def _restart() -> None:
+    """The generator source changed under a resident process: re-exec so new code is used."""
+    sys.stdout.flush()
+    sys.stderr.flush()
+    os.execv(sys.executable, [sys.executable, *sys.argv])
+
+
+def _watched_files(requests: List[Tuple[List[str], str]]) -> Dict[str, Any]:
+    """Stat signatures of every YAML file under the scan roots of the given requests."""
+    files: Dict[str, Any] = {}
+    for argv, cwd in requests:
+        args = _build_parser().parse_args(argv)
+        for root in args.scan or []:
+            for yf in (Path(cwd) / root).rglob("*.yaml"):
+                files[str(yf)] = _ResidentCache.signature(yf)
+        if args.input_yaml is not None:
+            files[str(Path(cwd) / args.input_yaml)] = _ResidentCache.signature(Path(cwd) / args.input_yaml)
+    return files
+
+
+def _watch(requests: Dict[Tuple[str, ...], Tuple[List[str], str]], run_lock: Any, interval: float = 0.25) -> None:
+    """Poll (no extra dependency) until a watched YAML file changes, then re-run every request."""
+    snapshot = None
+    while True:
+        time.sleep(interval)
+        with run_lock:
+            pending = list(requests.values())
+            current = _watched_files(pending)
+            if snapshot is None or current == snapshot:
+                snapshot = current
+                continue
+            snapshot = current
+            if _generator_digest() != _startup_digest:
+                _restart()
+            for argv, cwd in pending:
+                rc, out, err = _run_request(argv, cwd)
+                sys.stdout.write(out)
+                sys.stderr.write(err)
+                if rc != 0:
+                    print(f"yaml2code: regeneration failed ({rc})", file=sys.stderr)
+            sys.stdout.flush()
+            sys.stderr.flush()
+
+
+def _peer_uid(conn: Any) -> Optional[int]:
+    """The uid of the process at the other end of a Unix socket connection, where the
+       platform reports it (SO_PEERCRED: Linux); None elsewhere."""
+    import socket
+    import struct
+    if not hasattr(socket, "SO_PEERCRED"):
+        return None
+    creds = conn.getsockopt(socket.SOL_SOCKET, socket.SO_PEERCRED, struct.calcsize("3i"))
+    _pid, uid, _gid = struct.unpack("3i", creds)
+    return uid
+
+
+def _serve(socket_path: Path, watch: bool, idle_timeout: float) -> int:
+    """
+    Resident mode: answer yaml2code_client.py requests on a Unix socket. Each request is a
+    JSON {"argv": [...], "cwd": ...}, answered with {"rc", "stdout", "stderr"} exactly as
+    a fresh process would have produced them -- but with PyYAML imported, CppGenerator's
+    tables built and recently parsed YAML/manifests kept warm (see _ResidentCache).
+    Requests are handled one at a time. With --watch, every distinct request served so
+    far is re-run whenever one of its YAML files changes, so modules are usually already
+    current by the time the build asks.
+
+    A request runs generator code with the server's rights, in any directory it names, so
+    only the server's own user may make one: the socket is created 0600 (and a directory
+    made for it 0700), and where the platform reports the peer's uid, a connection from
+    any other uid is dropped unanswered -- some BSDs ignore a socket file's mode.
+    """
+    import socket
+    import threading
+
+    if not hasattr(socket, "AF_UNIX"):
+        print("Error: --serve needs Unix domain socket support", file=sys.stderr)
+        return 1
+
+    # Refuse to steal the socket from a live server (e.g. two clients racing to spawn one).
+    probe = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    try:
+        probe.connect(str(socket_path))
+        print(f"yaml2code: a server is already listening on {socket_path}", file=sys.stderr)
+        return 0
+    except OSError:
+        pass
+    finally:
+        probe.close()
+
+    with contextlib.suppress(FileNotFoundError):
+        socket_path.unlink()
+    socket_path.parent.mkdir(mode=0o700, parents=True, exist_ok=True)
+
+    server = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    # The mode comes from the umask at bind(): narrow it for the call, rather than chmod()
+    # after, which would leave a window with the socket open to everyone. (No other thread
+    # runs yet, so the process-wide umask change can't leak.)
+    umask = os.umask(0o177)
+    try:
+        server.bind(str(socket_path))
+    finally:
+        os.umask(umask)
+    server.listen(16)
+    server.settimeout(idle_timeout if idle_timeout > 0 else None)
+
+    run_lock = threading.RLock()
+    requests: Dict[Tuple[str, ...], Tuple[List[str], str]] = {}
+    if watch:
+        threading.Thread(target=_watch, args=(requests, run_lock), daemon=True).start()
+
+    try:
+        while True:
+            try:
+                conn, _ = server.accept()
+            except socket.timeout:
+                break
+            with conn:
+                peer = _peer_uid(conn)
+                if peer is not None and peer != os.getuid():
+                    print(f"yaml2code: refused a request from uid {peer} on {socket_path}", file=sys.stderr)
+                    continue
+                conn.settimeout(None)
+                chunks = []
+                while chunk := conn.recv(65536):
+                    chunks.append(chunk)
+                try:
+                    request = json.loads(b"".join(chunks))
+                    req_argv, req_cwd = list(request["argv"]), str(request["cwd"])
+                except (ValueError, KeyError, TypeError) as e:
+                    conn.sendall(json.dumps({"rc": 2, "stdout": "", "stderr": f"Bad request: {e}\n"}).encode("utf-8"))
+                    continue
+                with run_lock:
+                    if _generator_digest() != _startup_digest:
+                        # Drop this connection unanswered: the client then runs the
+                        # request itself, and we come back with the new source.
+                        conn.close()
+                        server.close()
+                        _restart()
+                    rc, out, err = _run_request(req_argv, req_cwd)
+                    if watch and rc == 0:
+                        requests[(req_cwd, *req_argv)] = (req_argv, req_cwd)
+                with contextlib.suppress(OSError):
+                    conn.sendall(json.dumps({"rc": rc, "stdout": out, "stderr": err}).encode("utf-8"))
+    finally:
+        server.close()
+        with contextlib.suppress(FileNotFoundError):
+            socket_path.unlink()
+    return 0
+
+
+def main():
+    """Main entry point for the script."""
+    global _resident, _startup_digest
+
+    parser = _build_parser()
+    args = parser.parse_args()
+
+    if args.serve is None and not args.watch:
+        return _run(args)
+
+    # Resident modes: a server answers forwarded requests (and with --watch keeps the
+    # ones it has served current); a bare --watch keeps re-running this command line.
+    _resident = _ResidentCache()
+    _startup_digest = _generator_digest()
+    if args.serve is not None:
+        return _serve(args.serve, args.watch, args.idle_timeout)
+
+    if not args.scan and not args.input_yaml:
+        print("Error: --watch needs --scan or an input YAML file", file=sys.stderr)
+        return 1
+    rc = _run(args)
+    sys.stdout.flush()
+    import threading
+    argv = [a for a in sys.argv[1:] if a != '--watch']
+    _watch({tuple(argv): (argv, os.getcwd())}, threading.RLock())
+    return rc
+
+
+# Digest of the generator source when a resident process started; see _restart().
+_startup_digest: Optional[str] = None
+
+
 if __name__ == '__main__':
     sys.exit(main())
@@ -0,0 +1,222 @@
+#!/usr/bin/env python3
+"""
+Thin front-end for yaml2code.py, the command generator.cmake runs.
+
+    yaml2code_client.py [--socket SOCKET] [--stamp FILE] [yaml2code.py arguments...]
+
+--stamp FILE: after a successful batch (--scan) run, record what it was generated from
+-- the arguments, every scanned YAML file's size/mtime, the content of the generator, the
+PyYAML it parses with and the PageType registry, and the output manifest -- and on later
+calls exit straight away while all of that is unchanged. A run scoped to part of the
+batch (--only, --shared-only) is skipped as well while the stamp holds, but never writes
+it: it leaves the rest of the batch as it found it.
+The configure-time run leaves the stamp behind, so the build-time rules (which Ninja
+always runs once, having no log entry for them yet) cost a stat() per YAML file instead
+of a second full generation. Arguments are compared as given, so pass absolute paths
+(generator.cmake does) when runs happen from different directories.
+
+--socket SOCKET: forward the arguments (and the current directory) to a resident
+`yaml2code.py --serve SOCKET` and relay its output and exit status. If no server
+answers, one is started in the background for next time and this request runs
+through yaml2code.py as usual -- so the socket is always safe to pass.
+
+Deliberately imports nothing heavy: skipping the PyYAML import and compiling
+yaml2code.py is the whole point.
+"""
+
+import hashlib
+import importlib.util
+import json
+import os
+import socket
+import sys
+from pathlib import Path
+
+GENERATOR = Path(__file__).with_name("yaml2code.py")
+MANIFEST_NAME = ".yaml2code.manifest.json"  # GenerationManifest.FILE_NAME in yaml2code.py
+
+# Options that never change what gets generated, with whether they take a value.
+_NEUTRAL_OPTIONS = {"-q": False, "--quiet": False, "-v": False, "--verbose": False, "--import-report": False,
+                    "-j": True, "--jobs": True, "--profile": True}
+# Options that restrict a run to part of the batch: compared as if absent, never stamped.
+_SCOPE_OPTIONS = {"--only": True, "--shared-only": False}
+
+
+def _option_values(argv: list, *names: str) -> list:
+    values = []
+    for i, arg in enumerate(argv):
+        for name in names:
+            if arg == name and i + 1 < len(argv):
+                values.append(argv[i + 1])
+            elif name.startswith("--") and arg.startswith(name + "="):
+                values.append(arg[len(name) + 1:])
+    return values
+
+
+def _normalized_args(argv: list) -> list:
+    out, skip = [], False
+    for arg in argv:
+        if skip:
+            skip = False
+            continue
+        name = arg.split("=", 1)[0]
+        takes_value = _NEUTRAL_OPTIONS.get(name, _SCOPE_OPTIONS.get(name))
+        if takes_value is not None:
+            skip = takes_value and "=" not in arg
+            continue
+        out.append(arg)
+    return out
+
+
+def _signature(path) -> list:
+    try:
+        st = os.stat(path)
+    except OSError:
+        return None
+    return [st.st_size, st.st_mtime_ns]
+
+
+def _content_digest(path) -> str:
+    """For the few inputs whose stat can't be trusted: a registry rewritten with the same
+       size within the mtime granularity, or a generator restored by a checkout."""
+    try:
+        return hashlib.sha256(Path(path).read_bytes()).hexdigest()
+    except OSError:
+        return None
+
+
+def _pyyaml_source() -> list:
+    """Where PyYAML would be imported from -- found, not imported, which is the slow part."""
+    try:
+        spec = importlib.util.find_spec("yaml")
+    except (ImportError, ValueError):
+        return []
+    return [spec.origin] if spec is not None and spec.origin else []
+
+
+def stamp_inputs(argv: list) -> dict:
+    """Everything a batch run's result depends on that can change without the arguments
+       changing, or None if argv isn't a batch run with an output directory."""
+    roots = _option_values(argv, "--scan")
+    outputs = _option_values(argv, "-o", "--output")
+    if not roots or not outputs:
+        return None
+    files = {}
+    for root in roots:
+        for dirpath, _, names in os.walk(root):
+            for name in names:
+                if name.endswith(".yaml"):
+                    path = os.path.abspath(os.path.join(dirpath, name))
+                    files[path] = _signature(path)
+    extra = [str(GENERATOR)] + _pyyaml_source() + _option_values(argv, "--pagetype-registry")
+    return {
+        "args": _normalized_args(argv),
+        "yaml": files,
+        "extra": {os.path.abspath(p): _content_digest(p) for p in extra},
+    }
+
+
+def stamp_is_current(stamp: Path, argv: list) -> bool:
+    try:
+        recorded = json.loads(Path(stamp).read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        return False
+    if not isinstance(recorded, dict) or recorded.get("inputs") != stamp_inputs(argv):
+        return False
+    manifest = recorded.get("manifest")
+    if not manifest or _signature(manifest["path"]) != manifest["signature"]:
+        return False
+    return all(os.path.exists(p) for p in recorded.get("outputs", []))
+
+
+def write_stamp(stamp: Path, argv: list, inputs: dict) -> None:
+    """Record a successful run. inputs is stamp_inputs() as taken *before* the run, so a
+       YAML file edited while it was being generated leaves the stamp stale."""
+    manifest_path = os.path.abspath(os.path.join(_option_values(argv, "-o", "--output")[-1], MANIFEST_NAME))
+    try:
+        manifest = json.loads(Path(manifest_path).read_text(encoding="utf-8"))
+        outputs = [os.path.abspath(p) for entry in manifest.get("files", {}).values()
+                   for p in entry.get("outputs", [])]
+        outputs += [os.path.abspath(p) for p in manifest.get("shared", [])]
+    except (OSError, ValueError, AttributeError):
+        return  # nothing trustworthy to record
+    outputs += [os.path.abspath(p) for p in _option_values(argv, "-d", "--depfile")]
+    # The run itself may have appended to the registry; that is the state to compare against.
+    inputs = {**inputs, "extra": {p: _content_digest(p) for p in inputs["extra"]}}
+    content = json.dumps({"inputs": inputs, "outputs": outputs,
+                          "manifest": {"path": manifest_path, "signature": _signature(manifest_path)}})
+    tmp = Path(f"{stamp}.tmp")
+    try:
+        tmp.parent.mkdir(parents=True, exist_ok=True)
+        tmp.write_text(content, encoding="utf-8")
+        os.replace(tmp, stamp)
+    except OSError:
+        pass
+
+
+def forward(socket_path: str, argv: list) -> dict:
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as conn:
+        conn.connect(socket_path)
+        conn.sendall(json.dumps({"argv": argv, "cwd": os.getcwd()}).encode("utf-8"))
+        conn.shutdown(socket.SHUT_WR)
+        chunks = []
+        while chunk := conn.recv(65536):
+            chunks.append(chunk)
+    return json.loads(b"".join(chunks))
+
+
+def spawn_server(socket_path: str) -> None:
+    """Start `yaml2code.py --serve` detached; it exits by itself after its idle timeout."""
+    import subprocess
+    kwargs = {"start_new_session": True} if os.name == "posix" else {}
+    try:
+        subprocess.Popen([sys.executable, str(GENERATOR), "--serve", socket_path],
+                         stdin=subprocess.DEVNULL, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL,
+                         **kwargs)
+    except OSError:
+        pass
+
+
+def run(socket_path: str, argv: list) -> int:
+    if socket_path and hasattr(socket, "AF_UNIX"):
+        try:
+            reply = forward(socket_path, argv)
+        except (OSError, ValueError):
+            # No server, or it dropped us to restart on a new generator source.
+            spawn_server(socket_path)
+        else:
+            sys.stdout.write(reply.get("stdout", ""))
+            sys.stderr.write(reply.get("stderr", ""))
+            return int(reply.get("rc", 1))
+
+    import subprocess
+    return subprocess.call([sys.executable, str(GENERATOR), *argv])
+
+
+def main() -> int:
+    argv = sys.argv[1:]
+    socket_path = stamp = None
+    while argv and argv[0] in ("--socket", "--stamp"):
+        if len(argv) < 2:
+            print(f"usage: {Path(sys.argv[0]).name} [--socket SOCKET] [--stamp FILE] "
+                  f"[yaml2code.py arguments...]", file=sys.stderr)
+            return 2
+        if argv[0] == "--socket":
+            socket_path = argv[1]
+        else:
+            stamp = argv[1]
+        argv = argv[2:]
+
+    inputs = stamp_inputs(argv) if stamp else None
+    if inputs is not None and stamp_is_current(stamp, argv):
+        return 0
+
+    rc = run(socket_path, argv)
+    scoped = any(arg.split("=", 1)[0] in _SCOPE_OPTIONS for arg in argv)
+    if rc == 0 and inputs is not None and not scoped:
+        write_stamp(stamp, argv, inputs)
+    return rc
+
+
+if __name__ == '__main__':
+    sys.exit(main())